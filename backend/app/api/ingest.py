@@ -10,9 +10,12 @@ from app.api.deps import get_current_user
 from app.core.config import settings
 from app.db.session import get_db
 from app.models import Message, ResearchSession, Source, User
+from app.services.content_extraction import MainContentExtractor
+from app.services.document_store import DocumentStore
 from app.services.ingest import IngestPipeline
-from app.services.source_fetcher import FetchError, HTTPSourceFetcher
-from app.services.web_search import SimpleTTLCache, TokenBucketRateLimiter
+from app.services.source_fetcher import FetchError, get_source_fetcher
+from app.services.summary_batching import SummaryBudget
+from app.services.web_search import BudgetExceededError
 
 router = APIRouter(prefix="/ingest", tags=["ingest"])
 
@@ -43,14 +46,15 @@ async def ingest_sources_for_session(
 
     await db.refresh(session, attribute_names=["sources"])
 
-    fetcher = HTTPSourceFetcher(
-        cache=SimpleTTLCache(
-            ttl_seconds=settings.fetch_cache_ttl_seconds,
-            max_items=settings.fetch_cache_max_items,
+    pipeline = IngestPipeline(
+        fetcher=get_source_fetcher(),
+        documents=DocumentStore(db, max_age_seconds=settings.document_max_age_seconds),
+        extractor=MainContentExtractor() if settings.ingest_extract_main_content else None,
+        budget=SummaryBudget(
+            max_chars=settings.ingest_max_summary_chars_per_session,
+            max_tokens=settings.ingest_max_summary_tokens_per_session,
         ),
-        rate_limiter=TokenBucketRateLimiter(rate_per_minute=settings.fetch_rate_per_minute),
     )
-    pipeline = IngestPipeline(fetcher=fetcher)
 
     processed = 0
     skipped = 0
@@ -65,10 +69,13 @@ async def ingest_sources_for_session(
         except FetchError:
             skipped += 1
             continue
+        except BudgetExceededError:
+            break
 
         if ingested.title:
             src.title = ingested.title[:500]
         src.snippet = ingested.snippet
+        src.document_id = ingested.document_id
         src.fetched_at = datetime.utcnow()
         processed += 1
 
@@ -9,6 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
 from app.db.session import get_db
 from app.models import ResearchSession, User
+from app.services.http_pool import pool_metrics
+from app.services.source_fetcher import get_source_fetcher
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
@@ -56,3 +58,17 @@ async def adoption_metrics(
         "users_with_2plus_sessions": users_with_2plus_sessions,
         "adoption_rate": adoption_rate,
     }
+
+
+@router.get("/http")
+async def http_metrics(_: User = Depends(get_current_user)) -> dict:
+    """Usage of the shared outbound HTTP connection pool."""
+
+    return pool_metrics()
+
+
+@router.get("/fetch")
+async def fetch_metrics(_: User = Depends(get_current_user)) -> dict:
+    """Source fetch retries, per-host error counts and circuit breaker states."""
+
+    return get_source_fetcher().resilience_metrics()
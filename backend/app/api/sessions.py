@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import xml.etree.ElementTree as ET
 from datetime import datetime
+from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response
 
 from app.core.config import settings
 import uuid
 from datetime import datetime
 
-from app.services.infographic import InfographicRenderer
+from app.services.infographic_export import get_raster_exporter
+from app.services.infographic_store import render_and_store_infographic
 from app.services.jobs import Job
 from app.services.research_worker import run_research_and_render
+from app.services.resummarize import resummarize_session
 from app.services.storage import LocalMediaStorage
 from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -92,28 +96,8 @@ async def export_session_json(
     }
 
 
-@router.get("/{session_id}/infographic.svg")
-async def export_infographic_svg(
-    session_id: int,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """Export the session infographic as an SVG file."""
-    res = await db.execute(
-        select(ResearchSession).where(
-            ResearchSession.id == session_id,
-            ResearchSession.user_id == user.id,
-        )
-    )
-    session = res.scalar_one_or_none()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    await db.refresh(session, attribute_names=["infographic"])
-    if not session.infographic or not session.infographic.image_url:
-        raise HTTPException(status_code=404, detail="Infographic not found")
-
-    image_url: str = session.infographic.image_url
+def _stored_svg(image_url: str) -> bytes | None:
+    """SVG bytes of a stored infographic, or None if it lives at a remote URL."""
 
     # If stored as a local media URL, read it from disk.
     #
@@ -129,21 +113,13 @@ async def export_infographic_svg(
             raise HTTPException(status_code=500, detail=str(e))
 
         try:
-            svg = path.read_bytes()
+            return path.read_bytes()
         except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Infographic file missing")
 
-        return Response(
-            content=svg,
-            media_type="image/svg+xml",
-            headers={
-                "Content-Disposition": f"attachment; filename=infographic-session-{session.id}.svg"
-            },
-        )
-
-    # Otherwise if it's an http(s) URL (e.g. remote object storage), redirect.
+    # Otherwise if it's an http(s) URL (e.g. remote object storage), the caller decides.
     if image_url.startswith("http://") or image_url.startswith("https://"):
-        return Response(status_code=307, headers={"Location": image_url})
+        return None
 
     # Backward compatibility: handle legacy data URLs.
     if not image_url.startswith("data:image/svg+xml"):
@@ -153,7 +129,42 @@ async def export_infographic_svg(
     if idx == -1:
         raise HTTPException(status_code=500, detail="Invalid infographic data URL")
 
-    svg = image_url[idx + 1 :]
+    return image_url[idx + 1 :].encode("utf-8")
+
+
+async def _load_session_infographic(
+    session_id: int, user: User, db: AsyncSession
+) -> ResearchSession:
+    res = await db.execute(
+        select(ResearchSession).where(
+            ResearchSession.id == session_id,
+            ResearchSession.user_id == user.id,
+        )
+    )
+    session = res.scalar_one_or_none()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    await db.refresh(session, attribute_names=["infographic"])
+    if not session.infographic or not session.infographic.image_url:
+        raise HTTPException(status_code=404, detail="Infographic not found")
+    return session
+
+
+@router.get("/{session_id}/infographic.svg")
+async def export_infographic_svg(
+    session_id: int,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Export the session infographic as an SVG file."""
+    session = await _load_session_infographic(session_id, user, db)
+    image_url: str = session.infographic.image_url
+
+    svg = _stored_svg(image_url)
+    if svg is None:
+        # Remote object storage: redirect.
+        return Response(status_code=307, headers={"Location": image_url})
 
     return Response(
         content=svg,
@@ -164,6 +175,40 @@ async def export_infographic_svg(
     )
 
 
+@router.get("/{session_id}/infographic.png")
+async def export_infographic_png(
+    session_id: int,
+    size: Literal["full", "thumbnail"] = "full",
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Export the session infographic as a PNG (full size or thumbnail).
+
+    Converted from the stored SVG on first request (in a worker process) and
+    served from storage afterwards.
+    """
+    session = await _load_session_infographic(session_id, user, db)
+
+    svg = _stored_svg(session.infographic.image_url)
+    if svg is None:
+        raise HTTPException(status_code=409, detail="Infographic is not stored locally")
+
+    storage = LocalMediaStorage(settings.media_root, settings.media_base_url)
+    try:
+        exported = await get_raster_exporter().export(storage, session_id=session.id, svg=svg)
+    except ET.ParseError:
+        raise HTTPException(status_code=500, detail="Stored infographic is not valid SVG")
+
+    stored = exported.thumbnail if size == "thumbnail" else exported.png
+    suffix = "-thumb" if size == "thumbnail" else ""
+    return FileResponse(
+        stored.path,
+        media_type="image/png",
+        filename=f"infographic-session-{session.id}{suffix}.png",
+        content_disposition_type="inline",
+    )
+
+
 @router.post(
     "/{session_id}/run",
     status_code=status.HTTP_202_ACCEPTED,
@@ -234,40 +279,8 @@ async def generate_infographic(
 
     await db.refresh(session, attribute_names=["sources", "infographic"])
 
-    # Build minimal layout metadata with provenance.
-    sources_meta = [
-        {
-            "source_id": s.id,
-            "title": s.title,
-            "url": s.url,
-            "confidence": s.confidence,
-        }
-        for s in session.sources
-    ]
-
-    renderer = InfographicRenderer()
-    rendered = renderer.render_session_infographic(prompt=session.prompt, sources=sources_meta)
-    layout_meta = rendered.layout_meta
-    svg = rendered.svg_bytes
-
-    storage = LocalMediaStorage(settings.media_root, settings.media_base_url)
-    stored = storage.save_bytes(
-        rel_path=f"sessions/{session.id}/infographic.svg",
-        content=svg,
-    )
-    image_url = stored.url
-
-    if session.infographic:
-        session.infographic.image_url = image_url
-        session.infographic.layout_meta = layout_meta
-    else:
-        db.add(
-            Infographic(
-                session_id=session.id,
-                image_url=image_url,
-                layout_meta=layout_meta,
-            )
-        )
+    # Skips rendering and storage when the layout hash is unchanged.
+    await render_and_store_infographic(db, session)
 
     session.status = "infographic_generated"
     await db.commit()
@@ -284,6 +297,32 @@ async def generate_infographic(
     )
 
 
+@router.post("/{session_id}/resummarize")
+async def resummarize_sources(
+    session_id: int,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Re-summarize the session's sources from stored page text (no network)."""
+    res = await db.execute(
+        select(ResearchSession).where(
+            ResearchSession.id == session_id,
+            ResearchSession.user_id == user.id,
+        )
+    )
+    session = res.scalar_one_or_none()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    result = await resummarize_session(
+        db,
+        session.id,
+        max_chars=settings.ingest_max_source_chars_for_summarization,
+    )
+    await db.commit()
+    return result
+
+
 @router.post("", response_model=ResearchSessionOut, status_code=201)
 async def create_session(
     payload: ResearchSessionCreate,
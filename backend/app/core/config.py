@@ -24,6 +24,11 @@ class Settings(BaseSettings):
     # In production, replace with object storage (S3/GCS) and store only URLs.
     media_root: str = "./media"
     media_base_url: str = "http://localhost:8000/media"
+    # Rendered SVGs kept in memory, keyed by layout hash.
+    render_cache_max_items: int = 128
+    # PNG export: worker processes for rasterizing, and thumbnail width in pixels.
+    raster_max_workers: int = 2
+    raster_thumbnail_width: int = 320
 
     # OAuth (Google)
     google_client_id: str | None = None
@@ -36,6 +41,25 @@ class Settings(BaseSettings):
     # Cookies
     cookie_secure: bool = False
 
+    # Outbound HTTP: one pooled client shared by search, fetch and OAuth.
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    # Needs the optional `h2` package (pip install "httpx[http2]").
+    http_http2: bool = False
+    http_connect_timeout_seconds: float = 5.0
+    http_read_timeout_seconds: float = 20.0
+    http_write_timeout_seconds: float = 20.0
+    http_pool_timeout_seconds: float = 5.0
+
+    # Web search provider: "duckduckgo", "local" (offline corpus, for CI and
+    # benchmarks) or "composite" (fallback/race across `search_composite_providers`).
+    search_provider: str = "duckduckgo"
+    search_composite_providers: str = "duckduckgo,local"
+    search_composite_strategy: str = "fallback"
+    # JSON list of {title, url, snippet}; defaults to the bundled sample corpus.
+    search_local_corpus_path: str | None = None
+
     # Web search: rate limiting + caching
     # These are used to protect upstream services (e.g., DuckDuckGo HTML endpoint)
     # and to cache repeated queries.
@@ -43,18 +67,61 @@ class Settings(BaseSettings):
     search_cache_ttl_seconds: int = 60 * 60
     search_cache_max_items: int = 512
     search_max_results: int = 5
-
+    # Expired results are still served for this long while a background refresh runs.
+    search_cache_stale_seconds: int = 10 * 60
+    # Upstream search failures are remembered briefly to avoid hammering a throttled provider.
+    search_negative_cache_ttl_seconds: int = 30
 
     # Source fetch/ingest: rate limiting + caching
+    # Applied per host; hosts are fetched concurrently under a global cap.
     fetch_rate_per_minute: int = 20
+    fetch_max_concurrency: int = 8
+    fetch_per_host_concurrency: int = 2
+    # Honour robots.txt Crawl-delay (capped) between requests to one host.
+    fetch_respect_crawl_delay: bool = False
+    fetch_max_crawl_delay_seconds: float = 10.0
+    # Transient failures (timeouts, 429, 5xx) are retried with jittered backoff;
+    # a host failing `threshold` times in a row is skipped for `reset` seconds.
+    fetch_retry_max_attempts: int = 3
+    fetch_retry_base_delay_seconds: float = 0.5
+    fetch_retry_max_delay_seconds: float = 8.0
+    fetch_breaker_failure_threshold: int = 5
+    fetch_breaker_reset_seconds: float = 60.0
     fetch_cache_ttl_seconds: int = 60 * 60
     fetch_cache_max_items: int = 512
+    fetch_cache_stale_seconds: int = 10 * 60
+    # Downloads are streamed and aborted beyond this many bytes.
+    fetch_max_bytes: int = 5_000_000
+    # Negative caching per failure class: network/HTTP errors are often transient,
+    # while unsupported content-types and block pages tend to persist.
+    fetch_negative_ttl_fetch_error_seconds: int = 60
+    fetch_negative_ttl_quality_error_seconds: int = 15 * 60
+    # Persistent store of extractions + ETag/Last-Modified for conditional
+    # revalidation across restarts. Empty disables it. Kept out of media_root,
+    # which is served publicly.
+    fetch_store_path: str | None = "./data/fetch_cache.sqlite3"
+    fetch_store_max_items: int = 10_000
 
     # Cost/latency guardrails for jobs
     # Caps work done per research session to prevent runaway costs.
     ingest_max_sources_per_session: int = 5
+    # Documents in the global store older than this are fetched again.
+    document_max_age_seconds: int = 7 * 24 * 60 * 60
     ingest_max_failures_per_session: int = 10
     ingest_max_source_chars_for_summarization: int = 20_000
+    # Drop navigation/footer/sidebar text before summarizing (density-based).
+    ingest_extract_main_content: bool = True
+    # Text sent to the summarizer per session (characters and estimated tokens).
+    ingest_max_summary_chars_per_session: int = 200_000
+    ingest_max_summary_tokens_per_session: int = 50_000
+
+    # Summarizer backend: "tfidf" (extractive, sentence ranking), "simple"
+    # (leading text) or "stub" (deterministic test double).
+    summarizer: str = "tfidf"
+    # Concurrent requests are batched: up to this many documents per backend
+    # call, waiting at most this long for a batch to fill.
+    summarizer_batch_max_size: int = 16
+    summarizer_batch_max_wait_ms: int = 20
 
 
 settings = Settings()
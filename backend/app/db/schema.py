@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import Connection, inspect
+from sqlalchemy.schema import CreateColumn
+
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+
+def create_schema(conn: Connection) -> None:
+    """Create missing tables, then add columns that existing tables lack.
+
+    There are no migrations: tables come from `create_all`, which never
+    alters a table that already exists. Columns added to a model later (e.g.
+    `sources.document_id`) are therefore added here with `ALTER TABLE ... ADD
+    COLUMN`, along with their indexes. Only nullable columns can be added
+    this way; anything else needs the database to be reset.
+    """
+
+    Base.metadata.create_all(conn)
+    add_missing_columns(conn)
+
+
+def add_missing_columns(conn: Connection) -> list[str]:
+    """Add nullable model columns missing from existing tables; returns `table.column` names."""
+
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    preparer = conn.dialect.identifier_preparer
+    added: list[str] = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        present = {c["name"] for c in inspector.get_columns(table.name)}
+        missing = [c for c in table.columns if c.name not in present]
+        for column in missing:
+            if not column.nullable:
+                raise RuntimeError(
+                    f"{table.name}.{column.name} is missing and NOT NULL; reset the database"
+                )
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}")
+            added.append(f"{table.name}.{column.name}")
+        names = {c.name for c in missing}
+        for index in table.indexes:
+            if names.intersection(c.name for c in index.columns):
+                index.create(conn, checkfirst=True)
+    if added:
+        logger.info("Added columns to existing tables: %s", ", ".join(added))
+    return added
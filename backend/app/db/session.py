@@ -16,9 +16,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with engine.begin() as conn:
         # For MVP/testing: ensure tables exist even if ASGI lifespan isn't executed
         # (httpx ASGITransport may not manage lifespan in some versions).
-        from app.db.base import Base
+        from app.db.schema import create_schema
 
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_schema)
 
     async with AsyncSessionLocal() as session:
         yield session
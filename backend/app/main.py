@@ -8,15 +8,22 @@ from fastapi.staticfiles import StaticFiles
 
 from app.api import auth, ingest, jobs, metrics, search, sessions
 from app.core.config import settings
-from app.db.base import Base
+from app.db.schema import create_schema
 from app.db.session import engine
+from app.services.http_pool import close_http_client, get_http_client
+from app.services.infographic_export import shutdown_raster_exporter
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield
+        await conn.run_sync(create_schema)
+    get_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
+        shutdown_raster_exporter()
 
 
 app = FastAPI(title="Research Infograph Assistant API", lifespan=lifespan)
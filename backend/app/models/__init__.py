@@ -3,5 +3,16 @@ from app.models.research_session import ResearchSession
 from app.models.source import Source
 from app.models.infographic import Infographic
 from app.models.message import Message
+from app.models.document import Document, DocumentURL
+from app.models.summary_cache import SummaryCacheEntry
 
-__all__ = ["User", "ResearchSession", "Source", "Infographic", "Message"]
+__all__ = [
+    "User",
+    "ResearchSession",
+    "Source",
+    "Infographic",
+    "Message",
+    "Document",
+    "DocumentURL",
+    "SummaryCacheEntry",
+]
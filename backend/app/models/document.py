@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import zlib
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+
+
+class Document(Base):
+    """A fetched page shared by every session that cites it.
+
+    Keyed by a hash of the extracted text, so mirrors and syndicated copies of
+    the same article collapse into one row; `DocumentURL` maps each canonical
+    URL onto it.
+    """
+
+    __tablename__ = "documents"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    canonical_url: Mapped[str] = mapped_column(String(2000))
+    title: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # zlib-compressed UTF-8 text. Deferred and raise-on-access: session and
+    # source listings never load it; use DocumentStore.load_texts() (or
+    # `undefer`) when the text is actually needed, then read `.text`.
+    text_compressed: Mapped[bytes] = mapped_column(
+        LargeBinary, deferred=True, deferred_raiseload=True
+    )
+    text_chars: Mapped[int] = mapped_column(Integer, default=0)
+    summary: Mapped[str] = mapped_column(String, default="")
+    key_points: Mapped[list] = mapped_column(JSON, default=list)
+    content_type: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow
+    )
+
+    urls = relationship("DocumentURL", back_populates="document", cascade="all, delete-orphan")
+
+    @property
+    def text(self) -> str:
+        return decompress_text(self.text_compressed)
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self.text_compressed = compress_text(value)
+        self.text_chars = len(value)
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+class DocumentURL(Base):
+    __tablename__ = "document_urls"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    canonical_url: Mapped[str] = mapped_column(String(2000), unique=True, index=True)
+    document_id: Mapped[int] = mapped_column(ForeignKey("documents.id"), index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow
+    )
+
+    document = relationship("Document", back_populates="urls")
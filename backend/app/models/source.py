@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, String
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -15,6 +15,9 @@ class Source(Base):
     session_id: Mapped[int] = mapped_column(
         ForeignKey("research_sessions.id"), index=True
     )
+    document_id: Mapped[int | None] = mapped_column(
+        ForeignKey("documents.id"), nullable=True, index=True
+    )
     title: Mapped[str] = mapped_column(String(500))
     url: Mapped[str] = mapped_column(String(2000))
     snippet: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -23,5 +26,11 @@ class Source(Base):
     )
     confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
     score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # This session's own re-summarization of the document (see
+    # resummarize_session); None means the shared document's summary applies.
+    summary: Mapped[str | None] = mapped_column(String, nullable=True)
+    key_points: Mapped[list | None] = mapped_column(JSON, nullable=True)
 
     session = relationship("ResearchSession", back_populates="sources")
+    # Never loaded implicitly; documents hold the (large) stored page text.
+    document = relationship("Document", lazy="raise")
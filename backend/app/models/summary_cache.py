@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SummaryCacheEntry(Base):
+    """A summary computed once per (text, summarizer configuration).
+
+    `cache_key` hashes the sha256 of the exact summarized text (stored as
+    `content_hash`) together with the summarizer fingerprint (name, version
+    and parameters), so bumping a summarizer's version simply stops matching
+    the old rows.
+    """
+
+    __tablename__ = "summary_cache"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    cache_key: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    content_hash: Mapped[str] = mapped_column(String(64), index=True)
+    fingerprint: Mapped[str] = mapped_column(String(500))
+    summary: Mapped[str] = mapped_column(String, default="")
+    key_points: Mapped[list] = mapped_column(JSON, default=list)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow
+    )
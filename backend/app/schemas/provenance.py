@@ -10,5 +10,9 @@ class ClaimOut(BaseModel):
     text: str = Field(..., description="The claim text")
     source_ids: list[int] = Field(
         default_factory=list,
-        description="IDs of Source records supporting this claim",
+        description="IDs of Source records supporting this claim, best match first",
+    )
+    scores: list[float] = Field(
+        default_factory=list,
+        description="Match score (0-1) of each of source_ids, in the same order",
     )
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+
+from app.services.page_analysis import TextBlock
+
+_SENTENCE_END = (".", "!", "?", ":", '"', "”")
+
+
+class MainContentExtractor:
+    """Readability-style main-content extraction over analyzed text blocks.
+
+    Each block (one line of visible text from `analyze_page`) is classified:
+    - bad: inside boilerplate (nav, footer, cookie banner, sidebar, ...) or
+      mostly link text;
+    - good: long, sentence-like and link-poor;
+    - short: everything else (headings, captions, bylines).
+
+    Short blocks are kept only in good context: a heading followed by good
+    content, or a block with good content on both sides. If too little
+    survives, the page is assumed to have an unusual layout and the full
+    text is returned unchanged.
+    """
+
+    name = "density"
+
+    def __init__(
+        self,
+        *,
+        good_min_chars: int = 70,
+        max_link_density: float = 0.5,
+        good_max_link_density: float = 0.25,
+        min_output_chars: int = 200,
+    ) -> None:
+        self.good_min_chars = good_min_chars
+        self.max_link_density = max_link_density
+        self.good_max_link_density = good_max_link_density
+        self.min_output_chars = min_output_chars
+
+    def _classify(self, block: TextBlock) -> str:
+        if block.boilerplate or block.link_density > self.max_link_density:
+            return "bad"
+        if (
+            not block.heading
+            and len(block.text) >= self.good_min_chars
+            and block.link_density <= self.good_max_link_density
+            and (block.text.endswith(_SENTENCE_END) or block.text.count(". ") >= 1)
+        ):
+            return "good"
+        return "short"
+
+    def iter_main_text(self, blocks: Sequence[TextBlock]) -> Iterator[str]:
+        """Yield the kept blocks' text in page order.
+
+        Lazy: a block is classified only when reached or when a short block
+        needs to look ahead to the next non-short one, so a consumer that
+        stops early never classifies the rest of the page.
+        """
+
+        classes: list[str] = []
+
+        def class_at(j: int) -> str:
+            while len(classes) <= j:
+                classes.append(self._classify(blocks[len(classes)]))
+            return classes[j]
+
+        prev_class: str | None = None
+        ahead = 0  # index of the next non-short block (or len(blocks))
+        next_class: str | None = None
+        for i, block in enumerate(blocks):
+            cls = class_at(i)
+            if cls == "good":
+                yield block.text
+            elif cls == "short":
+                if ahead <= i:
+                    ahead, next_class = i + 1, None
+                    while ahead < len(blocks):
+                        if class_at(ahead) != "short":
+                            next_class = classes[ahead]
+                            break
+                        ahead += 1
+                if next_class == "good" and (block.heading or prev_class == "good"):
+                    yield block.text
+            if cls != "short":
+                prev_class = cls
+
+    def extract(
+        self, blocks: Sequence[TextBlock], *, fallback: str = "", max_chars: int | None = None
+    ) -> str:
+        """Main text, or `fallback` if too little survives.
+
+        With `max_chars`, extraction stops once that much text is kept and the
+        result (or fallback) is cut to `max_chars`.
+        """
+
+        limit = max_chars if max_chars is not None and max_chars > 0 else None
+        kept: list[str] = []
+        size = 0
+        if blocks:
+            for text in self.iter_main_text(blocks):
+                kept.append(text)
+                size += len(text) + 1
+                if limit is not None and size > limit:
+                    break
+
+        text = "\n".join(kept)
+        if len(text) < self.min_output_chars:
+            text = fallback
+        return text[:limit] if limit is not None else text
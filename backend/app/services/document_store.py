@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Document, DocumentURL
+from app.models.document import decompress_text
+from app.services.source_fetcher import FetchedSource
+from app.services.summarizer import Summary
+from app.services.summary_cache import SummaryCache
+from app.services.urls import canonicalize_url
+
+
+def content_hash(text: str) -> str:
+    """Hash of whitespace-normalized text; identical articles share it."""
+
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+class DocumentStore:
+    """Global, cross-session store of fetched + summarized pages.
+
+    Lookups go through the canonical URL (tracking params, fragments and
+    default ports don't matter). Writes are keyed by content hash, so a mirror
+    or syndicated copy with the same text is mapped onto the existing document
+    instead of creating a new one.
+
+    The stored text is the full extracted text; only what is passed to the
+    summarizer is capped at the ingest budget, so the content hash, resummarize
+    and claim matching see the whole page. It is never loaded with the
+    document row; `load_texts` fetches it on demand so summaries and claims
+    can be rebuilt offline.
+
+    Calls are serialized on the given AsyncSession, which is not safe for
+    concurrent use; fetching still happens concurrently outside the store.
+    `summaries` is the summary cache on the same session and lock.
+    """
+
+    def __init__(self, db: AsyncSession, *, max_age_seconds: int | None = None) -> None:
+        self._db = db
+        self._max_age = timedelta(seconds=max_age_seconds) if max_age_seconds else None
+        self._lock = asyncio.Lock()
+        self.summaries = SummaryCache(db, lock=self._lock)
+
+    async def get_by_url(self, url: str) -> Document | None:
+        """Return the stored document for `url`, unless it is older than max age."""
+
+        async with self._lock:
+            res = await self._db.execute(
+                select(Document)
+                .join(DocumentURL, DocumentURL.document_id == Document.id)
+                .where(DocumentURL.canonical_url == canonicalize_url(url))
+            )
+            doc = res.scalar_one_or_none()
+        if doc is None:
+            return None
+        if self._max_age is not None and doc.fetched_at is not None:
+            fetched_at = doc.fetched_at.replace(tzinfo=None)
+            if datetime.utcnow() - fetched_at > self._max_age:
+                return None
+        return doc
+
+    async def load_texts(self, document_ids: list[int]) -> dict[int, str]:
+        """Load and decompress stored text for several documents in one query."""
+
+        if not document_ids:
+            return {}
+        async with self._lock:
+            res = await self._db.execute(
+                select(Document.id, Document.text_compressed).where(
+                    Document.id.in_(set(document_ids))
+                )
+            )
+            rows = res.all()
+        return {doc_id: decompress_text(data) for doc_id, data in rows}
+
+    async def save(
+        self, url: str, fetched: FetchedSource, summary: Summary, *, text: str | None = None
+    ) -> Document:
+        """Store a fetch result and map `url` onto it; returns the (possibly existing) document.
+
+        `text` is the extracted main content (before any summarization cap);
+        defaults to the full fetched text.
+        """
+
+        canonical = canonicalize_url(url)
+        text = fetched.text if text is None else text
+        digest = content_hash(text)
+        async with self._lock:
+            doc = await self._by_hash(digest)
+            if doc is None:
+                doc = Document(
+                    content_hash=digest,
+                    canonical_url=canonical,
+                    title=(fetched.title or "")[:500] or None,
+                    summary=summary.summary,
+                    key_points=list(summary.key_points),
+                    content_type=fetched.content_type,
+                    status_code=fetched.status_code,
+                    fetched_at=_fetched_at(fetched),
+                )
+                doc.text = text
+                try:
+                    async with self._db.begin_nested():
+                        self._db.add(doc)
+                except IntegrityError:
+                    # Another session stored the same content first.
+                    doc = await self._by_hash(digest)
+                    if doc is None:
+                        raise
+            else:
+                doc.fetched_at = _fetched_at(fetched)
+
+            await self._map_url(canonical, doc)
+        return doc
+
+    async def _by_hash(self, digest: str) -> Document | None:
+        res = await self._db.execute(select(Document).where(Document.content_hash == digest))
+        return res.scalar_one_or_none()
+
+    async def _map_url(self, canonical: str, doc: Document) -> None:
+        res = await self._db.execute(
+            select(DocumentURL).where(DocumentURL.canonical_url == canonical)
+        )
+        mapping = res.scalar_one_or_none()
+        if mapping is None:
+            try:
+                async with self._db.begin_nested():
+                    self._db.add(DocumentURL(canonical_url=canonical, document_id=doc.id))
+            except IntegrityError:
+                pass
+        elif mapping.document_id != doc.id:
+            # The page at this URL changed; point it at the new content.
+            mapping.document_id = doc.id
+        await self._db.flush()
+
+
+def _fetched_at(fetched: FetchedSource) -> datetime:
+    if fetched.fetched_at_epoch:
+        return datetime.utcfromtimestamp(fetched.fetched_at_epoch)
+    return datetime.utcnow()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from app.services.http_pool import get_http_client
+from app.services.singleflight import SingleFlight
+from app.services.web_search import SimpleTTLCache, TokenBucketRateLimiter
+
+ROBOTS_USER_AGENT = "Mozilla/5.0"
+
+# Returns the robots.txt body for a "scheme://host" origin, or None.
+RobotsLoader = Callable[[str], Awaitable[str | None]]
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url.strip()).hostname or "").lower()
+
+
+def interleave_by_host(urls: list[str]) -> list[str]:
+    """Order URLs round-robin across hosts, keeping per-host order.
+
+    ["a/1", "a/2", "b/1", "c/1"] -> ["a/1", "b/1", "c/1", "a/2"]: the first URL
+    of every host is started before any host gets a second one.
+    """
+
+    queues: OrderedDict[str, list[str]] = OrderedDict()
+    for url in urls:
+        queues.setdefault(host_of(url), []).append(url)
+    out: list[str] = []
+    rnd = 0
+    while len(out) < len(urls):
+        for queue in queues.values():
+            if rnd < len(queue):
+                out.append(queue[rnd])
+        rnd += 1
+    return out
+
+
+@dataclass
+class _HostState:
+    semaphore: asyncio.Semaphore
+    bucket: TokenBucketRateLimiter
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    next_start_at: float = 0.0
+    # Requests holding or waiting for this host's admission.
+    users: int = 0
+
+    def idle(self, now: float) -> bool:
+        """No request in flight or waiting, and no crawl-delay spacing pending."""
+
+        return self.users == 0 and self.next_start_at <= now
+
+
+class FetchScheduler:
+    """Host-aware admission control for outbound page fetches.
+
+    Each request must get, in order:
+    1. a per-host slot (`per_host_concurrency`) and a per-host rate token,
+       plus the host's robots.txt `Crawl-delay` spacing if enabled;
+    2. a global slot (`max_concurrency`).
+
+    Host limits are taken before the global slot, so requests queued behind a
+    busy or slow host never hold a global slot that another host could use.
+    Throughput therefore grows with the number of distinct hosts instead of
+    being capped by a single shared bucket.
+
+    Note: State is process-local (MVP), like the other limiters.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 8,
+        per_host_concurrency: int = 2,
+        per_host_rate_per_minute: int = 20,
+        robots_loader: RobotsLoader | None = None,
+        robots_ttl_seconds: int = 60 * 60,
+        max_crawl_delay_seconds: float = 10.0,
+        max_hosts: int = 1024,
+    ) -> None:
+        if max_concurrency <= 0 or per_host_concurrency <= 0:
+            raise ValueError("concurrency limits must be > 0")
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._per_host_concurrency = per_host_concurrency
+        self._per_host_rate = per_host_rate_per_minute
+        self._robots_loader = robots_loader
+        self._robots = SimpleTTLCache(ttl_seconds=robots_ttl_seconds, max_items=max_hosts)
+        self._robots_inflight = SingleFlight()
+        self._max_crawl_delay = max_crawl_delay_seconds
+        self._max_hosts = max_hosts
+        self._hosts: OrderedDict[str, _HostState] = OrderedDict()
+
+    def _host_state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(
+                semaphore=asyncio.Semaphore(self._per_host_concurrency),
+                bucket=TokenBucketRateLimiter(rate_per_minute=self._per_host_rate),
+            )
+            self._hosts[host] = state
+            # Forget the least recently used idle hosts once the table is full.
+            # A host with work in flight or waiting is kept: a fresh entry for
+            # it would bypass its concurrency and crawl-delay limits.
+            excess = len(self._hosts) - self._max_hosts
+            if excess > 0:
+                now = time.monotonic()
+                idle = [h for h, st in self._hosts.items() if h != host and st.idle(now)]
+                for name in idle[:excess]:
+                    del self._hosts[name]
+        else:
+            self._hosts.move_to_end(host)
+        return state
+
+    async def crawl_delay(self, url: str) -> float:
+        """Return the robots.txt Crawl-delay for the URL's host (0 if none)."""
+
+        if self._robots_loader is None:
+            return 0.0
+        parts = urlsplit(url.strip())
+        origin = f"{parts.scheme}://{parts.netloc}".lower()
+        cached = self._robots.get(origin)
+        if cached is not None:
+            return cached
+        return await self._robots_inflight.do(origin, partial(self._load_crawl_delay, origin))
+
+    async def _load_crawl_delay(self, origin: str) -> float:
+        delay = 0.0
+        try:
+            body = await self._robots_loader(origin)
+        except Exception:  # noqa: BLE001
+            body = None
+        if body:
+            parser = RobotFileParser()
+            parser.parse(body.splitlines())
+            value = parser.crawl_delay(ROBOTS_USER_AGENT)
+            if value:
+                delay = min(float(value), self._max_crawl_delay)
+        self._robots.set(origin, delay)
+        return delay
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold admission for one request to `url` for the duration of the block."""
+
+        state = self._host_state(host_of(url))
+        state.users += 1
+        try:
+            async with state.semaphore:
+                await state.bucket.acquire()
+                delay = await self.crawl_delay(url)
+                if delay:
+                    async with state.lock:
+                        wait = state.next_start_at - time.monotonic()
+                        if wait > 0:
+                            await asyncio.sleep(wait)
+                        state.next_start_at = time.monotonic() + delay
+                async with self._global:
+                    yield
+        finally:
+            state.users -= 1
+
+
+async def load_robots_txt(origin: str) -> str | None:
+    """Fetch `<origin>/robots.txt` with the shared client; None when unavailable."""
+
+    resp = await get_http_client().get(
+        f"{origin}/robots.txt",
+        headers={"user-agent": ROBOTS_USER_AGENT},
+        follow_redirects=True,
+        timeout=5.0,
+    )
+    if resp.status_code != 200:
+        return None
+    return resp.text
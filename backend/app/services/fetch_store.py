@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class StoredFetch:
+    """A persisted extraction result plus the validators needed to revalidate it."""
+
+    url: str
+    payload: dict[str, Any]
+    etag: str | None
+    last_modified: str | None
+    fresh_until: float
+    stored_at: float
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) < self.fresh_until
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """The parts of `Cache-Control` the fetch store cares about."""
+
+    store: bool = True
+    max_age: int | None = None
+
+    @classmethod
+    def parse(cls, header: str | None) -> CachePolicy:
+        if not header:
+            return cls()
+        directives: dict[str, str] = {}
+        for part in header.lower().split(","):
+            name, _, value = part.strip().partition("=")
+            directives[name] = value.strip().strip('"')
+        if "no-store" in directives:
+            return cls(store=False)
+        if "no-cache" in directives:
+            return cls(max_age=0)
+        # We act as a shared cache, so s-maxage wins over max-age.
+        for name in ("s-maxage", "max-age"):
+            if directives.get(name, "").isdigit():
+                return cls(max_age=int(directives[name]))
+        return cls()
+
+
+class PersistentFetchStore:
+    """Local SQLite store for fetched page extractions (stdlib sqlite3).
+
+    Entries are keyed by canonical URL and hold the extracted result
+    (zlib-compressed JSON) together with `ETag` / `Last-Modified`, so an expired
+    entry can be revalidated with a conditional request and reused on 304
+    without parsing the page again. `fresh_until` comes from
+    `Cache-Control: max-age`; until then no request is made at all.
+
+    Note: This is process-local disk state (MVP). Blocking sqlite calls run in
+    a worker thread so they don't stall the event loop.
+    """
+
+    def __init__(self, path: str | Path, *, max_items: int = 10_000) -> None:
+        if max_items <= 0:
+            raise ValueError("max_items must be > 0")
+        self.path = Path(path)
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fetch_store ("
+                " url TEXT PRIMARY KEY,"
+                " payload BLOB NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " fresh_until REAL NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_fetch_store_stored_at ON fetch_store (stored_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _get_sync(self, url: str) -> StoredFetch | None:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT payload, etag, last_modified, fresh_until, stored_at"
+                    " FROM fetch_store WHERE url = ?",
+                    (url,),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        payload, etag, last_modified, fresh_until, stored_at = row
+        return StoredFetch(
+            url=url,
+            payload=json.loads(zlib.decompress(payload)),
+            etag=etag,
+            last_modified=last_modified,
+            fresh_until=fresh_until,
+            stored_at=stored_at,
+        )
+
+    def _put_sync(self, entry: StoredFetch) -> None:
+        blob = zlib.compress(json.dumps(entry.payload).encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO fetch_store"
+                " (url, payload, etag, last_modified, fresh_until, stored_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    entry.url,
+                    blob,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.fresh_until,
+                    entry.stored_at,
+                ),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                # Keep the newest max_items entries.
+                conn.execute(
+                    "DELETE FROM fetch_store WHERE url IN ("
+                    " SELECT url FROM fetch_store ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_items,),
+                )
+            conn.commit()
+
+    def _touch_sync(self, url: str, fresh_until: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE fetch_store SET fresh_until = ?, stored_at = ? WHERE url = ?",
+                (fresh_until, time.time(), url),
+            )
+            conn.commit()
+
+    def _delete_sync(self, url: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM fetch_store WHERE url = ?", (url,))
+            conn.commit()
+
+    async def get(self, url: str) -> StoredFetch | None:
+        return await asyncio.to_thread(self._get_sync, url)
+
+    async def put(self, entry: StoredFetch) -> None:
+        await asyncio.to_thread(self._put_sync, entry)
+
+    async def touch(self, url: str, *, fresh_until: float) -> None:
+        """Record a successful revalidation (304) without rewriting the payload."""
+
+        await asyncio.to_thread(self._touch_sync, url, fresh_until)
+
+    async def delete(self, url: str) -> None:
+        await asyncio.to_thread(self._delete_sync, url)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
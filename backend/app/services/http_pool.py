@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from dataclasses import dataclass
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolMetrics:
+    """Request counters for the shared client, updated by its transport."""
+
+    requests_total: int = 0
+    errors_total: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Wrap the pooled transport to count requests in flight.
+
+    A request counts as in flight until its response headers arrive (or it
+    fails); streamed bodies are read afterwards on the same connection.
+    """
+
+    def __init__(self, inner: httpx.AsyncHTTPTransport, metrics: PoolMetrics) -> None:
+        self._inner = inner
+        self._metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        m = self._metrics
+        m.requests_total += 1
+        m.in_flight += 1
+        m.peak_in_flight = max(m.peak_in_flight, m.in_flight)
+        try:
+            return await self._inner.handle_async_request(request)
+        except Exception:
+            m.errors_total += 1
+            raise
+        finally:
+            m.in_flight -= 1
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    def connections(self) -> tuple[int, int]:
+        """Return (open, idle) pooled connections, best effort."""
+
+        # httpcore does not expose a public API for this; degrade to zeros.
+        pool = getattr(self._inner, "_pool", None)
+        conns = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in conns if getattr(c, "is_idle", lambda: False)())
+        return len(conns), idle
+
+
+_metrics = PoolMetrics()
+_client: httpx.AsyncClient | None = None
+_transport: _MeteredTransport | None = None
+# Event loop the shared client was opened on; its pooled connections belong to it.
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_http_client(settings, metrics: PoolMetrics | None = None) -> httpx.AsyncClient:
+    """Build an AsyncClient with pool limits, keep-alive and timeouts from Settings."""
+
+    return _build(settings, metrics or PoolMetrics())[0]
+
+
+def _build(settings, metrics: PoolMetrics) -> tuple[httpx.AsyncClient, _MeteredTransport]:
+    http2 = settings.http_http2
+    if http2 and not _http2_available():
+        logger.warning("INFOGRAPH_HTTP_HTTP2 is set but the 'h2' package is missing; using HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+    timeout = httpx.Timeout(
+        connect=settings.http_connect_timeout_seconds,
+        read=settings.http_read_timeout_seconds,
+        write=settings.http_write_timeout_seconds,
+        pool=settings.http_pool_timeout_seconds,
+    )
+    transport = _MeteredTransport(httpx.AsyncHTTPTransport(limits=limits, http2=http2), metrics)
+    return httpx.AsyncClient(transport=transport, timeout=timeout), transport
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the application-wide HTTP client for the running event loop.
+
+    Opened in the app lifespan and closed when it ends. Outside of it
+    (scripts, tests) it is created lazily, and again after it was closed or
+    when called from another event loop: pooled connections can't be shared
+    across loops, and the old client can't be closed from the new one.
+    """
+
+    global _client, _transport, _client_loop
+    try:
+        loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        from app.core.config import settings
+
+        _client, _transport = _build(settings, _metrics)
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client, _transport, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _transport = None
+    _client_loop = None
+
+
+def pool_metrics() -> dict:
+    """Snapshot of shared-client usage for the metrics endpoint."""
+
+    open_conns, idle_conns = _transport.connections() if _transport is not None else (0, 0)
+    return {
+        "requests_total": _metrics.requests_total,
+        "errors_total": _metrics.errors_total,
+        "in_flight": _metrics.in_flight,
+        "peak_in_flight": _metrics.peak_in_flight,
+        "open_connections": open_conns,
+        "idle_connections": idle_conns,
+        "client_open": _client is not None and not _client.is_closed,
+    }
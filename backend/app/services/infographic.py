@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import re
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
+from app.services.key_points import KeyPoint
+from app.services.provenance import ProvenanceIndex
+from app.services.svg_templates import compile_template, escape_xml
+
+# Bump when the template or layout_meta shape changes; part of the layout hash.
+TEMPLATE_VERSION = 4
+
 
 @dataclass(frozen=True)
 class RenderedInfographic:
@@ -12,76 +24,323 @@ class RenderedInfographic:
     layout_meta: dict[str, Any]
 
 
-def _xml_escape(text: str) -> str:
-    return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
+def layout_hash(
+    *,
+    prompt: str,
+    sources: list[dict[str, Any]],
+    key_points: Sequence[KeyPoint] | None = None,
+    evidence: list | None = None,
+) -> str:
+    """Stable hash of everything a render depends on, including the template version.
+
+    `evidence` identifies the texts claims were matched against (see
+    `provenance.source_evidence`).
+    """
+
+    payload = {
+        "template_version": TEMPLATE_VERSION,
+        "prompt": prompt,
+        "sources": sources,
+        "key_points": [[kp.text, list(kp.source_ids)] for kp in key_points or ()],
+        "evidence": evidence or [],
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Small in-memory LRU of rendered infographics keyed by layout hash."""
+
+    def __init__(self, max_items: int = 128) -> None:
+        if max_items <= 0:
+            raise ValueError("max_items must be > 0")
+        self.max_items = max_items
+        self._items: OrderedDict[str, RenderedInfographic] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> RenderedInfographic | None:
+        rendered = self._items.get(key)
+        if rendered is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return rendered
+
+    def put(self, key: str, rendered: RenderedInfographic) -> None:
+        self._items[key] = rendered
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+
+@dataclass(frozen=True)
+class Layout:
+    """A layout variant; see `choose_layout`."""
+
+    name: str
+    width: int
+    max_bullets: int
+    # Per-claim bar showing how many sources back it.
+    support_bars: bool = False
+    # Sources-per-site bar chart.
+    domain_chart: bool = False
+    reference_columns: int = 0
+    max_references: int = 0
+
+
+COMPACT = Layout(name="compact", width=800, max_bullets=8)
+EVIDENCE = Layout(
+    name="evidence", width=1000, max_bullets=8, support_bars=True, reference_columns=1, max_references=10
+)
+DENSE = Layout(
+    name="dense",
+    width=1000,
+    max_bullets=8,
+    support_bars=True,
+    domain_chart=True,
+    reference_columns=2,
+    max_references=24,
+)
+
+# From this many sources on, a site breakdown and two-column references take over.
+DENSE_MIN_SOURCES = 13
+
+
+def choose_layout(*, source_count: int, has_key_points: bool) -> Layout:
+    if source_count >= DENSE_MIN_SOURCES:
+        return DENSE
+    if has_key_points:
+        return EVIDENCE
+    return COMPACT
+
+
+# Fragments are compiled once at import; static markup is emitted verbatim.
+_HEADER = compile_template(
+    "<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}'>"
+    "<rect width='100%' height='100%' fill='#0B1220'/>"
+    "<text x='40' y='70' fill='#E5E7EB' font-family='Arial' font-size='28' font-weight='700'>{title}</text>"
+    "<text x='40' y='110' fill='#9CA3AF' font-family='Arial' font-size='14'>Generated infographic (MVP)</text>"
+)
+_BULLET = compile_template(
+    "<text x='60' y='{y}' fill='#E5E7EB' font-family='Arial' font-size='18'>{text}</text>"
+)
+_SUPPORT_BAR = compile_template(
+    "<rect x='{x}' y='{y}' width='{bar_width}' height='10' rx='2' fill='#38BDF8'/>"
+)
+_SECTION = compile_template(
+    "<text x='40' y='{y}' fill='#9CA3AF' font-family='Arial' font-size='14' font-weight='700'>{label}</text>"
+)
+_CHART_ROW = compile_template(
+    "<text x='60' y='{y}' fill='#E5E7EB' font-family='Arial' font-size='13'>{label}</text>"
+    "<rect x='300' y='{bar_y}' width='{bar_width}' height='12' rx='2' fill='#38BDF8'/>"
+    "<text x='{count_x}' y='{y}' fill='#9CA3AF' font-family='Arial' font-size='12'>{count}</text>"
+)
+_REFERENCE = compile_template(
+    "<text x='{x}' y='{y}' fill='#9CA3AF' font-family='Arial' font-size='12'>[{n}] {text}</text>"
+)
+_FOOTER = "</svg>"
+
+_MIN_HEIGHT = 450
+_HEADER_HEIGHT = 160
+_BULLET_STEP = 36
+_SECTION_STEP = 32
+_CHART_STEP = 20
+_REFERENCE_STEP = 18
+_SUPPORT_BAR_MAX = 140
+_CHART_BAR_MAX = 400
+_MAX_CHART_ROWS = 6
+
+
+# Host of an absolute URL; much cheaper than urlsplit() for every source.
+_HOST = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*://(?:[^@/?#]*@)?(\[[^\]]*\]|[^:/?#]*)")
+
+
+def _site(url: str) -> str:
+    m = _HOST.match(url or "")
+    host = m.group(1).lower() if m else ""
+    return host.removeprefix("www.") or "(unknown)"
+
+
+def _write_svg(
+    out: list[str],
+    layout: Layout,
+    *,
+    title: str,
+    bullets: list[str],
+    support: list[int],
+    sources: list[dict[str, Any]],
+) -> None:
+    """Append a complete SVG document for `layout` to `out`.
+
+    `support[i]` is the number of sources behind `bullets[i]`.
+    """
+
+    bullets = bullets[: layout.max_bullets]
+    sites = (
+        Counter(_site(s.get("url", "")) for s in sources).most_common(_MAX_CHART_ROWS)
+        if layout.domain_chart
+        else []
     )
+    references = sources[: layout.max_references] if layout.reference_columns else []
+    ref_rows = -(-len(references) // layout.reference_columns) if references else 0
+    more = len(sources) - len(references) if references else 0
+
+    height = _HEADER_HEIGHT + len(bullets) * _BULLET_STEP
+    if sites:
+        height += _SECTION_STEP + len(sites) * _CHART_STEP
+    if references:
+        height += _SECTION_STEP + (ref_rows + (more > 0)) * _REFERENCE_STEP
+    _HEADER.render_into(out, {"width": layout.width, "height": max(_MIN_HEIGHT, height), "title": title})
+
+    y = _HEADER_HEIGHT
+    top_support = max(support, default=0) if layout.support_bars else 0
+    bar_x = layout.width - 40 - _SUPPORT_BAR_MAX
+    for idx, text in enumerate(bullets):
+        _BULLET.render_into(out, {"y": y, "text": text})
+        if top_support and idx < len(support) and support[idx]:
+            width = max(4, round(_SUPPORT_BAR_MAX * support[idx] / top_support))
+            _SUPPORT_BAR.render_into(out, {"x": bar_x, "y": y - 10, "bar_width": width})
+        y += _BULLET_STEP
+
+    if sites:
+        _SECTION.render_into(out, {"y": y, "label": "Sources by site"})
+        top = sites[0][1]
+        for row, (label, count) in enumerate(sites, 1):
+            row_y = y + (_SECTION_STEP - _CHART_STEP) + row * _CHART_STEP
+            width = max(4, round(_CHART_BAR_MAX * count / top))
+            _CHART_ROW.render_into(
+                out,
+                {
+                    "y": row_y,
+                    "label": label[:36],
+                    "bar_y": row_y - 11,
+                    "bar_width": width,
+                    "count_x": 308 + width,
+                    "count": count,
+                },
+            )
+        y += _SECTION_STEP + len(sites) * _CHART_STEP
+
+    if references:
+        _SECTION.render_into(out, {"y": y, "label": "References"})
+        columns = layout.reference_columns
+        column_width = (layout.width - 80) // columns
+        text_limit = 110 // columns
+        for idx, s in enumerate(references):
+            row, column = divmod(idx, columns)
+            text = (s.get("title") or "").strip() or s.get("url", "")
+            _REFERENCE.render_into(
+                out,
+                {
+                    "x": 40 + column * column_width,
+                    "y": y + (row + 1) * _REFERENCE_STEP,
+                    "n": idx + 1,
+                    "text": text[:text_limit],
+                },
+            )
+        if more > 0:
+            _SECTION.render_into(
+                out, {"y": y + (ref_rows + 1) * _REFERENCE_STEP, "label": f"+{more} more sources"}
+            )
+
+    out.append(_FOOTER)
 
 
 class InfographicRenderer:
     """Template-based infographic renderer (MVP).
 
     Produces a deterministic SVG and a layout metadata payload suitable for storage.
+    The layout variant depends on the content (see `choose_layout`).
 
     Note: This is intentionally simple and synchronous. Async job orchestration lives
     in a separate todo (Queue/worker).
     """
 
-    def render_session_infographic(self, *, prompt: str, sources: list[dict[str, Any]]) -> RenderedInfographic:
-        title = _xml_escape(prompt.strip()[:80])
+    def render_session_infographic(
+        self,
+        *,
+        prompt: str,
+        sources: list[dict[str, Any]],
+        key_points: Sequence[KeyPoint] | None = None,
+        provenance: ProvenanceIndex | None = None,
+        evidence: list | None = None,
+    ) -> RenderedInfographic:
+        """Render a session.
 
-        bullets = [
-            f"{idx+1}. {s.get('title', '').strip()[:80]}"
-            for idx, s in enumerate(sources[:5])
-            if s.get("title")
-        ]
-        if not bullets:
-            bullets = ["Add sources to generate richer results."]
-
-        claims: list[dict[str, Any]] = []
-        for idx, bullet in enumerate(bullets[:8]):
-            claim_source_ids = [
-                s.get("source_id")
-                for s in sources[: min(2, len(sources))]
+        With `key_points` (deduplicated across sources), each claim is a key
+        point; points stated by more sources come first. Without them, claims
+        fall back to source titles.
+
+        Each claim's `source_ids` are the sources matched by `provenance`,
+        best first, with their match `scores`; sources a key point (or title)
+        came from are always included. Without an index, claims are matched
+        against source titles only. `evidence` is what the index was built
+        from and is part of the layout hash.
+        """
+
+        raw_title = prompt.strip()[:80]
+        layout = choose_layout(source_count=len(sources), has_key_points=bool(key_points))
+        if provenance is None:
+            provenance = ProvenanceIndex(
+                (s["source_id"], s.get("title") or "")
+                for s in sources
                 if s.get("source_id") is not None
-            ]
-            claims.append(
-                {
-                    "id": f"c{idx+1}",
-                    "text": bullet,
-                    "source_ids": claim_source_ids,
-                    # If a claim has no sources, treat it as an ungrounded suggestion.
-                    "grounded": bool(claim_source_ids),
-                }
             )
 
+        # (claim text, text matched against sources, sources it came from)
+        pending: list[tuple[str, str, Sequence[int]]] = []
+        if key_points:
+            ranked = sorted(key_points, key=lambda kp: -len(kp.source_ids))[:8]
+            bullets = [f"{idx+1}. {kp.text[:80]}" for idx, kp in enumerate(ranked)]
+            pending = [(kp.text, kp.text, kp.source_ids) for kp in ranked]
+        else:
+            titled = [s for s in sources[:5] if s.get("title")]
+            bullets = [f"{idx+1}. {s['title'].strip()[:80]}" for idx, s in enumerate(titled)]
+            pending = [
+                (bullet, s["title"], [s["source_id"]] if s.get("source_id") is not None else [])
+                for bullet, s in zip(bullets, titled)
+            ]
+            if not bullets:
+                bullets = ["Add sources to generate richer results."]
+                pending = [(bullets[0], "", [])]
+
+        all_matches = provenance.match_many(
+            [match_text for _, match_text, _ in pending], include=[stated for _, _, stated in pending]
+        )
+        claims: list[dict[str, Any]] = [
+            {
+                "id": f"c{idx+1}",
+                "text": text,
+                "source_ids": [m.source_id for m in matches],
+                "scores": [m.score for m in matches],
+                # If a claim has no sources, treat it as an ungrounded suggestion.
+                "grounded": bool(matches),
+            }
+            for idx, ((text, _, _), matches) in enumerate(zip(pending, all_matches))
+        ]
+
         layout_meta: dict[str, Any] = {
-            "title": title,
+            "title": escape_xml(raw_title),
             "key_bullets": bullets,
             "claims": claims,
             "sources": sources,
             "generated_by": "mvp-svg-template",
-            "version": 2,
+            "layout": layout.name,
+            "version": TEMPLATE_VERSION,
+            "layout_hash": layout_hash(
+                prompt=prompt, sources=sources, key_points=key_points, evidence=evidence
+            ),
         }
 
-        lines: list[str] = [
-            "<svg xmlns='http://www.w3.org/2000/svg' width='800' height='450'>",
-            "<rect width='100%' height='100%' fill='#0B1220'/>",
-            "<text x='40' y='70' fill='#E5E7EB' font-family='Arial' font-size='28' font-weight='700'>",
-            f"{title}",
-            "</text>",
-            "<text x='40' y='110' fill='#9CA3AF' font-family='Arial' font-size='14'>Generated infographic (MVP)</text>",
-        ]
-        y = 160
-        for b in bullets[:8]:
-            safe = _xml_escape(b)
-            lines.append(
-                f"<text x='60' y='{y}' fill='#E5E7EB' font-family='Arial' font-size='18'>{safe}</text>"
-            )
-            y += 36
-        lines.append("</svg>")
-
-        return RenderedInfographic(svg_bytes="".join(lines).encode("utf-8"), layout_meta=layout_meta)
+        out: list[str] = []
+        _write_svg(
+            out,
+            layout,
+            title=raw_title,
+            bullets=bullets,
+            support=[len(c["source_ids"]) for c in claims],
+            sources=sources,
+        )
+        return RenderedInfographic(svg_bytes="".join(out).encode("utf-8"), layout_meta=layout_meta)
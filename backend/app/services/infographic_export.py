@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import xml.etree.ElementTree as ET
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from app.services.singleflight import SingleFlight
+from app.services.storage import LocalMediaStorage, StoredObject
+
+# Bump when rasterized output changes; part of the PNG file names.
+RASTER_VERSION = 1
+
+_REGULAR_FONTS = ("DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf")
+_BOLD_FONTS = ("DejaVuSans-Bold.ttf", "Arial Bold.ttf", "LiberationSans-Bold.ttf")
+
+
+@dataclass(frozen=True)
+class RasterImages:
+    png: bytes
+    thumbnail: bytes
+
+
+@lru_cache(maxsize=32)
+def _font(size: int, bold: bool) -> tuple[ImageFont.FreeTypeFont, bool]:
+    """Font for a size/weight, and whether bold must be faked with a stroke."""
+
+    for name in _BOLD_FONTS if bold else _REGULAR_FONTS:
+        try:
+            return ImageFont.truetype(name, size), False
+        except OSError:
+            continue
+    # Pillow's bundled font has no bold face.
+    return ImageFont.load_default(size=size), bold
+
+
+def _length(value: str | None, full: int) -> int:
+    if not value:
+        return 0
+    if value.endswith("%"):
+        return round(full * float(value[:-1]) / 100)
+    return round(float(value))
+
+
+def rasterize_svg(svg: bytes, *, thumbnail_width: int = 320) -> RasterImages:
+    """Rasterize an infographic SVG to a full-size PNG and a thumbnail.
+
+    Supports the subset `InfographicRenderer` emits: a sized root `<svg>`,
+    `<rect>` (optionally rounded) and `<text>` positioned at its baseline;
+    other elements are ignored. CPU-bound and picklable, so it can run in a
+    process pool (see `RasterExporter`).
+    """
+
+    root = ET.fromstring(svg)
+    width = _length(root.get("width"), 0) or 800
+    height = _length(root.get("height"), 0) or 450
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+
+    for el in root.iter():
+        tag = el.tag.rsplit("}", 1)[-1]
+        fill = el.get("fill")
+        if tag == "rect" and fill and fill != "none":
+            x = _length(el.get("x"), width)
+            y = _length(el.get("y"), height)
+            w = _length(el.get("width"), width)
+            h = _length(el.get("height"), height)
+            if w <= 0 or h <= 0:
+                continue
+            box = (x, y, x + w - 1, y + h - 1)
+            radius = _length(el.get("rx"), width)
+            color = ImageColor.getrgb(fill)
+            if radius:
+                draw.rounded_rectangle(box, radius=radius, fill=color)
+            else:
+                draw.rectangle(box, fill=color)
+        elif tag == "text" and el.text:
+            weight = el.get("font-weight", "")
+            font, fake_bold = _font(
+                _length(el.get("font-size"), height) or 16, weight in ("bold", "700", "800", "900")
+            )
+            color = ImageColor.getrgb(fill or "#000000")
+            draw.text(
+                (_length(el.get("x"), width), _length(el.get("y"), height)),
+                el.text,
+                font=font,
+                fill=color,
+                anchor="ls",
+                stroke_width=1 if fake_bold else 0,
+                stroke_fill=color,
+            )
+
+    full = io.BytesIO()
+    image.save(full, format="PNG")
+    thumb_height = max(1, round(height * thumbnail_width / width))
+    thumb = io.BytesIO()
+    image.resize((thumbnail_width, thumb_height), Image.LANCZOS).save(thumb, format="PNG")
+    return RasterImages(png=full.getvalue(), thumbnail=thumb.getvalue())
+
+
+@dataclass(frozen=True)
+class RasterExport:
+    png: StoredObject
+    thumbnail: StoredObject
+    # False when both files were already stored for this SVG.
+    generated: bool
+
+
+class RasterExporter:
+    """Convert stored infographic SVGs to PNG lazily, off the event loop.
+
+    Rasterizing runs in a process pool. Outputs are named by a hash of the
+    SVG bytes (`sessions/{id}/infographic-{hash}.png` and `-thumb.png`),
+    so a stored PNG is reused until the SVG changes; older renditions of the
+    session are then removed. Concurrent requests for the same SVG share one
+    conversion.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: Executor | None = None,
+        max_workers: int = 2,
+        thumbnail_width: int = 320,
+    ) -> None:
+        if thumbnail_width <= 0:
+            raise ValueError("thumbnail_width must be > 0")
+        self._executor = executor
+        self._owns_executor = executor is None
+        self.max_workers = max_workers
+        self.thumbnail_width = thumbnail_width
+        self._inflight = SingleFlight()
+        self.conversions = 0
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            # spawn: the parent runs an event loop and DB threads that must
+            # not be forked into the workers.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def export(self, storage: LocalMediaStorage, *, session_id: int, svg: bytes) -> RasterExport:
+        digest = hashlib.sha256(b"raster-v%d\n" % RASTER_VERSION + svg).hexdigest()[:16]
+        prefix = f"sessions/{session_id}/infographic-{digest}"
+        png_rel, thumb_rel = f"{prefix}.png", f"{prefix}-thumb.png"
+        png_path, thumb_path = storage.resolve(png_rel), storage.resolve(thumb_rel)
+
+        if png_path.exists() and thumb_path.exists():
+            return RasterExport(
+                png=StoredObject(url=storage.url_for(png_rel), path=png_path),
+                thumbnail=StoredObject(url=storage.url_for(thumb_rel), path=thumb_path),
+                generated=False,
+            )
+
+        async def convert() -> RasterExport:
+            loop = asyncio.get_running_loop()
+            images = await loop.run_in_executor(
+                self._pool(), partial(rasterize_svg, svg, thumbnail_width=self.thumbnail_width)
+            )
+            self.conversions += 1
+            thumbnail = storage.save_bytes(rel_path=thumb_rel, content=images.thumbnail)
+            png = storage.save_bytes(rel_path=png_rel, content=images.png)
+            for stale in png_path.parent.glob("infographic-*.png"):
+                if not stale.name.startswith(f"infographic-{digest}"):
+                    stale.unlink(missing_ok=True)
+            return RasterExport(png=png, thumbnail=thumbnail, generated=True)
+
+        return await self._inflight.do(png_rel, convert)
+
+    def shutdown(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_shared_exporter: RasterExporter | None = None
+
+
+def get_raster_exporter() -> RasterExporter:
+    """Process-wide PNG exporter (and its process pool), sized from Settings."""
+
+    global _shared_exporter
+    if _shared_exporter is None:
+        from app.core.config import settings
+
+        _shared_exporter = RasterExporter(
+            max_workers=settings.raster_max_workers,
+            thumbnail_width=settings.raster_thumbnail_width,
+        )
+    return _shared_exporter
+
+
+def shutdown_raster_exporter() -> None:
+    global _shared_exporter
+    if _shared_exporter is not None:
+        _shared_exporter.shutdown()
+        _shared_exporter = None
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Document, Infographic, ResearchSession
+from app.services.infographic import InfographicRenderer, RenderCache, layout_hash
+from app.services.key_points import KeyPoint, session_key_points
+from app.services.provenance import build_provenance_index, source_evidence
+from app.services.storage import LocalMediaStorage
+
+
+@dataclass(frozen=True)
+class StoredInfographic:
+    image_url: str
+    layout_meta: dict
+    # True when the stored render was already up to date (nothing rendered or written).
+    unchanged: bool
+    render_ms: int
+    store_ms: int
+
+
+@dataclass(frozen=True)
+class RenderInputs:
+    """Everything a session's render depends on, and its layout hash."""
+
+    sources: list[dict[str, Any]]
+    key_points: list[KeyPoint]
+    evidence: list
+    digest: str
+
+
+_shared_render_cache: RenderCache | None = None
+
+
+def get_render_cache() -> RenderCache:
+    """Process-wide LRU of rendered SVGs, sized from Settings."""
+
+    global _shared_render_cache
+    if _shared_render_cache is None:
+        from app.core.config import settings
+
+        _shared_render_cache = RenderCache(max_items=settings.render_cache_max_items)
+    return _shared_render_cache
+
+
+def infographic_path(session_id: int) -> str:
+    return f"sessions/{session_id}/infographic.svg"
+
+
+async def load_render_inputs(
+    db: AsyncSession, sessions: Sequence[ResearchSession]
+) -> dict[int, RenderInputs]:
+    """Render inputs of several sessions, keyed by session id.
+
+    Stored documents of all the sessions are read in one query (key points
+    and content hashes only, never the text). `session.sources` must be
+    loaded.
+    """
+
+    document_ids = {
+        s.document_id for session in sessions for s in session.sources if s.document_id is not None
+    }
+    points: dict[int, list] = {}
+    hashes: dict[int, str] = {}
+    if document_ids:
+        res = await db.execute(
+            select(Document.id, Document.content_hash, Document.key_points).where(
+                Document.id.in_(document_ids)
+            )
+        )
+        for doc_id, digest, key_points in res.all():
+            hashes[doc_id] = digest
+            points[doc_id] = key_points or []
+
+    inputs: dict[int, RenderInputs] = {}
+    for session in sessions:
+        sources_meta = [
+            {
+                "source_id": s.id,
+                "title": s.title,
+                "url": s.url,
+                "confidence": s.confidence,
+            }
+            for s in session.sources
+        ]
+        # Syndicated copies repeat the same sentences; merge them and their citations.
+        key_points = session_key_points(session.sources, points)
+        evidence = source_evidence(session.sources, hashes)
+        inputs[session.id] = RenderInputs(
+            sources=sources_meta,
+            key_points=key_points,
+            evidence=evidence,
+            digest=layout_hash(
+                prompt=session.prompt, sources=sources_meta, key_points=key_points, evidence=evidence
+            ),
+        )
+    return inputs
+
+
+def is_up_to_date(session: ResearchSession, digest: str, storage: LocalMediaStorage) -> bool:
+    """Whether the stored infographic was rendered from the same inputs and is still there."""
+
+    existing = session.infographic
+    return (
+        existing is not None
+        and (existing.layout_meta or {}).get("layout_hash") == digest
+        and storage.resolve(infographic_path(session.id)).exists()
+    )
+
+
+async def render_and_store_infographic(
+    db: AsyncSession,
+    session: ResearchSession,
+    *,
+    renderer: InfographicRenderer | None = None,
+    storage: LocalMediaStorage | None = None,
+    cache: RenderCache | None = None,
+) -> StoredInfographic:
+    """Render a session's infographic and store it, unless nothing changed.
+
+    The layout hash covers the prompt, sources, key points, the texts claims
+    are matched against (by content hash) and the template version. If it
+    matches the stored infographic's and the stored file is still there,
+    rendering and storage are skipped. Otherwise the SVG comes from the
+    render cache when possible, is written, and the Infographic row is
+    created or updated. `session.sources` and `session.infographic` must be
+    loaded; the caller commits.
+    """
+
+    from app.core.config import settings
+
+    storage = storage or LocalMediaStorage(settings.media_root, settings.media_base_url)
+    cache = cache or get_render_cache()
+
+    inputs = (await load_render_inputs(db, [session]))[session.id]
+    existing = session.infographic
+    if is_up_to_date(session, inputs.digest, storage):
+        return StoredInfographic(
+            image_url=existing.image_url,
+            layout_meta=existing.layout_meta,
+            unchanged=True,
+            render_ms=0,
+            store_ms=0,
+        )
+
+    t_render0 = perf_counter()
+    rendered = cache.get(inputs.digest)
+    if rendered is None:
+        # Stored texts are only loaded when something actually has to be rendered.
+        provenance = await build_provenance_index(db, session.sources)
+        rendered = (renderer or InfographicRenderer()).render_session_infographic(
+            prompt=session.prompt,
+            sources=inputs.sources,
+            key_points=inputs.key_points,
+            provenance=provenance,
+            evidence=inputs.evidence,
+        )
+        cache.put(inputs.digest, rendered)
+    render_ms = int((perf_counter() - t_render0) * 1000)
+
+    t_store0 = perf_counter()
+    stored = storage.save_bytes(rel_path=infographic_path(session.id), content=rendered.svg_bytes)
+    store_ms = int((perf_counter() - t_store0) * 1000)
+
+    # Cached renders are shared; give each row its own dict.
+    layout_meta = dict(rendered.layout_meta)
+    if existing is not None:
+        existing.image_url = stored.url
+        existing.layout_meta = layout_meta
+    else:
+        db.add(
+            Infographic(
+                session_id=session.id,
+                image_url=stored.url,
+                layout_meta=layout_meta,
+            )
+        )
+    return StoredInfographic(
+        image_url=stored.url,
+        layout_meta=layout_meta,
+        unchanged=False,
+        render_ms=render_ms,
+        store_ms=store_ms,
+    )
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import weakref
+from collections import deque
 from dataclasses import dataclass
 
-from app.services.source_fetcher import HTTPSourceFetcher
-from app.services.summarizer import SimpleSummarizer, Summary
+from app.services.content_extraction import MainContentExtractor
+from app.services.document_store import DocumentStore
+from app.services.fetch_scheduler import interleave_by_host
+from app.services.source_fetcher import HTTPSourceFetcher, get_source_fetcher
+from app.services.summarizer import Summarizer, Summary
+from app.services.summary_batching import BudgetedSummarizer, SummaryBudget, get_summarizer
+from app.services.summary_cache import SummaryCache
+from app.services.web_search import BudgetExceededError
+
+# Ingest tasks currently saving to the document store (see `ingest_many`).
+_persisting: weakref.WeakSet[asyncio.Task] = weakref.WeakSet()
 
 
 @dataclass(frozen=True)
@@ -12,33 +24,191 @@ class IngestedSource:
     title: str | None
     snippet: str | None
     summary: Summary
+    document_id: int | None = None
 
 
 class IngestPipeline:
-    """Fetch + parse + summarize pipeline for a single source URL."""
+    """Fetch + parse + summarize pipeline for a single source URL.
+
+    With a `documents` store, a URL already known globally (from any session)
+    is served from the store without fetching or summarizing again, and new
+    results are saved to it. With an `extractor`, navigation, footers and
+    other boilerplate are dropped before the text is truncated and summarized.
+    Summaries go through `summary_cache` (by default the document store's),
+    so identical text is summarized once per summarizer configuration; with
+    a `budget`, text actually sent to the summarizer is charged against it.
+
+    The default summarizer is the shared micro-batching one, so concurrent
+    ingests reach the backend as a few batched calls.
+    """
 
     def __init__(
         self,
         *,
         fetcher: HTTPSourceFetcher | None = None,
-        summarizer: SimpleSummarizer | None = None,
+        summarizer: Summarizer | None = None,
         max_chars: int | None = None,
+        documents: DocumentStore | None = None,
+        extractor: MainContentExtractor | None = None,
+        summary_cache: SummaryCache | None = None,
+        budget: SummaryBudget | None = None,
     ) -> None:
-        self.fetcher = fetcher or HTTPSourceFetcher()
-        self.summarizer = summarizer or SimpleSummarizer()
+        self.fetcher = fetcher or get_source_fetcher()
+        summarizer = summarizer or get_summarizer()
+        if budget is not None:
+            summarizer = BudgetedSummarizer(summarizer, budget)
+        self.summarizer = summarizer
+        self.budget = budget
         self.max_chars = max_chars
+        self.documents = documents
+        self.extractor = extractor
+        if summary_cache is None and documents is not None:
+            summary_cache = documents.summaries
+        self.summary_cache = summary_cache
 
     async def ingest(self, url: str) -> IngestedSource:
+        if self.documents is not None:
+            doc = await self.documents.get_by_url(url)
+            if doc is not None:
+                if self.summary_cache is not None:
+                    # Goes through the cache like a fresh fetch would: a hit while
+                    # the summarizer is unchanged, recomputed from the stored text
+                    # (no refetch) once its fingerprint changes.
+                    texts = await self.documents.load_texts([doc.id])
+                    summary = await self.summary_cache.summarize(
+                        self.summarizer,
+                        url=url,
+                        title=doc.title,
+                        text=self._summarizer_input(texts.get(doc.id, "")),
+                    )
+                    doc.summary = summary.summary
+                    doc.key_points = list(summary.key_points)
+                else:
+                    summary = Summary(
+                        url=url, title=doc.title, summary=doc.summary, key_points=list(doc.key_points)
+                    )
+                return IngestedSource(
+                    url=url,
+                    title=doc.title,
+                    snippet=_snippet(summary),
+                    summary=summary,
+                    document_id=doc.id,
+                )
+
         fetched = await self.fetcher.fetch(url)
-        text = fetched.text
-        if self.max_chars is not None and self.max_chars > 0 and len(text) > self.max_chars:
-            text = text[: self.max_chars]
-        summary = self.summarizer.summarize(
-            url=fetched.url, title=fetched.title, text=text
-        )
-        snippet = None
-        if summary.summary:
-            snippet = summary.summary[:240]
+        extracted = fetched.text
+        if self.extractor is not None and fetched.blocks:
+            extracted = self.extractor.extract(fetched.blocks, fallback=fetched.text)
+        # Only the summarizer's input is capped; the store keeps the full text.
+        text = self._summarizer_input(extracted)
+        if self.summary_cache is not None:
+            summary = await self.summary_cache.summarize(
+                self.summarizer,
+                url=fetched.url,
+                title=fetched.title,
+                text=text,
+            )
+        else:
+            [summary] = await self.summarizer.summarize_many([(fetched.url, fetched.title, text)])
+        document_id = None
+        if self.documents is not None:
+            # From here on, ingest_many lets the task finish rather than
+            # cancelling it inside the store's transaction.
+            task = asyncio.current_task()
+            _persisting.add(task)
+            try:
+                document_id = (await self.documents.save(url, fetched, summary, text=extracted)).id
+            finally:
+                _persisting.discard(task)
         return IngestedSource(
-            url=fetched.url, title=fetched.title, snippet=snippet, summary=summary
+            url=fetched.url,
+            title=fetched.title,
+            snippet=_snippet(summary),
+            summary=summary,
+            document_id=document_id,
         )
+
+    def _summarizer_input(self, text: str) -> str:
+        if self.max_chars is not None and self.max_chars > 0:
+            return text[: self.max_chars]
+        return text
+
+
+def _snippet(summary: Summary) -> str | None:
+    if summary.summary:
+        return summary.summary[:240]
+    return None
+
+
+async def ingest_many(
+    pipeline: IngestPipeline,
+    urls: list[str],
+    *,
+    max_sources: int | None = None,
+    max_failures: int | None = None,
+) -> list[tuple[int, IngestedSource]]:
+    """Ingest URLs concurrently, started round-robin across hosts.
+
+    Admission (per-host and global limits) is enforced by the fetcher's
+    scheduler; this only decides start order and how many run at once. With
+    `max_sources`, at most as many ingests are in flight as sources are
+    still needed, and another URL is started only when one fails, so no more
+    fetches or summarizer budget are spent than the sequential loop would.
+    It stops once `max_failures` failed or the pipeline's summarization
+    budget ran out; ingests still fetching are cancelled, while those
+    already saving their document are awaited.
+
+    Returns `(index into urls, result)` pairs in input order.
+    """
+
+    if not urls:
+        return []
+    positions: dict[str, list[int]] = {}
+    for i, url in enumerate(urls):
+        positions.setdefault(url, []).append(i)
+    queue = deque(interleave_by_host(urls))
+
+    tasks: dict[asyncio.Task, int] = {}
+    pending: set[asyncio.Task] = set()
+    ingested: list[tuple[int, IngestedSource]] = []
+    failures = 0
+
+    def collect(task: asyncio.Task) -> bool:
+        """Record a finished task; False if it failed for lack of budget."""
+
+        nonlocal failures
+        if task.cancelled():
+            return True
+        exc = task.exception()
+        if exc is None:
+            ingested.append((tasks[task], task.result()))
+            return True
+        failures += 1
+        return not isinstance(exc, BudgetExceededError)
+
+    try:
+        while True:
+            needed = None if max_sources is None else max_sources - len(ingested)
+            while queue and (needed is None or len(pending) < needed):
+                url = queue.popleft()
+                task = asyncio.ensure_future(pipeline.ingest(url))
+                tasks[task] = positions[url].pop(0)
+                pending.add(task)
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            in_budget = all([collect(task) for task in done])
+            if not in_budget or (max_failures is not None and failures >= max_failures):
+                break
+    finally:
+        for task in pending:
+            if task not in _persisting:
+                task.cancel()
+        # Let cancellations land, and saves in progress commit their work.
+        if pending:
+            await asyncio.wait(pending)
+            for task in pending:
+                collect(task)
+
+    ingested.sort(key=lambda item: item[0])
+    return ingested
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import re
+import zlib
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.models import Source
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+# Mersenne prime 2**61 - 1 would overflow uint64 products; this prime is just
+# above 2**32, so (a < 2**31) * (x < 2**32) + b stays below 2**64.
+_PRIME = np.uint64(4_294_967_311)
+
+
+@dataclass(frozen=True)
+class KeyPoint:
+    """A key point and every source that states it."""
+
+    text: str
+    source_ids: tuple[int, ...]
+
+
+class MinHashDeduplicator:
+    """Merge near-duplicate sentences across sources with MinHash + LSH.
+
+    Each sentence is reduced to word shingles, hashed into a `num_perm`
+    MinHash signature, and bucketed by `bands` signature slices; only
+    sentences sharing a bucket are compared, so the cost stays close to
+    linear in the number of sentences. Candidates whose estimated Jaccard
+    similarity reaches `threshold` are merged: the first occurrence's text is
+    kept and the source ids are combined in order of first appearance.
+    Texts without any word are never merged.
+    """
+
+    def __init__(
+        self,
+        *,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        threshold: float = 0.6,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**31, size=num_perm, dtype=np.uint64)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        tokens = _TOKEN_RE.findall(text.lower())
+        k = self.shingle_size
+        grams = (
+            {" ".join(tokens[i : i + k]) for i in range(len(tokens) - k + 1)}
+            if len(tokens) >= k
+            else {" ".join(tokens)}
+        )
+        return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64)
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """MinHash signatures, one row of `num_perm` values per text."""
+
+        sigs = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        for i, text in enumerate(texts):
+            hashes = self._shingles(text)
+            sigs[i] = ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+        return sigs
+
+    def dedupe(self, items: Iterable[tuple[str, int | None]]) -> list[KeyPoint]:
+        """Merge `(text, source_id)` pairs; output keeps first-appearance order."""
+
+        texts: list[str] = []
+        sources: list[int | None] = []
+        for text, source_id in items:
+            text = " ".join(text.split())
+            if text:
+                texts.append(text)
+                sources.append(source_id)
+        if not texts:
+            return []
+
+        sigs = self.signatures(texts)
+        parent = list(range(len(texts)))
+        # Texts without a single word (e.g. "—", "***") all hash the same
+        # empty shingle; they are kept as they are, never merged.
+        has_words = [_TOKEN_RE.search(text) is not None for text in texts]
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        rows = self.num_perm // self.bands
+        for band in range(self.bands):
+            buckets: dict[bytes, int] = {}
+            for i, key in enumerate(sigs[:, band * rows : (band + 1) * rows]):
+                if not has_words[i]:
+                    continue
+                first = buckets.setdefault(key.tobytes(), i)
+                if first == i:
+                    continue
+                a, b = find(first), find(i)
+                if a == b:
+                    continue
+                if float(np.mean(sigs[first] == sigs[i])) >= self.threshold:
+                    # Keep the earliest sentence as the representative.
+                    parent[max(a, b)] = min(a, b)
+
+        groups: dict[int, list[int]] = {}
+        for i in range(len(texts)):
+            groups.setdefault(find(i), []).append(i)
+        merged: list[KeyPoint] = []
+        for root, members in groups.items():
+            ids: list[int] = []
+            for i in members:
+                sid = sources[i]
+                if sid is not None and sid not in ids:
+                    ids.append(sid)
+            merged.append(KeyPoint(text=texts[root], source_ids=tuple(ids)))
+        return merged
+
+
+def _point_text(point: str) -> str:
+    """Key points are stored as bullets ("- ..."); strip the marker."""
+
+    point = point.strip()
+    return point[2:].strip() if point.startswith("- ") else point
+
+
+def session_key_points(
+    sources: Sequence[Source],
+    points_by_document: dict[int, list],
+    *,
+    deduplicator: MinHashDeduplicator | None = None,
+) -> list[KeyPoint]:
+    """Key points of `sources`, deduplicated, given each stored document's key points.
+
+    A source re-summarized for its session uses its own key points instead.
+    """
+
+    items = [
+        (_point_text(point), src.id)
+        for src in sources
+        if src.document_id is not None
+        for point in (
+            src.key_points if src.key_points is not None else points_by_document.get(src.document_id)
+        )
+        or []
+    ]
+    return (deduplicator or MinHashDeduplicator()).dedupe(items)
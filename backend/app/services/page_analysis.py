@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from html import unescape
+
+# Tags that start a new line of text. Everything else is treated as inline.
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl",
+        "dt", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+        "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+        "section", "table", "td", "th", "tr", "ul",
+    }
+)
+
+# One alternation per thing we skip. Each match is consumed in a single
+# left-to-right scan, so the whole conversion is linear in the page size.
+_MARKUP_RE = re.compile(
+    r"<!--.*?(?:-->|\Z)"  # comments (an unclosed one swallows the rest)
+    r"|<(script|style)\b[^>]*>.*?(?:</\1\s*>|\Z)"  # raw-text elements
+    r"|<(/?)([a-zA-Z][a-zA-Z0-9-]*)\b[^>]*(?:>|\Z)"  # start/end tags
+    r"|<[!?/][^>]*(?:>|\Z)",  # doctype, processing instructions, stray </...>
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Containers tracked for block context. Other tags don't affect nesting.
+_CONTAINER_TAGS = frozenset(
+    {
+        "article", "aside", "div", "footer", "form", "header", "main", "nav",
+        "ol", "section", "table", "ul",
+    }
+)
+# Containers that are boilerplate by tag alone.
+_BOILERPLATE_TAGS = frozenset({"aside", "footer", "form", "nav"})
+# class/id/role tokens that mark navigation, banners and other page chrome.
+_BOILERPLATE_HINTS = frozenset(
+    {
+        "ad", "ads", "advert", "advertisement", "banner", "breadcrumb", "breadcrumbs",
+        "comment", "comments", "consent", "cookie", "cookies", "footer", "menu", "modal",
+        "nav", "navbar", "navigation", "newsletter", "popup", "promo", "related", "share",
+        "sharing", "sidebar", "social", "sponsored", "subscribe", "widget",
+    }
+)
+_ATTR_RE = re.compile(
+    r"""\b(?:class|id|role)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE
+)
+_HINT_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+# Phrases typical of bot-detection / block pages. Matched against visible
+# text only, so inline scripts that load e.g. a Cloudflare beacon don't count.
+_BLOCK_INDICATORS = (
+    "captcha",
+    "cloudflare",
+    "attention required",
+    "verify you are human",
+    "unusual traffic",
+    "access denied",
+    "temporary blocked",
+)
+# Real articles may mention these phrases; only short pages are treated as
+# block pages on body text alone. A matching <title> always counts.
+_BLOCK_PAGE_MAX_TEXT_CHARS = 2_000
+
+
+@dataclass(frozen=True)
+class PageStats:
+    """Cheap quality signals gathered during analysis."""
+
+    html_chars: int
+    text_chars: int
+    link_text_chars: int
+
+    @property
+    def text_ratio(self) -> float:
+        """Visible text characters per character of HTML."""
+
+        return self.text_chars / self.html_chars if self.html_chars else 0.0
+
+    @property
+    def link_density(self) -> float:
+        """Share of visible text that sits inside links."""
+
+        return self.link_text_chars / self.text_chars if self.text_chars else 0.0
+
+
+@dataclass(frozen=True)
+class TextBlock:
+    """One line of visible text with the signals main-content extraction uses."""
+
+    text: str
+    link_chars: int = 0
+    heading: bool = False
+    boilerplate: bool = False
+
+    @property
+    def link_density(self) -> float:
+        return min(1.0, self.link_chars / len(self.text)) if self.text else 0.0
+
+
+@dataclass(frozen=True)
+class PageAnalysis:
+    """Everything the fetcher needs from a page, computed in one pass."""
+
+    title: str | None
+    text: str
+    block_signals: tuple[str, ...]
+    stats: PageStats
+    blocks: tuple[TextBlock, ...] = ()
+    # True when scanning stopped at `max_text_chars`; stats cover the scanned part.
+    truncated: bool = False
+
+    @property
+    def blocked(self) -> bool:
+        return bool(self.block_signals)
+
+
+def analyze_page(html: str, *, max_text_chars: int | None = None) -> PageAnalysis:
+    """Extract title, normalized visible text, block signals and stats.
+
+    Single scan over the markup: text between tags is appended to the current
+    line, block-level tags end the line, and each finished line is
+    whitespace-collapsed immediately (blank runs collapse to one blank line).
+    Each finished line is also recorded as a `TextBlock` with its link text,
+    whether it is a heading and whether it sits in boilerplate (nav, footer,
+    cookie banner, sidebar, ...).
+
+    With `max_text_chars`, the scan stops at the first tag after that much
+    text has been collected, so the rest of a large page is never visited.
+    """
+
+    lines: list[str] = []
+    blocks: list[TextBlock] = []
+    line: list[str] = []
+    blank = False
+    title_parts: list[str] | None = None
+    title: str | None = None
+    anchor_depth = 0
+    heading_depth = 0
+    # Open containers as (tag, is_boilerplate); boilerplate_depth counts the latter.
+    containers: list[tuple[str, bool]] = []
+    boilerplate_depth = 0
+    text_chars = 0
+    link_chars = 0
+    line_link_chars = 0
+    kept_chars = 0
+    open_line_chars = 0  # raw length of the line being built
+    limit = max_text_chars if max_text_chars is not None else -1
+
+    def end_line() -> None:
+        nonlocal blank, line_link_chars, kept_chars, open_line_chars
+        collapsed = " ".join("".join(line).split())
+        line.clear()
+        open_line_chars = 0
+        if collapsed:
+            lines.append(collapsed)
+            kept_chars += len(collapsed) + 1
+            blocks.append(
+                TextBlock(
+                    text=collapsed,
+                    link_chars=min(line_link_chars, len(collapsed)),
+                    heading=heading_depth > 0,
+                    boilerplate=boilerplate_depth > 0,
+                )
+            )
+            blank = False
+        elif not blank:
+            lines.append("")
+            blank = True
+        line_link_chars = 0
+
+    def add_text(chunk: str) -> None:
+        nonlocal text_chars, link_chars, line_link_chars, open_line_chars
+        if "&" in chunk:
+            chunk = unescape(chunk)
+        if title_parts is not None:
+            title_parts.append(chunk)
+            return
+        text_chars += len(chunk)
+        open_line_chars += len(chunk)
+        if anchor_depth:
+            link_chars += len(chunk)
+            line_link_chars += len(chunk.strip())
+        if "\n" in chunk or "\r" in chunk:
+            for part in chunk.splitlines(keepends=True):
+                content = part.rstrip("\r\n")
+                line.append(content)
+                if len(content) != len(part):
+                    end_line()
+        else:
+            line.append(chunk)
+
+    pos = 0
+    truncated = False
+    for match in _MARKUP_RE.finditer(html):
+        start = match.start()
+        if start > pos:
+            add_text(html[pos:start])
+        pos = match.end()
+
+        tag = match.group(3)
+        if tag is None:
+            continue
+        tag = tag.lower()
+        closing = bool(match.group(2))
+        if 0 <= limit <= kept_chars + open_line_chars and title_parts is None:
+            truncated = True
+            break
+        if tag == "title":
+            if not closing and title is None and title_parts is None:
+                title_parts = []
+            elif closing and title_parts is not None:
+                title = " ".join("".join(title_parts).split()) or None
+                title_parts = None
+        elif tag == "a":
+            anchor_depth = max(0, anchor_depth - 1) if closing else anchor_depth + 1
+        elif tag in _BLOCK_TAGS:
+            end_line()
+            if tag in _CONTAINER_TAGS:
+                if not closing:
+                    boiler = tag in _BOILERPLATE_TAGS or _has_boilerplate_hint(match.group(0))
+                    containers.append((tag, boiler))
+                    boilerplate_depth += boiler
+                elif any(open_tag == tag for open_tag, _ in containers):
+                    # Pop up to the matching open tag; tolerates unclosed children.
+                    while containers:
+                        open_tag, boiler = containers.pop()
+                        boilerplate_depth -= boiler
+                        if open_tag == tag:
+                            break
+            elif len(tag) == 2 and tag[0] == "h" and tag[1] in "123456":
+                heading_depth = max(0, heading_depth - 1) if closing else heading_depth + 1
+    if not truncated and pos < len(html):
+        add_text(html[pos:])
+        pos = len(html)
+    end_line()
+
+    text = "\n".join(lines).strip()
+    return PageAnalysis(
+        title=title,
+        text=text,
+        block_signals=_block_signals(title, text),
+        stats=PageStats(html_chars=pos, text_chars=text_chars, link_text_chars=link_chars),
+        blocks=tuple(blocks),
+        truncated=truncated,
+    )
+
+
+def _has_boilerplate_hint(tag_markup: str) -> bool:
+    for match in _ATTR_RE.finditer(tag_markup):
+        value = next(v for v in match.groups() if v is not None)
+        if not _BOILERPLATE_HINTS.isdisjoint(_HINT_SPLIT_RE.split(value.lower())):
+            return True
+    return False
+
+
+def _block_signals(title: str | None, text: str) -> tuple[str, ...]:
+    title_lower = (title or "").lower()
+    signals = [ind for ind in _BLOCK_INDICATORS if ind in title_lower]
+    if len(text) <= _BLOCK_PAGE_MAX_TEXT_CHARS:
+        text_lower = text.lower()
+        signals += [ind for ind in _BLOCK_INDICATORS if ind in text_lower and ind not in signals]
+    return tuple(signals)
+
+
+def html_to_text(html: str) -> str:
+    """Convert HTML to text by scanning from tag to tag.
+
+    Drops script/style bodies and comments, turns block-level tags into
+    newlines and decodes all entities (named and numeric). Whitespace is kept
+    as-is; use `analyze_page` for normalized text.
+    """
+
+    out: list[str] = []
+    pos = 0
+    for match in _MARKUP_RE.finditer(html):
+        start = match.start()
+        if start > pos:
+            out.append(html[pos:start])
+        pos = match.end()
+        tag = match.group(3)
+        if tag is not None and tag.lower() in _BLOCK_TAGS:
+            out.append("\n")
+    out.append(html[pos:])
+    return unescape("".join(out))
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Source
+from app.services.document_store import DocumentStore
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+# Term ids: a word is its vocabulary id (< 2**31); a word pair is
+# (first + 1) << 31 | second, so both fit one sorted int64 key space.
+_PAIR_SHIFT = 31
+
+
+@dataclass(frozen=True)
+class SourceMatch:
+    source_id: int
+    # Share of the claim's (IDF-weighted) words and word pairs found in the source.
+    score: float
+
+
+class ProvenanceIndex:
+    """Inverted index over a session's source texts for matching claims.
+
+    Every source's text is reduced to the set of words and adjacent word
+    pairs it contains; postings (term -> sources) are stored as sorted
+    arrays. A claim is scored against all sources at once by walking only
+    the postings of its own terms, so building is linear in the total text
+    size and a match costs O(claim terms + postings hit), not O(sources).
+    Claims are best matched together (`match_many`).
+
+    Terms are weighted by BM25-style inverse document frequency, so words
+    every source uses (articles, the topic itself) count for little without a
+    stopword list. Claim terms no source contains still count towards the
+    total, lowering every score.
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[tuple[int, str]],
+        *,
+        min_score: float = 0.35,
+        max_sources: int = 5,
+    ) -> None:
+        self.min_score = min_score
+        self.max_sources = max_sources
+        self._source_ids: list[int] = []
+
+        tokens: list[str] = []
+        lengths: list[int] = []
+        for source_id, text in documents:
+            doc_tokens = _TOKEN_RE.findall(text.lower())
+            tokens.extend(doc_tokens)
+            lengths.append(len(doc_tokens))
+            self._source_ids.append(source_id)
+
+        # Everything below is a few vectorized passes over all sources at once.
+        self._vocab = {token: i for i, token in enumerate(dict.fromkeys(tokens))}
+        ids = np.fromiter(map(self._vocab.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        owners = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+        same_doc = owners[:-1] == owners[1:]
+        terms = np.concatenate([ids, ((ids[:-1][same_doc] + 1) << _PAIR_SHIFT) | ids[1:][same_doc]])
+        term_owners = np.concatenate([owners, owners[:-1][same_doc]])
+
+        # Sort by term (owners stay ascending within a term) and drop repeats
+        # of a term within one source.
+        order = np.argsort(terms, kind="stable")
+        terms, term_owners = terms[order], term_owners[order]
+        first = np.ones(len(terms), dtype=bool)
+        first[1:] = (terms[1:] != terms[:-1]) | (term_owners[1:] != term_owners[:-1])
+        terms, self._postings = terms[first], term_owners[first]
+        self._terms, self._starts, self._df = np.unique(terms, return_index=True, return_counts=True)
+
+    def __len__(self) -> int:
+        return len(self._source_ids)
+
+    def _claim_terms(self, text: str) -> np.ndarray:
+        tokens = _TOKEN_RE.findall(text.lower())
+        # Unknown words get ids no source has (one per distinct word), so they
+        # still count as terms.
+        lookup = {
+            token: self._vocab.get(token, (1 << _PAIR_SHIFT) - 1 - i)
+            for i, token in enumerate(dict.fromkeys(tokens))
+        }
+        # Claims are short: plain sets beat numpy's per-call overhead here.
+        ids = [lookup[token] for token in tokens]
+        terms = set(ids)
+        terms.update(((a + 1) << _PAIR_SHIFT) | b for a, b in zip(ids, ids[1:]))
+        return np.fromiter(terms, dtype=np.int64, count=len(terms))
+
+    def _idf(self, df: np.ndarray) -> np.ndarray:
+        n = len(self._source_ids)
+        # A term no source has weighs as much as the rarest present one.
+        df = np.maximum(df, 1)
+        return np.log1p((n - df + 0.5) / (df + 0.5))
+
+    def scores_many(self, claims: Sequence[str]) -> np.ndarray:
+        """Match scores of each claim against every source (claims x sources).
+
+        All claims are scored in one vectorized pass over their postings.
+        """
+
+        n = len(self._source_ids)
+        out = np.zeros((len(claims), n), dtype=np.float64)
+        if not claims or not len(self._terms):
+            return out
+
+        claim_terms = [self._claim_terms(claim) for claim in claims]
+        terms = np.concatenate(claim_terms)
+        term_claims = np.repeat(np.arange(len(claims)), [len(t) for t in claim_terms])
+
+        pos = np.minimum(np.searchsorted(self._terms, terms), len(self._terms) - 1)
+        found = self._terms[pos] == terms
+        df = np.where(found, self._df[pos], 0)
+        weights = self._idf(df)
+        totals = np.bincount(term_claims, weights=weights, minlength=len(claims))
+
+        starts, counts = self._starts[pos[found]], df[found]
+        if len(starts):
+            # Gather every posting of every claim term at once.
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            cells = np.repeat(term_claims[found], counts) * n + self._postings[offsets]
+            out = np.bincount(
+                cells, weights=np.repeat(weights[found], counts), minlength=len(claims) * n
+            ).reshape(len(claims), n)
+        np.divide(out, totals[:, None], out=out, where=totals[:, None] > 0)
+        return np.minimum(out, 1.0)
+
+    def scores(self, claim: str) -> np.ndarray:
+        """Match score of `claim` against every source, in index order."""
+
+        return self.scores_many([claim])[0]
+
+    def match_many(
+        self, claims: Sequence[str], *, include: Sequence[Sequence[int]] | None = None
+    ) -> list[list[SourceMatch]]:
+        """Sources supporting each claim, best first.
+
+        Sources scoring below `min_score` are dropped and at most
+        `max_sources` are kept, except that `include[i]` (sources known to
+        state claim i, e.g. the ones a key point came from) are always kept
+        and scored 1.0.
+        """
+
+        include = include or [()] * len(claims)
+        results = []
+        for scores, stated_ids in zip(self.scores_many(claims), include):
+            stated = set(stated_ids)
+            best: dict[int, float] = {}
+            rank: dict[int, int] = {}
+            for idx in np.flatnonzero(scores >= self.min_score):
+                sid = self._source_ids[idx]
+                best[sid] = max(best.get(sid, 0.0), round(float(scores[idx]), 3))
+                rank.setdefault(sid, idx)
+            for sid in stated_ids:
+                best[sid] = 1.0
+                rank.setdefault(sid, len(self._source_ids))
+
+            ranked = sorted(best, key=lambda sid: (-best[sid], sid not in stated, rank[sid]))
+            limit = max(self.max_sources, len(stated))
+            results.append([SourceMatch(source_id=sid, score=best[sid]) for sid in ranked[:limit]])
+        return results
+
+    def match(self, claim: str, *, include: Sequence[int] = ()) -> list[SourceMatch]:
+        return self.match_many([claim], include=[include])[0]
+
+
+def source_evidence(sources: Sequence[Source], document_hashes: dict[int, str]) -> list[list]:
+    """What provenance depends on, per source (for the layout hash).
+
+    The stored document is identified by its content hash, so the texts
+    themselves need not be loaded to tell whether anything changed.
+    """
+
+    return [
+        [s.id, s.title, s.snippet or "", document_hashes.get(s.document_id) if s.document_id else None]
+        for s in sources
+    ]
+
+
+def source_documents(sources: Sequence[Source], texts: dict[int, str]) -> list[tuple[int, str]]:
+    """(source id, text to match claims against) per source: title, snippet and stored text."""
+
+    return [
+        (s.id, "\n".join(filter(None, (s.title, s.snippet, texts.get(s.document_id)))))
+        for s in sources
+    ]
+
+
+async def build_provenance_index(db: AsyncSession, sources: Sequence[Source]) -> ProvenanceIndex:
+    """Index each source's title, snippet and stored document text."""
+
+    texts = await DocumentStore(db).load_texts(
+        [s.document_id for s in sources if s.document_id is not None]
+    )
+    return ProvenanceIndex(source_documents(sources, texts))
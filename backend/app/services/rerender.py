@@ -0,0 +1,298 @@
+"""Re-render every stored infographic, e.g. after a renderer change.
+
+    python -m app.services.rerender [--batch-size 200] [--workers N]
+                                    [--checkpoint PATH] [--restart]
+
+Sessions with an infographic are read in keyset-paginated batches (by id).
+For each batch, sessions whose layout hash still matches (and whose file is
+still there) are skipped; the others are rendered in a process pool, their
+SVGs written, and their Infographic rows updated with one bulk UPDATE and
+one commit. After every batch the last session id and the ids of sessions
+whose render failed go to the checkpoint file, so an interrupted run
+resumes where it stopped and retries the failures first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models import Infographic, ResearchSession
+from app.services.document_store import DocumentStore
+from app.services.infographic import TEMPLATE_VERSION, InfographicRenderer, RenderedInfographic
+from app.services.infographic_store import (
+    RenderInputs,
+    infographic_path,
+    is_up_to_date,
+    load_render_inputs,
+)
+from app.services.key_points import KeyPoint
+from app.services.provenance import ProvenanceIndex, source_documents
+from app.services.storage import LocalMediaStorage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    """One session's render, as sent to a worker process."""
+
+    session_id: int
+    prompt: str
+    sources: list[dict[str, Any]]
+    key_points: list[KeyPoint]
+    evidence: list
+    # (source id, text) pairs claims are matched against.
+    documents: list[tuple[int, str]]
+
+
+def render_job(job: RenderJob) -> RenderedInfographic:
+    """Render one session; runs in a worker process."""
+
+    return InfographicRenderer().render_session_infographic(
+        prompt=job.prompt,
+        sources=job.sources,
+        key_points=job.key_points,
+        provenance=ProvenanceIndex(job.documents),
+        evidence=job.evidence,
+    )
+
+
+@dataclass
+class RerenderReport:
+    scanned: int = 0
+    rendered: int = 0
+    skipped: int = 0
+    failed_session_ids: list[int] = field(default_factory=list)
+    batches: int = 0
+    last_session_id: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def sessions_per_s(self) -> float:
+        return self.scanned / self.elapsed_s if self.elapsed_s else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.scanned} sessions in {self.elapsed_s:.1f}s ({self.sessions_per_s:.1f}/s): "
+            f"{self.rendered} rendered, {self.skipped} up to date, "
+            f"{len(self.failed_session_ids)} failed; last session id {self.last_session_id}"
+        )
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    last_session_id: int = 0
+    # Sessions before `last_session_id` whose render failed; retried on resume.
+    failed_session_ids: tuple[int, ...] = ()
+
+
+def read_checkpoint(path: Path) -> Checkpoint:
+    """Progress of an earlier run, or an empty checkpoint if there is no usable one.
+
+    A checkpoint written for another template version is ignored: the
+    layout hashes make rescanning finished sessions cheap anyway.
+    """
+
+    try:
+        data = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return Checkpoint()
+    if data.get("template_version") != TEMPLATE_VERSION:
+        return Checkpoint()
+    return Checkpoint(
+        last_session_id=int(data.get("last_session_id", 0)),
+        failed_session_ids=tuple(int(i) for i in data.get("failed_session_ids", ())),
+    )
+
+
+def write_checkpoint(path: Path, checkpoint: Checkpoint) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(
+        json.dumps(
+            {
+                "last_session_id": checkpoint.last_session_id,
+                "failed_session_ids": list(checkpoint.failed_session_ids),
+                "template_version": TEMPLATE_VERSION,
+            }
+        )
+    )
+    os.replace(tmp, path)
+
+
+def _sessions_query():
+    return (
+        select(ResearchSession)
+        .join(Infographic, Infographic.session_id == ResearchSession.id)
+        .order_by(ResearchSession.id)
+        .options(selectinload(ResearchSession.sources), selectinload(ResearchSession.infographic))
+    )
+
+
+async def rerender_infographics(
+    db: AsyncSession,
+    *,
+    storage: LocalMediaStorage,
+    executor: Executor,
+    batch_size: int = 200,
+    resume: Checkpoint = Checkpoint(),
+    checkpoint: Path | None = None,
+    on_batch: Callable[[RerenderReport], None] | None = None,
+) -> RerenderReport:
+    """Re-render stored infographics of sessions after `resume.last_session_id`.
+
+    Sessions listed in `resume.failed_session_ids` are retried first. Renders
+    run on `executor` (a process pool for real runs). A session whose render
+    fails is reported and left as it was; it stays in the checkpoint's failed
+    ids until a later run renders it. `on_batch` is called with the running
+    report after each committed batch.
+    """
+
+    if batch_size <= 0:
+        raise ValueError("batch_size must be > 0")
+    report = RerenderReport(last_session_id=resume.last_session_id)
+    retry = sorted(resume.failed_session_ids)
+    loop = asyncio.get_running_loop()
+    started = perf_counter()
+
+    while True:
+        retrying = bool(retry)
+        if retrying:
+            ids, retry = retry[:batch_size], retry[batch_size:]
+            query = _sessions_query().where(ResearchSession.id.in_(ids))
+        else:
+            query = (
+                _sessions_query()
+                .where(ResearchSession.id > report.last_session_id)
+                .limit(batch_size)
+            )
+        sessions = list((await db.execute(query)).scalars().all())
+        if not sessions:
+            if retrying:
+                continue  # those sessions are gone; go on with the rest
+            break
+
+        inputs = await load_render_inputs(db, sessions)
+        stale = [s for s in sessions if not is_up_to_date(s, inputs[s.id].digest, storage)]
+        texts = await DocumentStore(db).load_texts(
+            [src.document_id for s in stale for src in s.sources if src.document_id is not None]
+        )
+        jobs = [_job(s, inputs[s.id], source_documents(s.sources, texts)) for s in stale]
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, render_job, job) for job in jobs),
+            return_exceptions=True,
+        )
+
+        updates = []
+        for session, result in zip(stale, results):
+            if isinstance(result, BaseException):
+                logger.warning("Re-rendering session %s failed: %r", session.id, result)
+                report.failed_session_ids.append(session.id)
+                continue
+            stored = storage.save_bytes(rel_path=infographic_path(session.id), content=result.svg_bytes)
+            updates.append(
+                {"id": session.infographic.id, "image_url": stored.url, "layout_meta": result.layout_meta}
+            )
+        if updates:
+            await db.execute(update(Infographic), updates)
+        await db.commit()
+        # Keep memory flat across batches.
+        db.expunge_all()
+
+        report.batches += 1
+        report.scanned += len(sessions)
+        report.rendered += len(updates)
+        report.skipped += len(sessions) - len(stale)
+        report.last_session_id = max(report.last_session_id, sessions[-1].id)
+        report.elapsed_s = perf_counter() - started
+        if checkpoint is not None:
+            # Failures not retried yet stay recorded alongside new ones.
+            failed = sorted({*retry, *report.failed_session_ids})
+            write_checkpoint(checkpoint, Checkpoint(report.last_session_id, tuple(failed)))
+        if on_batch is not None:
+            on_batch(report)
+
+    report.elapsed_s = perf_counter() - started
+    return report
+
+
+def _job(session: ResearchSession, inputs: RenderInputs, documents: list[tuple[int, str]]) -> RenderJob:
+    return RenderJob(
+        session_id=session.id,
+        prompt=session.prompt,
+        sources=inputs.sources,
+        key_points=inputs.key_points,
+        evidence=inputs.evidence,
+        documents=documents,
+    )
+
+
+async def _run(args: argparse.Namespace) -> RerenderReport:
+    from app.core.config import settings
+    from app.db.session import AsyncSessionLocal, engine
+
+    checkpoint = Path(args.checkpoint)
+    resume = Checkpoint() if args.restart else read_checkpoint(checkpoint)
+    if resume.last_session_id:
+        print(
+            f"Resuming after session {resume.last_session_id}, retrying "
+            f"{len(resume.failed_session_ids)} failed ({checkpoint})"
+        )
+
+    storage = LocalMediaStorage(settings.media_root, settings.media_base_url)
+    # spawn: workers must not inherit the event loop or DB connections.
+    with ProcessPoolExecutor(
+        max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        async with AsyncSessionLocal() as db:
+            report = await rerender_infographics(
+                db,
+                storage=storage,
+                executor=executor,
+                batch_size=args.batch_size,
+                resume=resume,
+                checkpoint=checkpoint,
+                on_batch=lambda r: print(f"batch {r.batches}: {r.summary()}"),
+            )
+    await engine.dispose()
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-render every stored infographic.")
+    parser.add_argument("--batch-size", type=int, default=200, help="sessions per batch")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="render processes"
+    )
+    parser.add_argument(
+        "--checkpoint", default="rerender-checkpoint.json", help="resume file (last session id)"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="ignore the checkpoint and start from the first session"
+    )
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_run(args))
+    print(f"done: {report.summary()}")
+    if report.failed_session_ids:
+        print(f"failed sessions: {report.failed_session_ids}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
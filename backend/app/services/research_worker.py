@@ -7,11 +7,13 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.models import Infographic, Message, ResearchSession, Source
-from app.services.infographic import InfographicRenderer
-from app.services.ingest import IngestPipeline
-from app.services.storage import LocalMediaStorage
-from app.services.web_search import DuckDuckGoHTMLSearchClient
+from app.models import Message, ResearchSession, Source
+from app.services.content_extraction import MainContentExtractor
+from app.services.document_store import DocumentStore
+from app.services.infographic_store import render_and_store_infographic
+from app.services.ingest import IngestPipeline, ingest_many
+from app.services.search_providers import get_search_provider
+from app.services.summary_batching import SummaryBudget
 
 
 async def run_research_and_render(*, session_id: int, db: AsyncSession) -> dict:
@@ -35,32 +37,46 @@ async def run_research_and_render(*, session_id: int, db: AsyncSession) -> dict:
 
     # 1) Web search
     t_search0 = perf_counter()
-    search_client = DuckDuckGoHTMLSearchClient()
+    search_client = get_search_provider()
     hits = await search_client.search(query)
     t_search_ms = int((perf_counter() - t_search0) * 1000)
 
     # 2) Ingest a few sources (guardrails to avoid runaway cost/latency)
     t_ingest0 = perf_counter()
-    pipeline = IngestPipeline(max_chars=settings.ingest_max_source_chars_for_summarization)
+    pipeline = IngestPipeline(
+        max_chars=settings.ingest_max_source_chars_for_summarization,
+        documents=DocumentStore(db, max_age_seconds=settings.document_max_age_seconds),
+        extractor=MainContentExtractor() if settings.ingest_extract_main_content else None,
+        budget=SummaryBudget(
+            max_chars=settings.ingest_max_summary_chars_per_session,
+            max_tokens=settings.ingest_max_summary_tokens_per_session,
+        ),
+    )
+    # Sources are fetched concurrently (interleaved across hosts); per-host and
+    # global limits are enforced by the shared fetcher's scheduler.
+    candidates = hits[: settings.search_max_results]
+    results = await ingest_many(
+        pipeline,
+        [h.url for h in candidates],
+        max_sources=settings.ingest_max_sources_per_session,
+        max_failures=settings.ingest_max_failures_per_session,
+    )
     ingested = []
-    failures = 0
-    for h in hits[: settings.search_max_results]:
-        if len(ingested) >= settings.ingest_max_sources_per_session:
-            break
-        if failures >= settings.ingest_max_failures_per_session:
-            break
-        try:
-            ing = await pipeline.ingest(h.url)
-        except Exception:
-            failures += 1
-            continue
-        ingested.append((h, ing))
+    seen_documents: set[int] = set()
+    for i, ing in results:
+        # Mirrors of the same article collapse into one document; cite it once.
+        if ing.document_id is not None:
+            if ing.document_id in seen_documents:
+                continue
+            seen_documents.add(ing.document_id)
+        ingested.append((candidates[i], ing))
 
     # 3) Persist sources + assistant message
     for h, ing in ingested:
         db.add(
             Source(
                 session_id=session.id,
+                document_id=ing.document_id,
                 title=ing.title or h.title,
                 url=ing.url,
                 snippet=ing.snippet or h.snippet,
@@ -84,40 +100,8 @@ async def run_research_and_render(*, session_id: int, db: AsyncSession) -> dict:
     # 4) Render infographic based on persisted sources
     await db.refresh(session, attribute_names=["sources", "infographic"])
 
-    sources_meta = [
-        {
-            "source_id": s.id,
-            "title": s.title,
-            "url": s.url,
-            "confidence": s.confidence,
-        }
-        for s in session.sources
-    ]
-
-    t_render0 = perf_counter()
-    renderer = InfographicRenderer()
-    rendered = renderer.render_session_infographic(prompt=session.prompt, sources=sources_meta)
-    t_render_ms = int((perf_counter() - t_render0) * 1000)
-
-    storage = LocalMediaStorage(settings.media_root, settings.media_base_url)
-    t_store0 = perf_counter()
-    stored = storage.save_bytes(
-        rel_path=f"sessions/{session.id}/infographic.svg",
-        content=rendered.svg_bytes,
-    )
-    t_store_ms = int((perf_counter() - t_store0) * 1000)
-
-    if session.infographic:
-        session.infographic.image_url = stored.url
-        session.infographic.layout_meta = rendered.layout_meta
-    else:
-        db.add(
-            Infographic(
-                session_id=session.id,
-                image_url=stored.url,
-                layout_meta=rendered.layout_meta,
-            )
-        )
+    # Skips rendering and storage when the layout hash is unchanged.
+    stored = await render_and_store_infographic(db, session)
 
     session.status = "completed"
     await db.commit()
@@ -128,12 +112,13 @@ async def run_research_and_render(*, session_id: int, db: AsyncSession) -> dict:
         "session_id": session.id,
         "status": session.status,
         "sources_created": len(ingested),
-        "infographic_url": stored.url,
+        "infographic_url": stored.image_url,
+        "infographic_unchanged": stored.unchanged,
         "timing_ms": {
             "total": t_total_ms,
             "search": t_search_ms,
             "ingest": t_ingest_ms,
-            "render": t_render_ms,
-            "store": t_store_ms,
+            "render": stored.render_ms,
+            "store": stored.store_ms,
         },
     }
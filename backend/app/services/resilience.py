@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value: str | None, *, now: float | None = None) -> float | None:
+    """Parse a `Retry-After` header (delta-seconds or HTTP-date) into seconds."""
+
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now_dt = datetime.fromtimestamp(now if now is not None else time.time(), tz=timezone.utc)
+    return max(0.0, (when - now_dt).total_seconds())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Jittered exponential backoff for transient failures.
+
+    Attempt `n` (0-based) waits a random time in `[0, min(max_delay, base * 2**n)]`
+    ("full jitter"), so clients retrying the same host spread out. A server
+    `Retry-After` replaces the computed delay; if it asks for longer than
+    `max_delay_seconds` we give up instead of parking a worker that long.
+    """
+
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 8.0
+
+    def delay_for(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Seconds to wait before retrying after failed `attempt`, or None to give up."""
+
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay_seconds else None
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * (2**attempt))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Classic closed / open / half-open breaker.
+
+    - closed: requests flow; `failure_threshold` consecutive failures open it.
+    - open: requests are rejected until `reset_timeout_seconds` have passed.
+    - half_open: one probe request is let through; success closes the
+      breaker, failure opens it again.
+    """
+
+    def __init__(self, *, failure_threshold: int = 5, reset_timeout_seconds: float = 30.0) -> None:
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold must be > 0")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        # A probe that never reports back (e.g. cancelled) expires after the
+        # reset timeout so the breaker can't get stuck half-open.
+        self._probe_started: float | None = None
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        now = time.monotonic()
+        if self.state == "open":
+            if now - (self.opened_at or 0.0) < self.reset_timeout_seconds:
+                return False
+            self.state = "half_open"
+            self._probe_started = None
+        if (
+            self._probe_started is not None
+            and now - self._probe_started < self.reset_timeout_seconds
+        ):
+            return False
+        self._probe_started = now
+        return True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._probe_started = None
+
+
+@dataclass
+class ResilienceMetrics:
+    attempts: int = 0
+    retries: int = 0
+    transient_errors: int = 0
+    circuit_rejections: int = 0
+    errors_by_host: Counter[str] = field(default_factory=Counter)
+
+
+class HostCircuitBreakers:
+    """Per-host breakers plus counters for the metrics endpoint.
+
+    Keeps at most `max_hosts` breakers; the least recently used closed one is
+    dropped first.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        max_hosts: int = 1024,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._max_hosts = max_hosts
+        self._breakers: OrderedDict[str, CircuitBreaker] = OrderedDict()
+        self.metrics = ResilienceMetrics()
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self._failure_threshold,
+                reset_timeout_seconds=self._reset_timeout_seconds,
+            )
+            self._breakers[host] = breaker
+            if len(self._breakers) > self._max_hosts:
+                for name, old in list(self._breakers.items()):
+                    if old.state == "closed" and name != host:
+                        del self._breakers[name]
+                        break
+        else:
+            self._breakers.move_to_end(host)
+        return breaker
+
+    def snapshot(self) -> dict:
+        m = self.metrics
+        return {
+            "attempts": m.attempts,
+            "retries": m.retries,
+            "transient_errors": m.transient_errors,
+            "circuit_rejections": m.circuit_rejections,
+            "errors_by_host": dict(m.errors_by_host.most_common(50)),
+            # Healthy hosts are omitted to keep the payload small.
+            "breakers": {
+                host: {"state": b.state, "consecutive_failures": b.consecutive_failures}
+                for host, b in self._breakers.items()
+                if b.state != "closed" or b.consecutive_failures
+            },
+        }
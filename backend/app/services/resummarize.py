@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Source
+from app.services.document_store import DocumentStore
+from app.services.summarizer import Summarizer
+from app.services.summary_batching import get_summarizer
+
+
+async def resummarize_session(
+    db: AsyncSession,
+    session_id: int,
+    *,
+    summarizer: Summarizer | None = None,
+    max_chars: int | None = None,
+) -> dict:
+    """Rebuild summaries and snippets for a session from stored document text.
+
+    Runs entirely offline: no page is fetched again. Results are stored on
+    the session's own `Source` rows; the shared `Document` (which other
+    sessions may cite) is left as it is. Sources without a stored document
+    (added manually, or ingested before the document store existed) are
+    counted as `missing_text` and left unchanged. The caller commits.
+    """
+
+    summarizer = summarizer or get_summarizer()
+    res = await db.execute(select(Source).where(Source.session_id == session_id))
+    sources = list(res.scalars().all())
+
+    document_ids = [s.document_id for s in sources if s.document_id is not None]
+    texts = await DocumentStore(db).load_texts(document_ids)
+
+    pending: list[Source] = []
+    batch: list[tuple[str, str | None, str]] = []
+    for src in sources:
+        text = texts.get(src.document_id) if src.document_id is not None else None
+        if text is None:
+            continue
+        if max_chars is not None and max_chars > 0 and len(text) > max_chars:
+            text = text[:max_chars]
+        pending.append(src)
+        batch.append((src.url, src.title, text))
+
+    summaries = await summarizer.summarize_many(batch)
+    resummarized = 0
+    for src, summary in zip(pending, summaries):
+        src.summary = summary.summary
+        src.key_points = list(summary.key_points)
+        src.snippet = summary.summary[:240] or None
+        resummarized += 1
+
+    return {"resummarized": resummarized, "missing_text": len(sources) - len(pending)}
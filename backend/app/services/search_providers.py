@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol, runtime_checkable
+
+from app.services.web_search import SearchError, SearchResult, get_search_client, normalize_query
+
+DEFAULT_CORPUS_PATH = Path(__file__).parent / "data" / "search_corpus.json"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+@runtime_checkable
+class SearchProvider(Protocol):
+    """Anything that can answer a web search query.
+
+    `DuckDuckGoHTMLSearchClient` is the production implementation; the local
+    corpus provider is used for CI and benchmarks without network access.
+    """
+
+    name: str
+
+    async def search(self, query: str, *, max_results: int = 5) -> list[SearchResult]: ...
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(normalize_query(text))
+
+
+class LocalCorpusSearchProvider:
+    """Offline search over a JSON corpus of `{title, url, snippet}` records.
+
+    Scores documents with a small TF-IDF over title + snippet using an inverted
+    index. Results are deterministic: ties keep corpus order.
+    """
+
+    name = "local"
+
+    def __init__(self, documents: list[SearchResult]) -> None:
+        self._documents = documents
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        for doc_id, doc in enumerate(documents):
+            counts = Counter(_tokens(f"{doc.title} {doc.snippet or ''}"))
+            for token, tf in counts.items():
+                self._postings.setdefault(token, []).append((doc_id, tf))
+
+    @classmethod
+    def from_path(cls, path: str | Path | None = None) -> LocalCorpusSearchProvider:
+        raw = json.loads(Path(path or DEFAULT_CORPUS_PATH).read_text(encoding="utf-8"))
+        return cls(
+            [
+                SearchResult(title=d["title"], url=d["url"], snippet=d.get("snippet"))
+                for d in raw
+            ]
+        )
+
+    async def search(self, query: str, *, max_results: int = 5) -> list[SearchResult]:
+        n_docs = len(self._documents)
+        scores: dict[int, float] = {}
+        for token in set(_tokens(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + n_docs / len(postings))
+            for doc_id, tf in postings:
+                scores[doc_id] = scores.get(doc_id, 0.0) + tf * idf
+
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        return [self._documents[doc_id] for doc_id in ranked[:max_results]]
+
+
+@dataclass
+class ProviderStats:
+    """Rolling health information for one provider."""
+
+    calls: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    ewma_latency_ms: float | None = None
+    last_error_at: float | None = None
+
+    def record(self, *, latency_ms: float, ok: bool, alpha: float = 0.3) -> None:
+        self.calls += 1
+        if self.ewma_latency_ms is None:
+            self.ewma_latency_ms = latency_ms
+        else:
+            self.ewma_latency_ms = alpha * latency_ms + (1 - alpha) * self.ewma_latency_ms
+        if ok:
+            self.consecutive_errors = 0
+        else:
+            self.errors += 1
+            self.consecutive_errors += 1
+            self.last_error_at = time.time()
+
+
+class CompositeSearchProvider:
+    """Combine several providers with fallback or racing.
+
+    - "fallback": try providers one at a time, healthiest first (fewest recent
+      consecutive errors, then lowest average latency).
+    - "race": query all healthy providers at once and return the first
+      non-empty answer, cancelling the rest.
+
+    A provider with `unhealthy_after` consecutive errors is skipped for
+    `cooldown_seconds` unless every provider is unhealthy. Empty results move
+    on to the next provider without counting as an error.
+    """
+
+    name = "composite"
+
+    def __init__(
+        self,
+        providers: list[SearchProvider],
+        *,
+        strategy: str = "fallback",
+        unhealthy_after: int = 3,
+        cooldown_seconds: float = 60.0,
+    ) -> None:
+        if not providers:
+            raise ValueError("providers must not be empty")
+        if strategy not in {"fallback", "race"}:
+            raise ValueError("strategy must be 'fallback' or 'race'")
+        self._providers = providers
+        self._strategy = strategy
+        self._unhealthy_after = unhealthy_after
+        self._cooldown_seconds = cooldown_seconds
+        self._stats = {p.name: ProviderStats() for p in providers}
+
+    def stats(self) -> dict[str, dict]:
+        return {name: dict(s.__dict__) for name, s in self._stats.items()}
+
+    def _is_healthy(self, provider: SearchProvider) -> bool:
+        s = self._stats[provider.name]
+        if s.consecutive_errors < self._unhealthy_after:
+            return True
+        return s.last_error_at is not None and (
+            time.time() - s.last_error_at >= self._cooldown_seconds
+        )
+
+    def _ordered(self) -> list[SearchProvider]:
+        healthy = [p for p in self._providers if self._is_healthy(p)]
+        candidates = healthy or list(self._providers)
+
+        def rank(p: SearchProvider) -> tuple[int, float]:
+            s = self._stats[p.name]
+            latency = s.ewma_latency_ms if s.ewma_latency_ms is not None else 0.0
+            return (s.consecutive_errors, latency)
+
+        # sorted() is stable, so configuration order breaks ties.
+        return sorted(candidates, key=rank)
+
+    async def _call(
+        self, provider: SearchProvider, query: str, max_results: int
+    ) -> list[SearchResult]:
+        started = time.perf_counter()
+        try:
+            results = await provider.search(query, max_results=max_results)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._stats[provider.name].record(
+                latency_ms=(time.perf_counter() - started) * 1000, ok=False
+            )
+            raise
+        self._stats[provider.name].record(
+            latency_ms=(time.perf_counter() - started) * 1000, ok=True
+        )
+        return results
+
+    async def search(self, query: str, *, max_results: int = 5) -> list[SearchResult]:
+        providers = self._ordered()
+        if self._strategy == "race":
+            return await self._race(providers, query, max_results)
+        return await self._fallback(providers, query, max_results)
+
+    async def _fallback(
+        self, providers: list[SearchProvider], query: str, max_results: int
+    ) -> list[SearchResult]:
+        last_exc: Exception | None = None
+        answered = False
+        for provider in providers:
+            try:
+                results = await self._call(provider, query, max_results)
+            except Exception as exc:  # noqa: BLE001
+                last_exc = exc
+                continue
+            answered = True
+            if results:
+                return results
+        if answered:
+            return []
+        raise SearchError("All search providers failed") from last_exc
+
+    async def _race(
+        self, providers: list[SearchProvider], query: str, max_results: int
+    ) -> list[SearchResult]:
+        pending = {
+            asyncio.ensure_future(self._call(p, query, max_results)) for p in providers
+        }
+        last_exc: BaseException | None = None
+        answered = False
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exc = task.exception()
+                    if exc is not None:
+                        last_exc = exc
+                        continue
+                    answered = True
+                    if task.result():
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        if answered:
+            return []
+        raise SearchError("All search providers failed") from last_exc
+
+
+def build_search_provider(
+    name: str,
+    *,
+    composite_providers: list[str] | None = None,
+    composite_strategy: str = "fallback",
+    local_corpus_path: str | None = None,
+) -> SearchProvider:
+    """Build a provider by name: "duckduckgo", "local" or "composite"."""
+
+    name = name.strip().lower()
+    if name == "duckduckgo":
+        return get_search_client()
+    if name == "local":
+        return LocalCorpusSearchProvider.from_path(local_corpus_path)
+    if name == "composite":
+        members = [p for p in (composite_providers or []) if p.strip().lower() != "composite"]
+        if not members:
+            raise ValueError("composite search provider needs at least one member")
+        return CompositeSearchProvider(
+            [
+                build_search_provider(p, local_corpus_path=local_corpus_path)
+                for p in members
+            ],
+            strategy=composite_strategy,
+        )
+    raise ValueError(f"Unknown search provider: {name!r}")
+
+
+_shared_provider: SearchProvider | None = None
+
+
+def get_search_provider() -> SearchProvider:
+    """Return the process-wide search provider selected in Settings."""
+
+    global _shared_provider
+    if _shared_provider is None:
+        from app.core.config import settings
+
+        _shared_provider = build_search_provider(
+            settings.search_provider,
+            composite_providers=settings.search_composite_providers.split(","),
+            composite_strategy=settings.search_composite_strategy,
+            local_corpus_path=settings.search_local_corpus_path,
+        )
+    return _shared_provider
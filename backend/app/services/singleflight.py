@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight task.
+
+    The first caller for a key starts the work in a background task; callers
+    that arrive while it is running await the same task instead of starting
+    their own. Results and exceptions are delivered to every waiter.
+
+    Cancellation is per-caller: a cancelled waiter stops waiting but does not
+    cancel the shared work while other callers still need it. When the last
+    waiter goes away the underlying task is cancelled and forgotten, so a
+    later caller for the same key starts a fresh call.
+
+    Note: This is process-local (MVP), like the caches it protects.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+        self._background: set[asyncio.Task] = set()
+        self._abandoned: weakref.WeakSet[asyncio.Task] = weakref.WeakSet()
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            task = self._calls.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fn())
+                self._calls[key] = task
+                self._waiters[key] = 0
+                task.add_done_callback(lambda t, k=key: self._forget(k, t))
+
+            self._waiters[key] += 1
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if task in self._abandoned and not (current and current.cancelling()):
+                    # The shared task was abandoned by the waiters before us, but
+                    # this caller still wants a result: start a fresh call.
+                    continue
+                if task.cancelled():
+                    raise
+                # Only this waiter was cancelled; abandon the shared task if nobody
+                # else is waiting for it. Forget it right away so that a caller
+                # arriving before it finishes cancelling starts its own call.
+                if self._waiters.get(key, 0) <= 1 and not task.done():
+                    self._abandon(key, task)
+                raise
+            finally:
+                if self._calls.get(key) is task:
+                    self._waiters[key] -= 1
+
+    def refresh(self, key: str, fn: Callable[[], Awaitable[Any]]) -> None:
+        """Run `fn` in the background unless a call for `key` is already running.
+
+        Used for stale-while-revalidate: the caller has already answered from a
+        stale entry, so failures here are swallowed.
+        """
+
+        if key in self._calls:
+            return
+        task = asyncio.ensure_future(self.do(key, fn))
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def _abandon(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            self._calls.pop(key, None)
+            self._waiters.pop(key, None)
+        self._abandoned.add(task)
+        task.cancel()
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            self._calls.pop(key, None)
+            self._waiters.pop(key, None)
+        # Mark the exception as retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
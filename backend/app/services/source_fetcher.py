@@ -1,18 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+import codecs
 import hashlib
 import time
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from functools import partial
 
 import httpx
 
-from app.services.web_search import SimpleTTLCache, TokenBucketRateLimiter
+from app.services.fetch_scheduler import FetchScheduler, host_of, load_robots_txt
+from app.services.fetch_store import CachePolicy, PersistentFetchStore, StoredFetch
+from app.services.http_pool import get_http_client
+from app.services.page_analysis import PageStats, TextBlock, analyze_page
+from app.services.resilience import HostCircuitBreakers, RetryPolicy, parse_retry_after
+from app.services.singleflight import SingleFlight
+from app.services.urls import canonicalize_url
+from app.services.web_search import NegativeCache, SimpleTTLCache, TokenBucketRateLimiter
 
 
 class FetchError(RuntimeError):
     """Raised when fetching a source URL fails."""
 
 
+class TransientFetchError(FetchError):
+    """A fetch failure worth retrying: timeout, 429 or 5xx."""
+
+    def __init__(self, message: str, *, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(FetchError):
+    """Raised without a request while the host's circuit breaker is open."""
+
+
 class ContentQualityError(RuntimeError):
     """Raised when fetched content is missing/too low quality for summarization."""
 
@@ -27,6 +49,9 @@ class FetchedSource:
     content_type: str | None = None
     status_code: int | None = None
     fetched_at_epoch: float | None = None
+    stats: PageStats | None = None
+    # Per-line signals for main-content extraction (see content_extraction).
+    blocks: tuple[TextBlock, ...] = ()
 
 
 class HTTPSourceFetcher:
@@ -36,9 +61,21 @@ class HTTPSourceFetcher:
     HTML, extract a title and plain-ish text.
 
     Reliability notes (MVP):
-    - Reject obviously non-HTML responses.
+    - Stream the body; reject non-HTML responses from the headers alone and
+      abort downloads larger than `max_bytes`.
     - Detect likely block pages / CAPTCHAs.
     - Enforce minimum text length.
+    - Serve expired entries during a grace window while revalidating, and
+      remember recent failures (per failure class) via a NegativeCache.
+    - With a `store`, keep extractions on disk with their `ETag` /
+      `Last-Modified`; skip the request while `Cache-Control: max-age` allows
+      it, otherwise revalidate and reuse the stored extraction on 304.
+    - With a `scheduler`, admission is per host (concurrency, rate and
+      robots.txt crawl-delay) under a global cap, replacing the single
+      process-wide token bucket.
+    - With a `retry_policy`, timeouts / 429 / 5xx are retried with jittered
+      backoff (honouring `Retry-After`); `breakers` fail fast for hosts that
+      keep failing.
     """
 
     def __init__(
@@ -47,24 +84,48 @@ class HTTPSourceFetcher:
         http_client: httpx.AsyncClient | None = None,
         cache: SimpleTTLCache | None = None,
         rate_limiter: TokenBucketRateLimiter | None = None,
+        inflight: SingleFlight | None = None,
+        negative_cache: NegativeCache | None = None,
+        store: PersistentFetchStore | None = None,
+        scheduler: FetchScheduler | None = None,
+        retry_policy: RetryPolicy | None = None,
+        breakers: HostCircuitBreakers | None = None,
         cache_ttl_seconds: int = 60 * 60,
         cache_max_items: int = 512,
+        cache_stale_seconds: int = 0,
         rate_per_minute: int = 30,
         min_text_length: int = 400,
         max_text_length: int = 60_000,
+        max_bytes: int = 5_000_000,
     ) -> None:
-        self._http = http_client or httpx.AsyncClient(timeout=20, follow_redirects=True)
+        self._http_client = http_client
         self._cache = cache or SimpleTTLCache(
-            ttl_seconds=cache_ttl_seconds, max_items=cache_max_items
+            ttl_seconds=cache_ttl_seconds,
+            max_items=cache_max_items,
+            stale_ttl_seconds=cache_stale_seconds,
         )
+        self._negative = negative_cache
+        self._store = store
+        self._scheduler = scheduler
+        self._retry = retry_policy or RetryPolicy(max_attempts=1)
+        self._breakers = breakers
         self._rate_limiter = rate_limiter or TokenBucketRateLimiter(
             rate_per_minute=rate_per_minute
         )
+        # Sessions citing the same popular URL at once share one fetch.
+        self._inflight = inflight or SingleFlight()
         self._min_text_length = min_text_length
         self._max_text_length = max_text_length
+        self._max_bytes = max_bytes
+
+    @property
+    def _http(self) -> httpx.AsyncClient:
+        # Resolved per call so a client closed at shutdown is never reused.
+        return self._http_client or get_http_client()
 
     def _cache_key(self, url: str) -> str:
-        return hashlib.sha256(f"fetch:{url}".encode("utf-8")).hexdigest()
+        # Tracking params and fragments don't change the page; share one entry.
+        return hashlib.sha256(f"fetch:{canonicalize_url(url)}".encode("utf-8")).hexdigest()
 
     async def fetch(self, url: str) -> FetchedSource:
         url = url.strip()
@@ -72,143 +133,343 @@ class HTTPSourceFetcher:
             raise FetchError("url is required")
 
         key = self._cache_key(url)
-        cached = self._cache.get(key)
-        if cached is not None:
+        refetch = partial(self._fetch_uncached, url, key=key)
+
+        entry = self._cache.get_stale(key)
+        if entry is not None:
+            cached, is_stale = entry
+            if is_stale and not (self._negative and self._negative.has(key)):
+                self._inflight.refresh(key, refetch)
             return cached
 
-        # When under pressure, wait instead of failing fast; this reduces
-        # user-visible errors when upstream providers temporarily throttle.
-        await self._rate_limiter.acquire()
+        if self._negative is not None:
+            self._negative.check(key)
 
-        started = time.time()
+        return await self._inflight.do(key, refetch)
+
+    async def _fetch_uncached(self, url: str, *, key: str) -> FetchedSource:
         try:
-            resp = await self._http.get(url, headers={"user-agent": "Mozilla/5.0"})
-            resp.raise_for_status()
-        except Exception as exc:  # noqa: BLE001
-            raise FetchError(f"Failed to fetch url: {url}") from exc
+            fetched = await self._download_and_parse(url)
+        except (FetchError, ContentQualityError) as exc:
+            if self._negative is not None:
+                self._negative.record(key, exc)
+            raise
+
+        if self._negative is not None:
+            self._negative.forget(key)
+        self._cache.set(key, fetched)
+        return fetched
 
-        content_type = (resp.headers.get("content-type") or "").lower().strip()
-        if content_type and "text/html" not in content_type and "application/xhtml" not in content_type:
-            raise ContentQualityError(
-                f"Unsupported content-type for url {url}: {content_type}"
+    async def _download_and_parse(self, url: str) -> FetchedSource:
+        store_key = canonicalize_url(url)
+        stored = await self._store.get(store_key) if self._store is not None else None
+        if stored is not None and stored.is_fresh():
+            # Still within max-age: no request, no rate-limit token.
+            return _source_from_payload(url, stored.payload)
+
+        started = time.time()
+        raw = await self._download_with_retries(url, stored=stored)
+        policy = CachePolicy.parse(raw.cache_control)
+        fresh_until = started + (policy.max_age or 0)
+
+        if raw.status_code == 304:
+            if stored is None or self._store is None:
+                raise FetchError(f"Unexpected 304 for unconditional request: {url}")
+            await self._store.touch(store_key, fresh_until=fresh_until)
+            return _source_from_payload(url, stored.payload)
+
+        fetched = self._parse(url, raw, started)
+        if self._store is not None and not policy.store:
+            if stored is not None:
+                # The page may no longer be stored; its old validators and
+                # content must not be reused either.
+                await self._store.delete(store_key)
+        elif self._store is not None:
+            await self._store.put(
+                StoredFetch(
+                    url=store_key,
+                    payload=_source_to_payload(fetched),
+                    etag=raw.etag,
+                    last_modified=raw.last_modified,
+                    fresh_until=fresh_until,
+                    stored_at=started,
+                )
             )
+        return fetched
 
-        html = resp.text
-        if _looks_like_block_page(html):
-            raise ContentQualityError(f"Blocked or bot-detection page for url: {url}")
+    def _parse(self, url: str, raw: _RawResponse, started: float) -> FetchedSource:
+        content_type = raw.content_type
 
-        title = _extract_title(html)
-        text = _html_to_text(html)
-        text = _normalize_whitespace(text)
+        # Title, visible text, block-page signals and quality stats in one pass,
+        # stopping once the text we keep is complete.
+        page = analyze_page(raw.html, max_text_chars=self._max_text_length)
+        if page.blocked:
+            raise ContentQualityError(
+                f"Blocked or bot-detection page for url: {url} "
+                f"(signals: {', '.join(page.block_signals)})"
+            )
+
+        title = page.title
+        text = page.text
+        blocks = page.blocks
         if len(text) > self._max_text_length:
             text = text[: self._max_text_length]
+            blocks = _blocks_within(blocks, self._max_text_length)
         if len(text) < self._min_text_length:
             raise ContentQualityError(
                 f"Insufficient text extracted from url: {url} (len={len(text)})"
             )
 
-        fetched = FetchedSource(
+        return FetchedSource(
             url=url,
             title=title,
             text=text,
             content_type=content_type or None,
-            status_code=resp.status_code,
+            status_code=raw.status_code,
             fetched_at_epoch=started,
+            stats=page.stats,
+            blocks=blocks,
         )
-        self._cache.set(key, fetched)
 
-        return fetched
+    def resilience_metrics(self) -> dict:
+        """Retry / breaker counters for the metrics endpoint."""
+
+        if self._breakers is None:
+            return {}
+        return self._breakers.snapshot()
+
+    async def _download_with_retries(
+        self, url: str, *, stored: StoredFetch | None
+    ) -> _RawResponse:
+        host = host_of(url)
+        breaker = self._breakers.get(host) if self._breakers is not None else None
+        metrics = self._breakers.metrics if self._breakers is not None else None
+        attempt = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                metrics.circuit_rejections += 1
+                raise CircuitOpenError(f"Circuit open for host {host}; not fetching {url}")
+            if metrics is not None:
+                metrics.attempts += 1
+            try:
+                raw = await self._admitted_download(url, stored=stored)
+            except TransientFetchError as exc:
+                if breaker is not None:
+                    breaker.record_failure()
+                    metrics.transient_errors += 1
+                    metrics.errors_by_host[host] += 1
+                # Back off outside the scheduler slot so other hosts can use it.
+                delay = self._retry.delay_for(attempt, exc.retry_after)
+                if delay is None:
+                    raise
+                if metrics is not None:
+                    metrics.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except ContentQualityError:
+                # Raised only after the headers arrived: the host is up, even if
+                # the page is not one we can use.
+                if breaker is not None:
+                    breaker.record_success()
+                raise
+            except FetchError as exc:
+                if metrics is not None:
+                    metrics.errors_by_host[host] += 1
+                if breaker is not None:
+                    # Unreachable hosts count against the breaker; an HTTP 4xx
+                    # means the host answered and is healthy.
+                    if isinstance(exc.__cause__, httpx.TransportError):
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return raw
+
+    async def _admitted_download(
+        self, url: str, *, stored: StoredFetch | None
+    ) -> _RawResponse:
+        if self._scheduler is not None:
+            async with self._scheduler.slot(url):
+                return await self._download(url, stored=stored)
+        # When under pressure, wait instead of failing fast; this reduces
+        # user-visible errors when upstream providers temporarily throttle.
+        await self._rate_limiter.acquire()
+        return await self._download(url, stored=stored)
+
+    async def _download(self, url: str, *, stored: StoredFetch | None = None) -> _RawResponse:
+        """Stream the response body, rejecting bad responses as early as possible.
+
+        Status and content-type are checked from the headers before any of the
+        body is read; the body is decoded incrementally and the download is
+        aborted once it exceeds `max_bytes`. With a `stored` entry the request
+        is conditional, and a 304 comes back without a body.
+        """
+
+        headers = {"user-agent": "Mozilla/5.0"}
+        if stored is not None:
+            if stored.etag:
+                headers["if-none-match"] = stored.etag
+            if stored.last_modified:
+                headers["if-modified-since"] = stored.last_modified
+
+        try:
+            async with self._http.stream(
+                "GET", url, headers=headers, follow_redirects=True
+            ) as resp:
+                validators = {
+                    "etag": resp.headers.get("etag"),
+                    "last_modified": resp.headers.get("last-modified"),
+                    "cache_control": resp.headers.get("cache-control"),
+                }
+                if resp.status_code == 304 and stored is not None:
+                    return _RawResponse(status_code=304, content_type="", html="", **validators)
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    raise TransientFetchError(
+                        f"HTTP {resp.status_code} for url: {url}",
+                        retry_after=parse_retry_after(resp.headers.get("retry-after")),
+                    )
+                resp.raise_for_status()
+
+                content_type = (resp.headers.get("content-type") or "").lower().strip()
+                if (
+                    content_type
+                    and "text/html" not in content_type
+                    and "application/xhtml" not in content_type
+                ):
+                    raise ContentQualityError(
+                        f"Unsupported content-type for url {url}: {content_type}"
+                    )
+
+                declared = resp.headers.get("content-length")
+                if declared and declared.isdigit() and int(declared) > self._max_bytes:
+                    raise ContentQualityError(
+                        f"Response too large for url {url}: {declared} bytes"
+                    )
+
+                decoder = _incremental_decoder(resp.charset_encoding)
+                parts: list[str] = []
+                received = 0
+                async for chunk in resp.aiter_bytes():
+                    received += len(chunk)
+                    if received > self._max_bytes:
+                        raise ContentQualityError(
+                            f"Response too large for url {url}: over {self._max_bytes} bytes"
+                        )
+                    parts.append(decoder.decode(chunk))
+                parts.append(decoder.decode(b"", final=True))
+        except (ContentQualityError, FetchError):
+            raise
+        except httpx.TimeoutException as exc:
+            raise TransientFetchError(f"Timed out fetching url: {url}") from exc
+        except Exception as exc:  # noqa: BLE001
+            raise FetchError(f"Failed to fetch url: {url}") from exc
+
+        return _RawResponse(
+            status_code=resp.status_code,
+            content_type=content_type,
+            html="".join(parts),
+            **validators,
+        )
 
 
-def _extract_title(html: str) -> str | None:
-    lower = html.lower()
-    start = lower.find("<title")
-    if start == -1:
-        return None
-    gt = lower.find(">", start)
-    if gt == -1:
-        return None
-    end = lower.find("</title>", gt)
-    if end == -1:
-        return None
-    title = html[gt + 1 : end]
-    return " ".join(_html_to_text(title).split()) or None
-
-
-def _normalize_whitespace(text: str) -> str:
-    """Normalize whitespace while preserving paragraph breaks."""
-
-    lines = [" ".join(line.split()) for line in text.splitlines()]
-    # Keep non-empty lines; cap consecutive blanks to a single blank line
-    out: list[str] = []
-    blank = False
-    for line in lines:
-        if not line.strip():
-            if not blank:
-                out.append("")
-            blank = True
-            continue
-        blank = False
-        out.append(line)
-    normalized = "\n".join(out).strip()
-    return normalized
-
-
-def _looks_like_block_page(html: str) -> bool:
-    """Heuristically detect bot-detection / block pages."""
-
-    lower = html.lower()
-    indicators = [
-        "captcha",
-        "cloudflare",
-        "attention required",
-        "verify you are human",
-        "unusual traffic",
-        "access denied",
-        "temporary blocked",
-    ]
-    return any(ind in lower for ind in indicators)
-
-
-def _html_to_text(html: str) -> str:
-    """Very small HTML-to-text conversion without external dependencies."""
-
-    lower = html.lower()
-    out: list[str] = []
-    i = 0
-    while i < len(html):
-        if lower.startswith("<script", i):
-            end = lower.find("</script>", i)
-            if end == -1:
-                break
-            i = end + len("</script>")
-            continue
-        if lower.startswith("<style", i):
-            end = lower.find("</style>", i)
-            if end == -1:
-                break
-            i = end + len("</style>")
-            continue
-
-        ch = html[i]
-        if ch == "<":
-            end = html.find(">", i)
-            if end == -1:
-                break
-            tag = lower[i + 1 : end].strip()
-            if tag.startswith("br") or tag.startswith("p") or tag.startswith("/p"):
-                out.append("\n")
-            i = end + 1
-            continue
-
-        out.append(ch)
-        i += 1
-
-    cleaned = "".join(out)
-    return (
-        cleaned.replace("&amp;", "&")
-        .replace("&quot;", '"')
-        .replace("&#39;", "'")
-        .replace("&lt;", "<")
-        .replace("&gt;", ">")
+@dataclass(frozen=True)
+class _RawResponse:
+    status_code: int
+    content_type: str
+    html: str
+    etag: str | None = None
+    last_modified: str | None = None
+    cache_control: str | None = None
+
+
+def _source_to_payload(source: FetchedSource) -> dict:
+    payload = asdict(source)
+    payload.pop("url")
+    return payload
+
+
+def _source_from_payload(url: str, payload: dict) -> FetchedSource:
+    stats = payload.get("stats")
+    return FetchedSource(
+        url=url,
+        title=payload.get("title"),
+        text=payload["text"],
+        content_type=payload.get("content_type"),
+        status_code=payload.get("status_code"),
+        fetched_at_epoch=payload.get("fetched_at_epoch"),
+        stats=PageStats(**stats) if stats else None,
+        blocks=tuple(TextBlock(**b) for b in payload.get("blocks") or ()),
     )
+
+
+def _blocks_within(blocks: tuple[TextBlock, ...], max_chars: int) -> tuple[TextBlock, ...]:
+    total = 0
+    for i, block in enumerate(blocks):
+        total += len(block.text) + 1
+        if total > max_chars:
+            return blocks[:i]
+    return blocks
+
+
+def _incremental_decoder(charset: str | None) -> codecs.IncrementalDecoder:
+    try:
+        factory = codecs.getincrementaldecoder(charset or "utf-8")
+    except LookupError:
+        factory = codecs.getincrementaldecoder("utf-8")
+    return factory(errors="replace")
+
+
+_shared_fetcher: HTTPSourceFetcher | None = None
+
+
+def get_source_fetcher() -> HTTPSourceFetcher:
+    """Return the process-wide fetcher configured from Settings.
+
+    Sharing one instance lets the cache, rate limiter and in-flight
+    de-duplication work across sessions instead of per request.
+    """
+
+    global _shared_fetcher
+    if _shared_fetcher is None:
+        from app.core.config import settings
+
+        _shared_fetcher = HTTPSourceFetcher(
+            negative_cache=NegativeCache(
+                {
+                    FetchError: settings.fetch_negative_ttl_fetch_error_seconds,
+                    ContentQualityError: settings.fetch_negative_ttl_quality_error_seconds,
+                }
+            ),
+            cache_ttl_seconds=settings.fetch_cache_ttl_seconds,
+            cache_max_items=settings.fetch_cache_max_items,
+            cache_stale_seconds=settings.fetch_cache_stale_seconds,
+            rate_per_minute=settings.fetch_rate_per_minute,
+            retry_policy=RetryPolicy(
+                max_attempts=settings.fetch_retry_max_attempts,
+                base_delay_seconds=settings.fetch_retry_base_delay_seconds,
+                max_delay_seconds=settings.fetch_retry_max_delay_seconds,
+            ),
+            breakers=HostCircuitBreakers(
+                failure_threshold=settings.fetch_breaker_failure_threshold,
+                reset_timeout_seconds=settings.fetch_breaker_reset_seconds,
+            ),
+            scheduler=FetchScheduler(
+                max_concurrency=settings.fetch_max_concurrency,
+                per_host_concurrency=settings.fetch_per_host_concurrency,
+                per_host_rate_per_minute=settings.fetch_rate_per_minute,
+                robots_loader=load_robots_txt if settings.fetch_respect_crawl_delay else None,
+                max_crawl_delay_seconds=settings.fetch_max_crawl_delay_seconds,
+            ),
+            max_bytes=settings.fetch_max_bytes,
+            store=(
+                PersistentFetchStore(
+                    settings.fetch_store_path, max_items=settings.fetch_store_max_items
+                )
+                if settings.fetch_store_path
+                else None
+            ),
+        )
+    return _shared_fetcher
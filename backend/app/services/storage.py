@@ -36,6 +36,9 @@ class LocalMediaStorage:
             raise StorageError("rel_path escapes media_root")
         return abs_path
 
+    def url_for(self, rel_path: str) -> str:
+        return f"{self.media_base_url}/{rel_path}"
+
     def save_bytes(self, *, rel_path: str, content: bytes) -> StoredObject:
         if not rel_path or rel_path.startswith("/"):
             raise StorageError("rel_path must be a relative path")
@@ -50,5 +53,4 @@ class LocalMediaStorage:
         tmp_path.write_bytes(content)
         os.replace(tmp_path, abs_path)
 
-        url = f"{self.media_base_url}/{rel_path}"
-        return StoredObject(url=url, path=abs_path)
+        return StoredObject(url=self.url_for(rel_path), path=abs_path)
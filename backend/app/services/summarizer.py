@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import math
+import re
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
+from typing import Protocol
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -11,6 +18,31 @@ class Summary:
     key_points: list[str]
 
 
+# (url, title, text) of one document to summarize.
+SummaryRequest = tuple[str, str | None, str]
+
+
+class Summarizer(Protocol):
+    """What ingest needs from a summarizer backend.
+
+    `name` and `version` identify the output for the summary cache; bump
+    `version` whenever the same input would be summarized differently.
+    Backends summarize a batch per call, so a model-backed one costs one
+    round trip per batch rather than per source.
+    """
+
+    name: str
+    version: int
+
+    async def summarize_many(self, documents: Sequence[SummaryRequest]) -> list[Summary]: ...
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English)."""
+
+    return math.ceil(len(text) / 4)
+
+
 class SimpleSummarizer:
     """Very small deterministic summarizer.
 
@@ -18,18 +50,298 @@ class SimpleSummarizer:
     In later phases this can be swapped for an LLM-based summarizer.
     """
 
+    name = "simple"
+    version = 1
+
     def __init__(self, *, max_chars: int = 800, max_points: int = 5) -> None:
         self.max_chars = max_chars
         self.max_points = max_points
 
     def summarize(self, *, url: str, title: str | None, text: str) -> Summary:
-        cleaned = " ".join(text.split())
-        cleaned = cleaned.strip()
-        if not cleaned:
+        summary = collapsed_prefix(text, self.max_chars)
+        if not summary:
             return Summary(url=url, title=title, summary="", key_points=[])
 
-        summary = cleaned[: self.max_chars]
         # naive bullet extraction
         parts = [p.strip() for p in summary.split(".") if p.strip()]
         key_points = [f"- {p}." for p in parts[: self.max_points]]
         return Summary(url=url, title=title, summary=summary, key_points=key_points)
+
+    async def summarize_many(self, documents: Sequence[SummaryRequest]) -> list[Summary]:
+        return [self.summarize(url=u, title=t, text=x) for u, t, x in documents]
+
+
+# Sentence boundary: terminal punctuation (optionally followed by a closing
+# quote/bracket) and whitespace before an uppercase letter, digit or opening
+# quote. Newlines always end a sentence (text comes from block extraction).
+_SENTENCE_BOUNDARY_RE = re.compile(r"(?<=[.!?])[\"'”’)\]]?\s+(?=[\"'“‘(\[]?[A-Z0-9])|\n+")
+# Tokens ending in "." that don't end a sentence.
+_ABBREVIATIONS = frozenset(
+    {
+        "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "inc", "ltd",
+        "co", "corp", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+        "oct", "nov", "dec", "no", "fig", "approx", "e.g", "i.e", "u.s", "u.k",
+    }
+)
+# Words start with a letter; bare numbers carry little topical signal.
+_WORD_RE = re.compile(r"[^\W\d_][^\W_]*(?:['’][^\W_]+)?")
+_STOPWORDS = frozenset(
+    (
+        "a about above after again against all also am an and any are as at be because "
+        "been before being below between both but by can could did do does doing down "
+        "during each few for from further had has have having he her here hers him his "
+        "how i if in into is it its itself just me more most my no nor not now of off on "
+        "once only or other our ours out over own same she should so some such than that "
+        "the their theirs them then there these they this those through to too under "
+        "until up very was we were what when where which while who whom why will with "
+        "would you your yours"
+    ).split()
+)
+
+
+_NON_SPACE_RE = re.compile(r"\S+")
+
+
+def collapsed_prefix(text: str, max_chars: int) -> str:
+    """`" ".join(text.split())[:max_chars]` without splitting the whole text."""
+
+    words: list[str] = []
+    size = -1
+    for match in _NON_SPACE_RE.finditer(text):
+        words.append(match.group(0))
+        size += len(words[-1]) + 1
+        if size >= max_chars:
+            break
+    return " ".join(words)[:max_chars]
+
+
+def _pieces(text: str) -> Iterator[str]:
+    pos = 0
+    for match in _SENTENCE_BOUNDARY_RE.finditer(text):
+        yield text[pos : match.start()]
+        pos = match.end()
+    yield text[pos:]
+
+
+def iter_sentences(text: str) -> Iterator[str]:
+    """Yield sentences lazily, keeping common abbreviations intact."""
+
+    pending = ""
+    for piece in _pieces(text):
+        piece = " ".join(piece.split())
+        if not piece:
+            continue
+        candidate = f"{pending} {piece}" if pending else piece
+        last_word = candidate.rsplit(" ", 1)[-1].rstrip(".").lower()
+        initial = len(last_word) == 1 and last_word.isalpha()
+        if candidate.endswith(".") and (initial or last_word in _ABBREVIATIONS):
+            pending = candidate
+            continue
+        yield candidate
+        pending = ""
+    if pending:
+        yield pending
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences, keeping common abbreviations intact."""
+
+    return list(iter_sentences(text))
+
+
+def _terms(sentence: str) -> list[str]:
+    return [w for w in _WORD_RE.findall(sentence.lower()) if w not in _STOPWORDS]
+
+
+class TfidfSummarizer:
+    """Deterministic extractive summarizer scored with TF-IDF centrality.
+
+    Per document, sentences are weighted by TF-IDF (IDF over that document's
+    sentences) and scored by cosine similarity to the document centroid,
+    plus similarity to the title. The best sentences that fit in `max_chars`
+    are picked greedily, near-duplicates of an already picked sentence are
+    skipped, and the result is put back in document order.
+
+    Each document gets its own sentence x term matrix, so scoring is a
+    handful of NumPy operations instead of a Python loop per sentence, and
+    memory stays bounded by the largest document. `summarize_many` runs the
+    batch in a worker thread to keep the event loop free.
+    """
+
+    name = "tfidf"
+    version = 1
+
+    def __init__(
+        self,
+        *,
+        max_chars: int = 800,
+        max_points: int = 5,
+        max_sentences: int = 400,
+        title_weight: float = 0.3,
+        redundancy_threshold: float = 0.7,
+    ) -> None:
+        self.max_chars = max_chars
+        self.max_points = max_points
+        self.max_sentences = max_sentences
+        self.title_weight = title_weight
+        self.redundancy_threshold = redundancy_threshold
+
+    def summarize(self, *, url: str, title: str | None, text: str) -> Summary:
+        return self.summarize_batch([(url, title, text)])[0]
+
+    async def summarize_many(self, documents: Sequence[SummaryRequest]) -> list[Summary]:
+        # NumPy work would otherwise block the event loop for the whole batch.
+        return await asyncio.to_thread(self.summarize_batch, documents)
+
+    def summarize_batch(self, documents: Sequence[SummaryRequest]) -> list[Summary]:
+        """Summarize `(url, title, text)` triples, one document at a time."""
+
+        return [self._summarize_one(url, title, text) for url, title, text in documents]
+
+    def _summarize_one(self, url: str, title: str | None, text: str) -> Summary:
+        sentences = split_sentences(text)[: self.max_sentences]
+        vocab: dict[str, int] = {}
+        rows: list[int] = []
+        cols: list[int] = []
+        for row, sentence in enumerate(sentences):
+            for term in _terms(sentence):
+                rows.append(row)
+                cols.append(vocab.setdefault(term, len(vocab)))
+        if not vocab:
+            return self._select(url, title, sentences, np.zeros(len(sentences)), None)
+
+        # Sentences x this document's vocabulary: memory is bounded by the
+        # largest single document, whatever the batch size.
+        n, width = len(sentences), len(vocab)
+        flat = np.asarray(rows, dtype=np.int64) * width + np.asarray(cols, dtype=np.int64)
+        tf = np.bincount(flat, minlength=n * width).astype(np.float32).reshape(n, width)
+
+        # IDF over the document's sentences.
+        df = np.count_nonzero(tf, axis=0).astype(np.float32)
+        idf = np.log((1.0 + n) / (1.0 + df), dtype=np.float32) + 1.0
+        unit = _unit_rows(tf * idf)
+
+        centroid = _unit_rows(unit.sum(axis=0, keepdims=True))[0]
+        scores = unit @ centroid
+
+        title_vec = np.zeros(width, dtype=np.float32)
+        for term in _terms(title or ""):
+            col = vocab.get(term)
+            if col is not None:
+                title_vec[col] = 1.0
+        scores = scores + self.title_weight * (unit @ _unit_rows(title_vec[None, :])[0])
+        return self._select(url, title, sentences, scores, unit)
+
+    def _select(
+        self,
+        url: str,
+        title: str | None,
+        sentences: list[str],
+        scores: np.ndarray,
+        unit: np.ndarray | None,
+    ) -> Summary:
+        if not sentences:
+            return Summary(url=url, title=title, summary="", key_points=[])
+
+        # Highest score first; earlier sentences win ties (stable, deterministic).
+        order = np.lexsort((np.arange(len(sentences)), -np.round(scores, 6)))
+        picked: list[int] = []
+        used = 0
+        for i in order:
+            sentence = sentences[i]
+            cost = len(sentence) + (1 if picked else 0)
+            if used + cost > self.max_chars:
+                continue
+            if unit is not None and picked:
+                if float(np.max(unit[picked] @ unit[i])) >= self.redundancy_threshold:
+                    continue
+            picked.append(int(i))
+            used += cost
+
+        if not picked:
+            # Nothing fits (e.g. one very long "sentence"): cut the best one at a word.
+            best = sentences[int(order[0])]
+            cut = best[: self.max_chars].rsplit(" ", 1)[0] if len(best) > self.max_chars else best
+            return Summary(url=url, title=title, summary=cut, key_points=[f"- {cut}"])
+
+        top_points = sorted(picked[: self.max_points])
+        picked.sort()
+        return Summary(
+            url=url,
+            title=title,
+            summary=" ".join(sentences[i] for i in picked),
+            key_points=[f"- {sentences[i]}" for i in top_points],
+        )
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class StubSummarizer:
+    """Deterministic stand-in for a model-backed summarizer (tests, benchmarks).
+
+    Each `summarize_many` call is one simulated round trip: it sleeps
+    `latency_seconds` plus `per_doc_seconds` per document, then returns the
+    leading sentences that fit in `max_chars`. Calls, documents and
+    estimated input tokens are counted.
+    """
+
+    name = "stub"
+    version = 1
+
+    def __init__(
+        self,
+        *,
+        max_chars: int = 800,
+        max_points: int = 5,
+        latency_seconds: float = 0.0,
+        per_doc_seconds: float = 0.0,
+    ) -> None:
+        self.max_chars = max_chars
+        self.max_points = max_points
+        self.latency_seconds = latency_seconds
+        self.per_doc_seconds = per_doc_seconds
+        self.calls = 0
+        self.documents = 0
+        self.tokens = 0
+
+    async def summarize_many(self, documents: Sequence[SummaryRequest]) -> list[Summary]:
+        self.calls += 1
+        self.documents += len(documents)
+        self.tokens += sum(estimate_tokens(text) for _, _, text in documents)
+        delay = self.latency_seconds + self.per_doc_seconds * len(documents)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return [self._summarize(url, title, text) for url, title, text in documents]
+
+    def _summarize(self, url: str, title: str | None, text: str) -> Summary:
+        picked: list[str] = []
+        used = 0
+        for sentence in iter_sentences(text):
+            if used + len(sentence) + 1 > self.max_chars:
+                break
+            picked.append(sentence)
+            used += len(sentence) + 1
+        if not picked and text.strip():
+            picked = [collapsed_prefix(text, self.max_chars)]
+        return Summary(
+            url=url,
+            title=title,
+            summary=" ".join(picked),
+            key_points=[f"- {p}" for p in picked[: self.max_points]],
+        )
+
+
+def build_summarizer(name: str) -> Summarizer:
+    """Build a summarizer backend by name: "tfidf" (default), "simple" or "stub"."""
+
+    name = name.strip().lower()
+    if name == "tfidf":
+        return TfidfSummarizer()
+    if name == "simple":
+        return SimpleSummarizer()
+    if name == "stub":
+        return StubSummarizer()
+    raise ValueError(f"Unknown summarizer: {name!r}")
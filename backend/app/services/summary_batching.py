@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+
+from app.services.summarizer import (
+    Summarizer,
+    Summary,
+    SummaryRequest,
+    build_summarizer,
+    estimate_tokens,
+)
+from app.services.web_search import BudgetExceededError
+
+
+class MicroBatchingSummarizer:
+    """Coalesce concurrent `summarize_many` calls into backend batches.
+
+    Documents from every caller (e.g. concurrent ingests across sessions) are
+    queued; a batch goes to the backend once `max_batch_size` documents are
+    waiting or `max_wait_ms` after the first one arrived, whichever comes
+    first. A backend failure is delivered to every document in that batch.
+
+    Output is the backend's, so `name`/`version` are the backend's too.
+    """
+
+    def __init__(
+        self, backend: Summarizer, *, max_batch_size: int = 16, max_wait_ms: float = 20.0
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be > 0")
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self._pending: list[tuple[SummaryRequest, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._running: set[asyncio.Task] = set()
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    @property
+    def version(self) -> int:
+        return self.backend.version
+
+    async def summarize_many(self, documents: Sequence[SummaryRequest]) -> list[Summary]:
+        if not documents:
+            return []
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Shared across event loops (e.g. tests); nothing queued on a
+            # previous loop can complete any more.
+            self._pending, self._timer, self._loop = [], None, loop
+
+        futures = []
+        for doc in documents:
+            future = loop.create_future()
+            self._pending.append((doc, future))
+            futures.append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch_size):
+            batch = [(d, f) for d, f in pending[start : start + self.max_batch_size] if not f.done()]
+            if batch:
+                task = asyncio.ensure_future(self._run(batch))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[tuple[SummaryRequest, asyncio.Future]]) -> None:
+        self.batches += 1
+        try:
+            results = await self.backend.summarize_many([doc for doc, _ in batch])
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class SummaryBudget:
+    """Per-session cap on what is sent to the summarizer.
+
+    Part of the job cost guardrails: characters and (estimated) tokens are
+    charged before a batch is summarized; a batch that would go over either
+    limit raises `BudgetExceededError` and is not charged.
+    """
+
+    def __init__(self, *, max_chars: int | None = None, max_tokens: int | None = None) -> None:
+        self.max_chars = max_chars
+        self.max_tokens = max_tokens
+        self.used_chars = 0
+        self.used_tokens = 0
+
+    def charge(self, texts: Sequence[str]) -> None:
+        chars = sum(len(t) for t in texts)
+        tokens = sum(estimate_tokens(t) for t in texts)
+        if self.max_chars is not None and self.used_chars + chars > self.max_chars:
+            raise BudgetExceededError(
+                f"Summarization budget exceeded: {self.used_chars + chars} > {self.max_chars} chars"
+            )
+        if self.max_tokens is not None and self.used_tokens + tokens > self.max_tokens:
+            raise BudgetExceededError(
+                f"Summarization budget exceeded: {self.used_tokens + tokens} > {self.max_tokens} tokens"
+            )
+        self.used_chars += chars
+        self.used_tokens += tokens
+
+
+class BudgetedSummarizer:
+    """Charge a `SummaryBudget` for every batch before passing it on.
+
+    Put it behind the summary cache so cache hits cost nothing.
+    """
+
+    def __init__(self, backend: Summarizer, budget: SummaryBudget) -> None:
+        self.backend = backend
+        self.budget = budget
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    @property
+    def version(self) -> int:
+        return self.backend.version
+
+    async def summarize_many(self, documents: Sequence[SummaryRequest]) -> list[Summary]:
+        self.budget.charge([text for _, _, text in documents])
+        return await self.backend.summarize_many(documents)
+
+
+_shared_summarizer: MicroBatchingSummarizer | None = None
+
+
+def get_summarizer() -> MicroBatchingSummarizer:
+    """Process-wide summarizer from Settings, micro-batched across jobs."""
+
+    global _shared_summarizer
+    if _shared_summarizer is None:
+        from app.core.config import settings
+
+        _shared_summarizer = MicroBatchingSummarizer(
+            build_summarizer(settings.summarizer),
+            max_batch_size=settings.summarizer_batch_max_size,
+            max_wait_ms=settings.summarizer_batch_max_wait_ms,
+        )
+    return _shared_summarizer
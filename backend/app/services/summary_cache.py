@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import json
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import SummaryCacheEntry
+from app.services.singleflight import SingleFlight
+from app.services.summarizer import Summarizer, Summary
+
+
+def summarizer_fingerprint(summarizer: Summarizer) -> str:
+    """Name, version and parameters of a summarizer, as a stable string.
+
+    Parameters are the constructor arguments (across the class hierarchy),
+    read back from the attributes of the same name, so two summarizers
+    configured differently (e.g. another `max_chars`) never share entries.
+    Wrappers that don't change the output (micro-batching, budgets) expose
+    the wrapped summarizer as `backend` and fingerprint as it.
+    """
+
+    while getattr(summarizer, "backend", None) is not None:
+        summarizer = summarizer.backend
+
+    names = {
+        p.name
+        for cls in type(summarizer).__mro__
+        if "__init__" in vars(cls) and cls is not object
+        for p in inspect.signature(cls.__init__).parameters.values()
+        if p.name != "self" and p.kind in (p.KEYWORD_ONLY, p.POSITIONAL_OR_KEYWORD)
+    }
+    params = {name: getattr(summarizer, name) for name in sorted(names) if hasattr(summarizer, name)}
+    return f"{summarizer.name}:v{summarizer.version}:{json.dumps(params, sort_keys=True)}"
+
+
+class SummaryCache:
+    """Persisted summaries keyed by (sha256 of the exact text, summarizer fingerprint).
+
+    Shared by every session: a text is summarized at most once per summarizer
+    configuration, whichever URL it came from. The key covers the text byte
+    for byte (not `content_hash`, which ignores whitespace): summarizers split
+    sentences on line breaks, so texts differing only in those may summarize
+    differently. Changing a summarizer's
+    version or parameters changes the fingerprint, so stale rows are never
+    matched again. Concurrent misses for the same key are coalesced.
+
+    `lock` serializes use of the AsyncSession; pass the lock of any other
+    store sharing the same session (see `DocumentStore.summaries`).
+    """
+
+    def __init__(self, db: AsyncSession, *, lock: asyncio.Lock | None = None) -> None:
+        self._db = db
+        self._lock = lock or asyncio.Lock()
+        self._inflight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    async def summarize(
+        self,
+        summarizer: Summarizer,
+        *,
+        url: str,
+        title: str | None,
+        text: str,
+    ) -> Summary:
+        """Return the cached summary of `text`, computing and storing it on a miss."""
+
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        fingerprint = summarizer_fingerprint(summarizer)
+        key = hashlib.sha256(f"{text_hash}\n{fingerprint}".encode("utf-8")).hexdigest()
+
+        async def load_or_compute() -> tuple[str, list[str]]:
+            async with self._lock:
+                res = await self._db.execute(
+                    select(SummaryCacheEntry).where(SummaryCacheEntry.cache_key == key)
+                )
+                entry = res.scalar_one_or_none()
+            if entry is not None:
+                self.hits += 1
+                return entry.summary, list(entry.key_points)
+
+            self.misses += 1
+            [computed] = await summarizer.summarize_many([(url, title, text)])
+            async with self._lock:
+                try:
+                    async with self._db.begin_nested():
+                        self._db.add(
+                            SummaryCacheEntry(
+                                cache_key=key,
+                                content_hash=text_hash,
+                                fingerprint=fingerprint[:500],
+                                summary=computed.summary,
+                                key_points=list(computed.key_points),
+                            )
+                        )
+                except IntegrityError:
+                    pass  # Stored concurrently by another process.
+            return computed.summary, list(computed.key_points)
+
+        summary, key_points = await self._inflight.do(key, load_or_compute)
+        # The cached text may have come from another URL; report this one.
+        return Summary(url=url, title=title, summary=summary, key_points=list(key_points))
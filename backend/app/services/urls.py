@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from urllib.parse import parse_qsl, unquote_plus, urlsplit, urlunsplit
+
+# Query parameters that only carry click/campaign tracking and never change
+# the page content. Dropping them lets the same destination share cache keys.
+_TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "gclsrc",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+        "ref_src",
+        "spm",
+    }
+)
+_TRACKING_PREFIXES = ("utm_",)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_REDIRECT_HOSTS = frozenset({"duckduckgo.com", "html.duckduckgo.com", "lite.duckduckgo.com"})
+
+
+def unwrap_search_redirect(href: str) -> str:
+    """Return the destination of a DuckDuckGo `/l/?uddg=...` redirect link.
+
+    Other URLs are returned unchanged. Protocol-relative links (`//host/...`)
+    are resolved to https.
+    """
+
+    href = href.strip()
+    if href.startswith("//"):
+        href = "https:" + href
+
+    parts = urlsplit(href)
+    host = (parts.hostname or "").lower()
+    is_redirect = parts.path.startswith("/l/") and (not host or host in _REDIRECT_HOSTS)
+    if not is_redirect:
+        return href
+
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        if name == "uddg" and value:
+            # parse_qsl has already percent-decoded the target.
+            return value.strip()
+    return href
+
+
+def _is_tracking_param(name: str) -> bool:
+    lowered = name.lower()
+    return lowered in _TRACKING_PARAMS or lowered.startswith(_TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """Canonicalize a URL for cache keys and de-duplication.
+
+    - lowercases scheme and host, drops default ports and userinfo
+    - drops the fragment and known tracking query parameters
+    - sorts the remaining query parameters
+    - uses "/" for an empty path
+
+    The result is also the URL that gets fetched, so query parameters are
+    sorted as raw `k=v` pieces and never re-encoded (`%20` stays `%20`, a
+    bare `?flag` stays `flag`), and IPv6 hosts keep their brackets.
+    """
+
+    url = url.strip()
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS:
+        return url
+
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, _DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+
+    query = "&".join(
+        sorted(
+            piece
+            for piece in parts.query.split("&")
+            if piece and not _is_tracking_param(unquote_plus(piece.partition("=")[0]))
+        )
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
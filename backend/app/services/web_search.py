@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import hashlib
+import re
 import time
+import unicodedata
 from dataclasses import dataclass
+from functools import partial
+from html import unescape
 from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
 
+from app.services.http_pool import get_http_client
+from app.services.singleflight import SingleFlight
+from app.services.urls import canonicalize_url, unwrap_search_redirect
+
 
 class RateLimitError(RuntimeError):
     """Raised when an upstream call is blocked by rate limiting."""
@@ -16,6 +25,10 @@ class BudgetExceededError(RuntimeError):
     """Raised when a per-session (or per-request) budget is exceeded."""
 
 
+class SearchError(RuntimeError):
+    """Raised when the upstream search provider fails."""
+
+
 @dataclass(frozen=True)
 class SearchResult:
     """A single web search result."""
@@ -25,41 +38,132 @@ class SearchResult:
     snippet: str | None = None
 
 
+@dataclass(frozen=True)
+class _CachedSearch:
+    """Cached result list plus how many results were requested upstream."""
+
+    results: tuple[SearchResult, ...]
+    requested: int
+
+    def covers(self, max_results: int) -> bool:
+        # A list of N results answers any request for <= N. A short list also
+        # answers larger requests when upstream had nothing more to return.
+        return len(self.results) >= max_results or len(self.results) < self.requested
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query for cache keying.
+
+    Applies Unicode NFKC normalization, case folding and whitespace collapsing
+    so "Solar Panels" and "solar  panels " share a cache entry.
+    """
+
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+
 class SimpleTTLCache:
     """In-memory TTL cache.
 
     This is intentionally small and process-local; it satisfies the MVP caching
     requirement and can later be replaced with Redis or a DB-backed cache.
 
+    With `stale_ttl_seconds` > 0, expired entries are kept for a grace window so
+    callers can serve them via `get_stale()` while refreshing in the background.
+
     Note: This cache is *not* a strict LRU. When full, it evicts an arbitrary key.
     """
 
-    def __init__(self, ttl_seconds: int = 3600, max_items: int = 512) -> None:
+    def __init__(
+        self, ttl_seconds: int = 3600, max_items: int = 512, stale_ttl_seconds: int = 0
+    ) -> None:
         if ttl_seconds <= 0:
             raise ValueError("ttl_seconds must be > 0")
         if max_items <= 0:
             raise ValueError("max_items must be > 0")
+        if stale_ttl_seconds < 0:
+            raise ValueError("stale_ttl_seconds must be >= 0")
 
         self.ttl_seconds = ttl_seconds
         self.max_items = max_items
+        self.stale_ttl_seconds = stale_ttl_seconds
         self._items: dict[str, tuple[float, Any]] = {}
 
     def get(self, key: str) -> Any | None:
+        entry = self.get_stale(key)
+        if entry is None:
+            return None
+        value, is_stale = entry
+        return None if is_stale else value
+
+    def get_stale(self, key: str) -> tuple[Any, bool] | None:
+        """Return `(value, is_stale)` for entries within the grace window."""
+
         item = self._items.get(key)
         if not item:
             return None
         expires_at, value = item
-        if time.time() >= expires_at:
+        now = time.time()
+        if now < expires_at:
+            return value, False
+        if now >= expires_at + self.stale_ttl_seconds:
             self._items.pop(key, None)
             return None
-        return value
+        return value, True
 
-    def set(self, key: str, value: Any) -> None:
-        if len(self._items) >= self.max_items:
+    def set(self, key: str, value: Any, *, ttl_seconds: float | None = None) -> None:
+        if key not in self._items and len(self._items) >= self.max_items:
             # Drop an arbitrary item (simple policy for MVP)
             oldest_key = next(iter(self._items.keys()))
             self._items.pop(oldest_key, None)
-        self._items[key] = (time.time() + self.ttl_seconds, value)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._items[key] = (time.time() + ttl, value)
+
+    def pop(self, key: str) -> None:
+        self._items.pop(key, None)
+
+
+class NegativeCache:
+    """Short-lived cache of failures, with a separate TTL per exception class.
+
+    Known-bad inputs (e.g. a URL that serves a PDF or a CAPTCHA) fail the same
+    way on every attempt; remembering the failure briefly saves rate-limit
+    tokens. Exceptions whose class (or base class) has no TTL are not cached.
+    """
+
+    def __init__(
+        self, ttl_by_error: dict[type[BaseException], int], *, max_items: int = 512
+    ) -> None:
+        self._ttls = {cls: ttl for cls, ttl in ttl_by_error.items() if ttl > 0}
+        self._cache = SimpleTTLCache(
+            ttl_seconds=max(self._ttls.values(), default=1), max_items=max_items
+        )
+
+    def ttl_for(self, exc: BaseException) -> int | None:
+        for cls in type(exc).__mro__:
+            if cls in self._ttls:
+                return self._ttls[cls]
+        return None
+
+    def record(self, key: str, exc: BaseException) -> None:
+        ttl = self.ttl_for(exc)
+        if ttl is not None:
+            # Keep only type and arguments: a stored instance would collect the
+            # traceback (and context) of every caller it is raised to.
+            self._cache.set(key, (type(exc), exc.args), ttl_seconds=ttl)
+
+    def check(self, key: str) -> None:
+        """Raise a new exception like the cached failure for `key`, if any."""
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            cls, args = cached
+            raise cls(*args)
+
+    def has(self, key: str) -> bool:
+        return self._cache.get(key) is not None
+
+    def forget(self, key: str) -> None:
+        self._cache.pop(key)
 
 
 class TokenBucketRateLimiter:
@@ -132,99 +236,189 @@ class DuckDuckGoHTMLSearchClient:
     For production, swap to a paid search API.
     """
 
+    name = "duckduckgo"
+
     def __init__(
         self,
         *,
         http_client: httpx.AsyncClient | None = None,
         cache: SimpleTTLCache | None = None,
         rate_limiter: TokenBucketRateLimiter | None = None,
+        inflight: SingleFlight | None = None,
+        negative_cache: NegativeCache | None = None,
         cache_ttl_seconds: int = 60 * 60,
         cache_max_items: int = 512,
+        cache_stale_seconds: int = 0,
         rate_per_minute: int = 20,
     ) -> None:
-        self._http = http_client or httpx.AsyncClient(timeout=20)
+        self._http_client = http_client
         self._cache = cache or SimpleTTLCache(
-            ttl_seconds=cache_ttl_seconds, max_items=cache_max_items
+            ttl_seconds=cache_ttl_seconds,
+            max_items=cache_max_items,
+            stale_ttl_seconds=cache_stale_seconds,
         )
+        self._negative = negative_cache
         self._rate_limiter = rate_limiter or TokenBucketRateLimiter(
             rate_per_minute=rate_per_minute
         )
-
-    def _cache_key(self, query: str, max_results: int) -> str:
-        raw = f"ddg:{query}:{max_results}".encode("utf-8")
+        # Concurrent identical searches share one upstream request (and one
+        # rate-limit token) instead of each missing the cache independently.
+        self._inflight = inflight or SingleFlight()
+
+    @property
+    def _http(self) -> httpx.AsyncClient:
+        # Resolved per call so a client closed at shutdown is never reused.
+        return self._http_client or get_http_client()
+
+    def _cache_key(self, normalized_query: str) -> str:
+        # max_results is deliberately not part of the key: larger cached result
+        # lists are reused for smaller requests (see _CachedSearch.covers).
+        raw = f"ddg:{normalized_query}".encode("utf-8")
         return hashlib.sha256(raw).hexdigest()
 
     async def search(self, query: str, *, max_results: int = 5) -> list[SearchResult]:
-        if not query.strip():
+        normalized = normalize_query(query)
+        if not normalized:
             return []
 
-        key = self._cache_key(query, max_results)
-        cached = self._cache.get(key)
-        if cached is not None:
-            return cached
+        key = self._cache_key(normalized)
+
+        entry = self._cache.get_stale(key)
+        if entry is not None:
+            cached, is_stale = entry
+            if cached.covers(max_results):
+                # Serve stale results immediately and revalidate in the background,
+                # unless the upstream failed for this query very recently.
+                if is_stale and not (self._negative and self._negative.has(key)):
+                    depth = max(max_results, cached.requested)
+                    self._inflight.refresh(
+                        f"{key}:{depth}",
+                        partial(self._search_uncached, normalized, max_results=depth, key=key),
+                    )
+                return list(cached.results[:max_results])
+
+        if self._negative is not None:
+            self._negative.check(key)
+
+        return await self._inflight.do(
+            f"{key}:{max_results}",
+            partial(self._search_uncached, normalized, max_results=max_results, key=key),
+        )
 
+    async def _search_uncached(
+        self, query: str, *, max_results: int, key: str
+    ) -> list[SearchResult]:
         # Prefer waiting over failing fast for better UX.
         await self._rate_limiter.acquire()
 
         # Use HTML endpoint and parse very lightly.
-        resp = await self._http.post(
-            "https://duckduckgo.com/html/",
-            data={"q": query},
-            headers={"user-agent": "Mozilla/5.0"},
-        )
-        resp.raise_for_status()
-
-        html = resp.text
-        results: list[SearchResult] = []
-
-        # Minimal parsing without bs4 dependency.
-        # Look for result links with class="result__a".
-        marker = 'class="result__a"'
-        pos = 0
-        while len(results) < max_results:
-            idx = html.find(marker, pos)
-            if idx == -1:
-                break
-            href_idx = html.rfind("href=", 0, idx)
-            if href_idx == -1:
-                pos = idx + len(marker)
-                continue
-            quote1 = html.find('"', href_idx)
-            quote2 = html.find('"', quote1 + 1)
-            url = html[quote1 + 1 : quote2]
-
-            # Title text
-            gt = html.find(">", idx)
-            lt = html.find("</a>", gt)
-            title = html[gt + 1 : lt]
-            title = _strip_tags(title).strip()
-
-            results.append(SearchResult(title=title or url, url=url, snippet=None))
-            pos = lt
-
-        self._cache.set(key, results)
+        try:
+            resp = await self._http.post(
+                "https://duckduckgo.com/html/",
+                data={"q": query},
+                headers={"user-agent": "Mozilla/5.0"},
+            )
+            resp.raise_for_status()
+        except Exception as exc:  # noqa: BLE001
+            err = SearchError(f"Search failed for query: {query!r}")
+            if self._negative is not None:
+                self._negative.record(key, err)
+            raise err from exc
+
+        results = parse_ddg_results(resp.text, max_results=max_results)
+
+        if self._negative is not None:
+            self._negative.forget(key)
+        self._cache.set(key, _CachedSearch(results=tuple(results), requested=max_results))
         return results
 
 
-def _strip_tags(text: str) -> str:
-    """Very small helper to remove a few common HTML entities/tags."""
+# One regex pass over the result page: result title links and snippets are the
+# only elements we care about, and both are leaf elements (no nested <a>/<div>).
+_RESULT_ELEMENT_RE = re.compile(
+    r"<(a|div|td)\b([^>]*\bclass=[\"'][^\"']*\bresult__(a|snippet)\b[^>]*)>(.*?)</\1\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_HREF_RE = re.compile(r"\bhref\s*=\s*(?:\"([^\"]*)\"|'([^']*)')", re.IGNORECASE)
+
+
+def parse_ddg_results(html: str, *, max_results: int) -> list[SearchResult]:
+    """Parse a DuckDuckGo HTML results page in a single pass.
+
+    Redirect-wrapped links (`//duckduckgo.com/l/?uddg=...`) are unwrapped to
+    their destination and canonicalized, so later fetches skip the redirect
+    hop and share cache keys. Each snippet is attached to the preceding title.
+    Ads and duplicate destinations are skipped.
+    """
+
+    results: list[SearchResult] = []
+    seen: set[str] = set()
+    # Title/url of the result whose snippet we're waiting for.
+    pending: tuple[str, str] | None = None
+
+    def flush(snippet: str | None) -> None:
+        nonlocal pending
+        if pending is not None:
+            title, url = pending
+            results.append(SearchResult(title=title, url=url, snippet=snippet or None))
+            pending = None
+
+    for match in _RESULT_ELEMENT_RE.finditer(html):
+        _, attrs, kind, inner = match.groups()
+        if kind.lower() == "snippet":
+            flush(_strip_tags(inner).strip())
+            continue
 
-    out = []
-    in_tag = False
-    for ch in text:
-        if ch == "<":
-            in_tag = True
+        flush(None)
+        if len(results) >= max_results:
+            break
+        href = _HREF_RE.search(attrs)
+        if href is None:
             continue
-        if ch == ">":
-            in_tag = False
+        url = canonicalize_url(unwrap_search_redirect(unescape(href.group(1) or href.group(2) or "")))
+        host = (urlsplit(url).hostname or "").lower()
+        if not url.startswith(("http://", "https://")) or host.endswith("duckduckgo.com"):
             continue
-        if not in_tag:
-            out.append(ch)
-    cleaned = "".join(out)
-    return (
-        cleaned.replace("&amp;", "&")
-        .replace("&quot;", '"')
-        .replace("&#39;", "'")
-        .replace("&lt;", "<")
-        .replace("&gt;", ">")
-    )
+        if url in seen:
+            continue
+        seen.add(url)
+        title = _strip_tags(inner).strip()
+        pending = (title or url, url)
+
+    flush(None)
+    return results
+
+
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def _strip_tags(text: str) -> str:
+    """Remove tags, decode entities and collapse whitespace."""
+
+    return " ".join(unescape(_TAG_RE.sub("", text)).split())
+
+
+_shared_client: DuckDuckGoHTMLSearchClient | None = None
+
+
+def get_search_client() -> DuckDuckGoHTMLSearchClient:
+    """Return the process-wide search client configured from Settings.
+
+    Sharing one instance lets the cache, rate limiter and in-flight
+    de-duplication work across requests and jobs instead of per call.
+    """
+
+    global _shared_client
+    if _shared_client is None:
+        from app.core.config import settings
+
+        _shared_client = DuckDuckGoHTMLSearchClient(
+            negative_cache=NegativeCache(
+                {SearchError: settings.search_negative_cache_ttl_seconds}
+            ),
+            cache_ttl_seconds=settings.search_cache_ttl_seconds,
+            cache_max_items=settings.search_cache_max_items,
+            cache_stale_seconds=settings.search_cache_stale_seconds,
+            rate_per_minute=settings.search_rate_per_minute,
+        )
+    return _shared_client
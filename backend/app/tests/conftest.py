@@ -5,6 +5,16 @@ from collections.abc import AsyncIterator
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.services import ingest
+from app.services.source_fetcher import FetchError
+
+
+class _OfflineFetcher:
+    """Fails every fetch; background research jobs get it instead of the HTTP fetcher."""
+
+    async def fetch(self, url: str):
+        raise FetchError(f"network disabled in tests: {url}")
+
 
 @pytest.fixture()
 def app_env(tmp_path, monkeypatch) -> None:
@@ -20,6 +30,12 @@ def app_env(tmp_path, monkeypatch) -> None:
     monkeypatch.setenv("INFOGRAPH_GOOGLE_CLIENT_ID", "test-client")
     monkeypatch.setenv("INFOGRAPH_GOOGLE_CLIENT_SECRET", "test-secret")
     monkeypatch.setenv("INFOGRAPH_SECRET_KEY", "test-" + "x" * 32)
+    # Keep background research jobs off the network: search the bundled corpus
+    # and fail source fetches (the corpus lists real URLs).
+    monkeypatch.setenv("INFOGRAPH_SEARCH_PROVIDER", "local")
+    monkeypatch.setattr(ingest, "get_source_fetcher", _OfflineFetcher)
+    monkeypatch.setenv("INFOGRAPH_MEDIA_ROOT", f"{tmp_path}/media")
+    monkeypatch.setenv("INFOGRAPH_FETCH_STORE_PATH", f"{tmp_path}/fetch_cache.sqlite3")
 
 
 @pytest.fixture()
@@ -35,6 +51,18 @@ def test_app(app_env):
 
     reload(session)
 
+    # Modules that bind `settings` at import time would keep the first test's
+    # values (e.g. its media_root) without a reload.
+    import app.api.auth as api_auth
+    import app.api.ingest as api_ingest
+    import app.api.sessions as api_sessions
+    import app.services.auth as auth
+    import app.services.google_oauth as google_oauth
+    import app.services.research_worker as research_worker
+
+    for module in (auth, google_oauth, research_worker, api_auth, api_ingest, api_sessions):
+        reload(module)
+
     import app.main as main
 
     reload(main)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import traceback
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.services.source_fetcher import ContentQualityError, FetchError, HTTPSourceFetcher
+from app.services.web_search import (
+    DuckDuckGoHTMLSearchClient,
+    NegativeCache,
+    SearchError,
+    SimpleTTLCache,
+)
+
+
+class _Resp:
+    def __init__(self, text: str, headers: dict[str, str] | None = None, status_code: int = 200):
+        self.text = text
+        self.headers = headers or {"content-type": "text/html"}
+        self.status_code = status_code
+        self.charset_encoding = "utf-8"
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError("http error")
+
+    async def aiter_bytes(self):
+        yield self.text.encode("utf-8")
+
+
+class _ScriptedClient:
+    """Fake httpx client that returns queued responses in order."""
+
+    def __init__(self, *responses: _Resp) -> None:
+        self.calls = 0
+        self._responses = list(responses)
+
+    async def _next(self) -> _Resp:
+        self.calls += 1
+        return self._responses[min(self.calls, len(self._responses)) - 1]
+
+    async def post(self, url: str, **_: object) -> _Resp:  # noqa: ARG002
+        return await self._next()
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **_: object):  # noqa: ARG002
+        yield await self._next()
+
+
+def _expire_all(cache: SimpleTTLCache) -> None:
+    for key, (_, value) in list(cache._items.items()):
+        cache._items[key] = (time.time() - 1, value)
+
+
+def _ddg(url: str) -> str:
+    return f'<a href="{url}" class="result__a">Result</a>'
+
+
+def test_ttl_cache_serves_stale_entries_within_grace_window() -> None:
+    cache = SimpleTTLCache(ttl_seconds=60, stale_ttl_seconds=60)
+    cache.set("k", "v")
+    assert cache.get_stale("k") == ("v", False)
+
+    _expire_all(cache)
+    assert cache.get("k") is None
+    assert cache.get_stale("k") == ("v", True)
+
+    no_grace = SimpleTTLCache(ttl_seconds=60)
+    no_grace.set("k", "v")
+    _expire_all(no_grace)
+    assert no_grace.get_stale("k") is None
+
+
+@pytest.mark.asyncio
+async def test_search_serves_stale_result_and_refreshes_in_background() -> None:
+    http = _ScriptedClient(_Resp(_ddg("https://old.example")), _Resp(_ddg("https://new.example")))
+    cache = SimpleTTLCache(ttl_seconds=60, stale_ttl_seconds=600)
+    client = DuckDuckGoHTMLSearchClient(http_client=http, cache=cache)
+
+    assert (await client.search("q"))[0].url == "https://old.example/"
+    _expire_all(cache)
+
+    # Stale answer is returned immediately; the refresh happens behind it.
+    assert (await client.search("q"))[0].url == "https://old.example/"
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert http.calls == 2
+    assert (await client.search("q"))[0].url == "https://new.example/"
+
+
+@pytest.mark.asyncio
+async def test_search_failures_are_negatively_cached() -> None:
+    http = _ScriptedClient(_Resp("", status_code=503), _Resp(_ddg("https://example.com")))
+    client = DuckDuckGoHTMLSearchClient(
+        http_client=http, negative_cache=NegativeCache({SearchError: 30})
+    )
+
+    for _ in range(3):
+        with pytest.raises(SearchError):
+            await client.search("q")
+    assert http.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_negative_cache_uses_ttl_per_failure_class() -> None:
+    negative = NegativeCache({FetchError: 60, ContentQualityError: 900})
+    assert negative.ttl_for(FetchError("x")) == 60
+    assert negative.ttl_for(ContentQualityError("x")) == 900
+    assert negative.ttl_for(ValueError("x")) is None
+
+    http = _ScriptedClient(_Resp("{}", headers={"content-type": "application/pdf"}))
+    fetcher = HTTPSourceFetcher(http_client=http, negative_cache=negative, min_text_length=1)
+    for _ in range(3):
+        with pytest.raises(ContentQualityError):
+            await fetcher.fetch("https://example.com/report.pdf")
+    assert http.calls == 1
+
+    # Classes without a TTL are never cached.
+    uncached = HTTPSourceFetcher(
+        http_client=_ScriptedClient(_Resp("", status_code=500)),
+        negative_cache=NegativeCache({FetchError: 0}),
+    )
+    for _ in range(2):
+        with pytest.raises(FetchError):
+            await uncached.fetch("https://example.com/flaky")
+    assert uncached._http.calls == 2
+
+
+def test_negative_cache_raises_a_fresh_exception_each_time() -> None:
+    negative = NegativeCache({FetchError: 60})
+    negative.record("k", FetchError("blocked"))
+
+    raised = []
+    for _ in range(2):
+        with pytest.raises(FetchError, match="blocked") as info:
+            negative.check("k")
+        raised.append(info.value)
+
+    assert raised[0] is not raised[1]
+    # Tracebacks don't pile up across raises.
+    frames = [len(traceback.extract_tb(exc.__traceback__)) for exc in raised]
+    assert frames[0] == frames[1]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.services.urls import canonicalize_url, unwrap_search_redirect
+from app.services.web_search import parse_ddg_results
+
+FIXTURE = Path(__file__).parent / "fixtures" / "ddg_html_results.html"
+
+
+def test_parser_unwraps_redirects_and_extracts_snippets() -> None:
+    results = parse_ddg_results(FIXTURE.read_text(encoding="utf-8"), max_results=10)
+
+    assert [r.url for r in results] == [
+        "https://en.wikipedia.org/wiki/Solar_panel",
+        "https://www.energy.gov/eere/solar/homeowners-guide-going-solar?page=2",
+        "https://www.nrel.gov/solar/",
+    ]
+    assert results[0].title == "Solar panel - Wikipedia"
+    assert results[0].snippet == (
+        "A solar panel is a device that converts sunlight into electricity & heat…"
+    )
+    assert results[1].title == "Homeowner's Guide to Going Solar | Department of Energy"
+    assert results[1].snippet == "Learn how solar works for homeowners."
+    # A result without a snippet element keeps snippet=None.
+    assert results[2].snippet is None
+
+
+def test_parser_respects_max_results() -> None:
+    results = parse_ddg_results(FIXTURE.read_text(encoding="utf-8"), max_results=1)
+
+    assert len(results) == 1
+    assert results[0].snippet is not None
+
+
+def test_unwrap_search_redirect_leaves_direct_links_alone() -> None:
+    assert unwrap_search_redirect("https://example.com/a") == "https://example.com/a"
+    assert (
+        unwrap_search_redirect("/l/?uddg=https%3A%2F%2Fexample.com%2Fb&rut=1")
+        == "https://example.com/b"
+    )
+
+
+def test_canonicalize_url_drops_tracking_params_fragments_and_default_ports() -> None:
+    assert (
+        canonicalize_url("HTTPS://Example.COM:443/path?b=2&utm_medium=x&a=1&gclid=z#top")
+        == "https://example.com/path?a=1&b=2"
+    )
+    assert canonicalize_url("http://example.com:8080") == "http://example.com:8080/"
+    assert canonicalize_url("mailto:someone@example.com") == "mailto:someone@example.com"
+
+
+def test_canonicalize_url_keeps_query_encoding_and_ipv6_brackets() -> None:
+    assert canonicalize_url("https://a.example/s?q=solar%20panels&flag") == (
+        "https://a.example/s?flag&q=solar%20panels"
+    )
+    assert canonicalize_url("https://a.example/s?q=a+b&utm_source=x&%75tm_medium=y") == (
+        "https://a.example/s?q=a+b"
+    )
+    assert canonicalize_url("http://[2001:DB8::1]:80/x?b&a=") == "http://[2001:db8::1]/x?a=&b"
+    assert canonicalize_url("https://[::1]:8443/") == "https://[::1]:8443/"
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from app.services.resilience import (
+    CircuitBreaker,
+    HostCircuitBreakers,
+    RetryPolicy,
+    parse_retry_after,
+)
+from app.services.source_fetcher import (
+    CircuitOpenError,
+    ContentQualityError,
+    HTTPSourceFetcher,
+    TransientFetchError,
+)
+
+_PAGE = "<html><body><p>" + "words " * 100 + "</p></body></html>"
+
+
+class _Resp:
+    def __init__(self, status_code: int = 200, headers: dict[str, str] | None = None):
+        self.status_code = status_code
+        self.headers = {"content-type": "text/html", **(headers or {})}
+        self.charset_encoding = "utf-8"
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"http {self.status_code}")
+
+    async def aiter_bytes(self):
+        yield _PAGE.encode("utf-8")
+
+
+class _Client:
+    def __init__(self, *outcomes: _Resp | Exception) -> None:
+        self.calls = 0
+        self._outcomes = list(outcomes)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **_: object):  # noqa: ARG002
+        self.calls += 1
+        outcome = self._outcomes[min(self.calls, len(self._outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        yield outcome
+
+
+def _fetcher(http: _Client, **kwargs) -> HTTPSourceFetcher:
+    return HTTPSourceFetcher(
+        http_client=http,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay_seconds=0, max_delay_seconds=1),
+        min_text_length=10,
+        **kwargs,
+    )
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates() -> None:
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2026 07:28:10 GMT", now=1792567680.0) == 10.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_retry_policy_backs_off_with_jitter_and_gives_up() -> None:
+    policy = RetryPolicy(max_attempts=4, base_delay_seconds=1, max_delay_seconds=3)
+    for attempt, ceiling in [(0, 1), (1, 2), (2, 3)]:
+        assert 0 <= policy.delay_for(attempt) <= ceiling
+    assert policy.delay_for(3) is None
+    assert policy.delay_for(0, retry_after=2.5) == 2.5
+    # A server asking for more than we're willing to wait is not retried.
+    assert policy.delay_for(0, retry_after=30) is None
+
+
+def test_circuit_breaker_opens_probes_and_closes() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    assert breaker.allow() is True  # reset timeout elapsed: one probe
+    assert breaker.state == "half_open"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert (breaker.state, breaker.consecutive_failures) == ("closed", 0)
+
+    slow = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+    slow.record_failure()
+    assert slow.allow() is False
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_then_succeed() -> None:
+    http = _Client(
+        _Resp(503),
+        _Resp(429, headers={"retry-after": "0"}),
+        _Resp(200),
+    )
+    breakers = HostCircuitBreakers()
+    fetched = await _fetcher(http, breakers=breakers).fetch("https://flaky.example/a")
+
+    assert "words" in fetched.text
+    assert http.calls == 3
+    snap = breakers.snapshot()
+    assert (snap["attempts"], snap["retries"], snap["transient_errors"]) == (3, 2, 2)
+    assert snap["breakers"] == {}
+
+
+@pytest.mark.asyncio
+async def test_permanent_errors_are_not_retried() -> None:
+    http = _Client(_Resp(404))
+    with pytest.raises(Exception) as info:
+        await _fetcher(http).fetch("https://example.com/missing")
+    assert not isinstance(info.value, TransientFetchError)
+    assert http.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast_without_a_request() -> None:
+    timeout = httpx.ReadTimeout("slow")
+    http = _Client(timeout)
+    breakers = HostCircuitBreakers(failure_threshold=3, reset_timeout_seconds=60)
+    fetcher = _fetcher(http, breakers=breakers)
+
+    with pytest.raises(TransientFetchError):
+        await fetcher.fetch("https://slow.example/a")
+    assert http.calls == 3
+
+    with pytest.raises(CircuitOpenError):
+        await fetcher.fetch("https://slow.example/b")
+    assert http.calls == 3
+
+    snap = breakers.snapshot()
+    assert snap["breakers"]["slow.example"]["state"] == "open"
+    assert snap["errors_by_host"] == {"slow.example": 3}
+    assert snap["circuit_rejections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_answered_with_a_non_html_page_closes_the_breaker() -> None:
+    http = _Client(_Resp(503), _Resp(200, headers={"content-type": "application/pdf"}))
+    breakers = HostCircuitBreakers(failure_threshold=1, reset_timeout_seconds=0)
+    fetcher = HTTPSourceFetcher(
+        http_client=http, breakers=breakers, retry_policy=RetryPolicy(max_attempts=1)
+    )
+
+    with pytest.raises(TransientFetchError):
+        await fetcher.fetch("https://pdf.example/a")
+    assert breakers.get("pdf.example").state == "open"
+
+    with pytest.raises(ContentQualityError):
+        await fetcher.fetch("https://pdf.example/b")
+    assert http.calls == 2
+    assert breakers.get("pdf.example").state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_fetch_metrics_endpoint_requires_login(client) -> None:
+    res = await client.get("/api/metrics/fetch")
+    assert res.status_code == 401
+
+    await client.get("/api/auth/dev/login?email=demo@example.com", follow_redirects=False)
+    res = await client.get("/api/metrics/fetch")
+    assert res.status_code == 200
+    assert {"retries", "breakers", "errors_by_host"} <= set(res.json())
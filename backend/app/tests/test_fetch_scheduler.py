@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from app.services.fetch_scheduler import FetchScheduler, host_of, interleave_by_host
+from app.services.ingest import ingest_many
+
+
+def test_interleave_by_host_round_robins_and_keeps_per_host_order() -> None:
+    urls = ["https://a/1", "https://a/2", "https://a/3", "https://b/1", "https://c/1", "https://b/2"]
+    assert interleave_by_host(urls) == [
+        "https://a/1",
+        "https://b/1",
+        "https://c/1",
+        "https://a/2",
+        "https://b/2",
+        "https://a/3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_caps_per_host_and_global_concurrency() -> None:
+    scheduler = FetchScheduler(
+        max_concurrency=3, per_host_concurrency=1, per_host_rate_per_minute=1000
+    )
+    active: Counter[str] = Counter()
+    peak_host: Counter[str] = Counter()
+    peak_total = 0
+
+    async def fetch(url: str) -> None:
+        nonlocal peak_total
+        async with scheduler.slot(url):
+            host = host_of(url)
+            active[host] += 1
+            peak_host[host] = max(peak_host[host], active[host])
+            peak_total = max(peak_total, sum(active.values()))
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    urls = [f"https://h{i % 5}.example/{i}" for i in range(15)]
+    await asyncio.gather(*(fetch(u) for u in urls))
+
+    assert max(peak_host.values()) == 1
+    # Different hosts ran side by side, up to the global cap.
+    assert peak_total == 3
+
+
+@pytest.mark.asyncio
+async def test_crawl_delay_is_loaded_once_per_origin_and_capped() -> None:
+    calls: list[str] = []
+
+    async def loader(origin: str) -> str | None:
+        calls.append(origin)
+        await asyncio.sleep(0)
+        return "User-agent: *\nCrawl-delay: 120\n"
+
+    scheduler = FetchScheduler(robots_loader=loader, max_crawl_delay_seconds=2)
+    delays = await asyncio.gather(
+        scheduler.crawl_delay("https://a.example/x"),
+        scheduler.crawl_delay("https://a.example/y"),
+        scheduler.crawl_delay("https://a.example/z"),
+    )
+
+    assert delays == [2.0, 2.0, 2.0]
+    assert calls == ["https://a.example"]
+    assert await FetchScheduler().crawl_delay("https://a.example/x") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_hosts_with_work_in_flight_or_waiting_are_never_evicted() -> None:
+    scheduler = FetchScheduler(
+        max_concurrency=10, per_host_concurrency=2, per_host_rate_per_minute=1000, max_hosts=1
+    )
+    release = asyncio.Event()
+    busy_peak = 0
+    busy_active = 0
+
+    async def busy() -> None:
+        nonlocal busy_peak, busy_active
+        async with scheduler.slot("https://busy.example/"):
+            busy_active += 1
+            busy_peak = max(busy_peak, busy_active)
+            await release.wait()
+            busy_active -= 1
+
+    async def other(i: int) -> None:
+        async with scheduler.slot(f"https://h{i}.example/"):
+            pass
+
+    # One slot of "busy" taken (not all of them), then other hosts overflow the table.
+    first = asyncio.create_task(busy())
+    await asyncio.sleep(0)
+    for i in range(3):
+        await other(i)
+    assert "busy.example" in scheduler._hosts
+
+    more = [asyncio.create_task(busy()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    # Its per-host limit of 2 still holds: no fresh entry was created for it.
+    assert busy_peak == 2
+    release.set()
+    await asyncio.gather(first, *more)
+
+    await other(9)
+    assert list(scheduler._hosts) == ["h9.example"]
+
+
+class _Pipeline:
+    def __init__(self, failing: set[str]) -> None:
+        self.failing = failing
+        self.started: list[str] = []
+
+    async def ingest(self, url: str) -> str:
+        self.started.append(url)
+        await asyncio.sleep(0)
+        if url in self.failing:
+            raise RuntimeError("fetch failed")
+        return url.upper()
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_returns_input_order_and_stops_at_limits() -> None:
+    urls = ["https://a/1", "https://a/2", "https://b/1", "https://c/1"]
+    pipeline = _Pipeline(failing={"https://b/1"})
+
+    results = await ingest_many(pipeline, urls)  # type: ignore[arg-type]
+    assert pipeline.started == ["https://a/1", "https://b/1", "https://c/1", "https://a/2"]
+    assert results == [(0, "HTTPS://A/1"), (1, "HTTPS://A/2"), (3, "HTTPS://C/1")]
+
+    limited = await ingest_many(_Pipeline(failing=set()), urls, max_sources=2)  # type: ignore[arg-type]
+    assert len(limited) == 2
+
+    failing = await ingest_many(_Pipeline(failing=set(urls)), urls, max_failures=1)  # type: ignore[arg-type]
+    assert failing == []
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_only_runs_as_many_ingests_as_sources_still_needed() -> None:
+    urls = [f"https://h{i}.example/a" for i in range(8)]
+    pipeline = _Pipeline(failing={urls[0], urls[1]})
+
+    results = await ingest_many(pipeline, urls, max_sources=3)  # type: ignore[arg-type]
+
+    # Three started; each failure was replaced by exactly one more URL.
+    assert pipeline.started == urls[:5]
+    assert [i for i, _ in results] == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_does_not_cancel_an_ingest_that_is_saving() -> None:
+    from app.services import ingest as ingest_module
+
+    saved: list[str] = []
+
+    class _SavingPipeline:
+        async def ingest(self, url: str) -> str:
+            if url.endswith("/fail"):
+                await asyncio.sleep(0.01)
+                raise RuntimeError("fetch failed")
+            if url.endswith("/slow"):
+                await asyncio.sleep(1)
+                return url
+            ingest_module._persisting.add(asyncio.current_task())
+            await asyncio.sleep(0.02)  # inside the store's transaction
+            saved.append(url)
+            return url
+
+    urls = ["https://a.example/save", "https://b.example/slow", "https://c.example/fail"]
+    results = await ingest_many(_SavingPipeline(), urls, max_failures=1)  # type: ignore[arg-type]
+
+    assert saved == ["https://a.example/save"]
+    assert results == [(0, "https://a.example/save")]
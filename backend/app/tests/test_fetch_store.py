@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.services.fetch_store import CachePolicy, PersistentFetchStore
+from app.services.source_fetcher import HTTPSourceFetcher
+
+_PAGE = "<html><head><title>Popular</title></head><body><p>" + "content " * 80 + "</p></body></html>"
+
+
+class _Resp:
+    def __init__(self, status_code: int = 200, headers: dict[str, str] | None = None, body: str = ""):
+        self.status_code = status_code
+        self.headers = {"content-type": "text/html", **(headers or {})}
+        self.charset_encoding = "utf-8"
+        self._body = body
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 300:
+            raise RuntimeError(f"http {self.status_code}")
+
+    async def aiter_bytes(self):
+        yield self._body.encode("utf-8")
+
+
+class _RecordingClient:
+    """Fake httpx client that records request headers and replays responses."""
+
+    def __init__(self, *responses: _Resp) -> None:
+        self.requests: list[dict[str, str]] = []
+        self._responses = list(responses)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, *, headers: dict[str, str], **_: object):  # noqa: ARG002
+        self.requests.append(dict(headers))
+        yield self._responses[min(len(self.requests), len(self._responses)) - 1]
+
+
+def _fetcher(http: _RecordingClient, store: PersistentFetchStore) -> HTTPSourceFetcher:
+    # A fresh in-memory cache each time, as after a restart.
+    return HTTPSourceFetcher(http_client=http, store=store, min_text_length=10)
+
+
+def test_cache_policy_parses_cache_control() -> None:
+    assert CachePolicy.parse(None) == CachePolicy()
+    assert CachePolicy.parse("public, max-age=300") == CachePolicy(max_age=300)
+    assert CachePolicy.parse("max-age=300, s-maxage=60") == CachePolicy(max_age=60)
+    assert CachePolicy.parse("no-cache, max-age=300") == CachePolicy(max_age=0)
+    assert CachePolicy.parse("private, no-store").store is False
+
+
+@pytest.mark.asyncio
+async def test_max_age_skips_the_request_entirely(tmp_path) -> None:
+    store = PersistentFetchStore(tmp_path / "fetch.sqlite3")
+    http = _RecordingClient(_Resp(headers={"cache-control": "max-age=3600"}, body=_PAGE))
+
+    first = await _fetcher(http, store).fetch("https://example.com/a?utm_source=x")
+    second = await _fetcher(http, store).fetch("https://example.com/a")
+
+    assert len(http.requests) == 1
+    assert second.url == "https://example.com/a"
+    assert (second.title, second.text, second.stats) == (first.title, first.text, first.stats)
+    assert second.blocks == first.blocks
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_revalidated_and_reused_on_304(tmp_path) -> None:
+    store = PersistentFetchStore(tmp_path / "fetch.sqlite3")
+    http = _RecordingClient(
+        _Resp(headers={"etag": '"v1"', "last-modified": "Mon, 05 Oct 2026 10:00:00 GMT"}, body=_PAGE),
+        _Resp(status_code=304, headers={"cache-control": "max-age=600"}),
+    )
+
+    first = await _fetcher(http, store).fetch("https://example.com/a")
+    second = await _fetcher(http, store).fetch("https://example.com/a")
+
+    assert "if-none-match" not in http.requests[0]
+    assert http.requests[1]["if-none-match"] == '"v1"'
+    assert http.requests[1]["if-modified-since"] == "Mon, 05 Oct 2026 10:00:00 GMT"
+    assert second.text == first.text
+
+    # The 304 carried max-age, so the next fetch needs no request.
+    await _fetcher(http, store).fetch("https://example.com/a")
+    assert len(http.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_no_store_responses_are_not_persisted(tmp_path) -> None:
+    store = PersistentFetchStore(tmp_path / "fetch.sqlite3")
+    http = _RecordingClient(_Resp(headers={"cache-control": "no-store", "etag": '"v1"'}, body=_PAGE))
+
+    await _fetcher(http, store).fetch("https://example.com/a")
+    await _fetcher(http, store).fetch("https://example.com/a")
+
+    assert len(http.requests) == 2
+    assert "if-none-match" not in http.requests[1]
+    assert await store.get("https://example.com/a") is None
+
+
+@pytest.mark.asyncio
+async def test_no_store_response_drops_the_previously_stored_entry(tmp_path) -> None:
+    store = PersistentFetchStore(tmp_path / "fetch.sqlite3")
+    http = _RecordingClient(
+        _Resp(headers={"etag": '"v1"'}, body=_PAGE),
+        _Resp(headers={"cache-control": "no-store", "etag": '"v2"'}, body=_PAGE),
+        _Resp(headers={"etag": '"v3"'}, body=_PAGE),
+    )
+
+    await _fetcher(http, store).fetch("https://example.com/a")
+    await _fetcher(http, store).fetch("https://example.com/a")
+    assert http.requests[1]["if-none-match"] == '"v1"'
+    assert await store.get("https://example.com/a") is None
+
+    # Nothing stale is revalidated afterwards.
+    await _fetcher(http, store).fetch("https://example.com/a")
+    assert "if-none-match" not in http.requests[2]
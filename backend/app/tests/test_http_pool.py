@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import http_pool
+from app.services.http_pool import PoolMetrics, _MeteredTransport
+
+
+@pytest.mark.asyncio
+async def test_metered_transport_tracks_in_flight_and_errors() -> None:
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/fail":
+            raise httpx.ConnectError("boom", request=request)
+        await release.wait()
+        return httpx.Response(200, text="ok")
+
+    metrics = PoolMetrics()
+    transport = _MeteredTransport(httpx.MockTransport(handler), metrics)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        tasks = [asyncio.create_task(client.get("/slow")) for _ in range(3)]
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert metrics.in_flight == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/fail")
+
+    assert metrics.requests_total == 4
+    assert metrics.errors_total == 1
+    assert metrics.in_flight == 0
+    assert metrics.peak_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_and_reopened_after_close(app_env) -> None:
+    first = http_pool.get_http_client()
+    assert http_pool.get_http_client() is first
+    assert http_pool.pool_metrics()["client_open"] is True
+
+    await http_pool.close_http_client()
+    assert first.is_closed
+
+    second = http_pool.get_http_client()
+    assert second is not first and not second.is_closed
+    await http_pool.close_http_client()
+
+
+def test_shared_client_belongs_to_the_event_loop_that_opened_it(app_env) -> None:
+    async def use() -> httpx.AsyncClient:
+        client = http_pool.get_http_client()
+        assert http_pool.get_http_client() is client
+        return client
+
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+    assert second is not first
+    asyncio.run(http_pool.close_http_client())
+
+
+def test_building_a_client_leaves_the_shared_one_alone(app_env) -> None:
+    from app.core.config import Settings
+
+    async def run() -> None:
+        shared = http_pool.get_http_client()
+        own = http_pool.build_http_client(Settings(), PoolMetrics())
+        assert http_pool._transport is shared._transport
+        assert http_pool.get_http_client() is shared
+        await own.aclose()
+        await http_pool.close_http_client()
+
+    asyncio.run(run())
+
+
+@pytest.mark.asyncio
+async def test_http_metrics_endpoint(client) -> None:
+    res = await client.get("/api/metrics/http")
+    assert res.status_code == 401
+
+    await client.get("/api/auth/dev/login?email=demo@example.com", follow_redirects=False)
+    res = await client.get("/api/metrics/http")
+    assert res.status_code == 200
+    assert {"requests_total", "in_flight", "peak_in_flight", "open_connections"} <= set(res.json())
@@ -14,7 +14,10 @@ def test_renderer_happy_path_with_sources():
     assert rendered.svg_bytes.startswith(b"<svg")
     assert rendered.layout_meta["title"]
     assert len(rendered.layout_meta["key_bullets"]) >= 1
-    assert rendered.layout_meta["claims"][0]["source_ids"] == [1, 2]
+    # Each title claim is matched to the source it came from, not to every source.
+    assert rendered.layout_meta["claims"][0]["source_ids"] == [1]
+    assert rendered.layout_meta["claims"][0]["scores"] == [1.0]
+    assert rendered.layout_meta["claims"][1]["source_ids"] == [2]
 
 
 def test_renderer_escapes_xml_and_handles_no_sources():
@@ -11,20 +11,18 @@ async def test_ingest_endpoint_requires_auth(client):
 async def test_ingest_fills_snippet_and_updates_status(monkeypatch, client):
     from app.api import ingest as ingest_api
 
+    from app.services.source_fetcher import FetchedSource
+
     class FakeFetcher:
         async def fetch(self, url: str):
-            return type(
-                "Fetched",
-                (),
-                {
-                    "url": url,
-                    "title": "Fetched Title",
-                    "text": "This is a fetched page. It has content. More content.",
-                },
-            )()
-
-    # Patch the pipeline constructor inside the module by swapping HTTPSourceFetcher
-    monkeypatch.setattr(ingest_api, "HTTPSourceFetcher", lambda **_: FakeFetcher())
+            return FetchedSource(
+                url=url,
+                title="Fetched Title",
+                text="This is a fetched page. It has content. More content.",
+            )
+
+    # Patch the shared fetcher used by the endpoint
+    monkeypatch.setattr(ingest_api, "get_source_fetcher", lambda: FakeFetcher())
 
     # Login
     r = await client.get(
@@ -54,3 +52,34 @@ async def test_ingest_fills_snippet_and_updates_status(monkeypatch, client):
     body = r5.json()
     assert body["status"] == "ingested"
     assert body["sources"][0]["snippet"]
+
+
+@pytest.mark.asyncio
+async def test_resummarize_uses_stored_text_and_session_reads_skip_it(monkeypatch, client):
+    from app.api import ingest as ingest_api
+    from app.services.source_fetcher import FetchedSource
+
+    text = "Stored page text. " * 40
+
+    class FakeFetcher:
+        async def fetch(self, url: str):
+            return FetchedSource(url=url, title="Fetched Title", text=text)
+
+    monkeypatch.setattr(ingest_api, "get_source_fetcher", lambda: FakeFetcher())
+
+    await client.get("/api/auth/dev/login", params={"email": "b@example.com"}, follow_redirects=False)
+    sid = (await client.post("/api/sessions", json={"prompt": "prompt"})).json()["id"]
+    await client.post(
+        f"/api/sessions/{sid}/sources",
+        params={"title": "T", "url": "https://example.com/stored", "snippet": ""},
+    )
+    assert (await client.post(f"/api/ingest/sessions/{sid}")).json()["processed"] == 1
+
+    r = await client.post(f"/api/sessions/{sid}/resummarize")
+    assert r.status_code == 200
+    assert r.json() == {"resummarized": 1, "missing_text": 0}
+
+    # Listing and detail views never touch the deferred document text.
+    assert (await client.get("/api/sessions")).status_code == 200
+    detail = (await client.get(f"/api/sessions/{sid}")).json()
+    assert detail["sources"][0]["snippet"].startswith("Stored page text.")
@@ -56,7 +56,10 @@ async def test_infographic_generation_includes_claims_with_source_ids(client):
     claim = data["claims"][0]
     assert claim["id"]
     assert claim["text"]
-    assert claim["source_ids"] == [src_a_id, src_b_id]
+    # Matched against the sources' text: only Source A states "Source A".
+    assert claim["source_ids"] == [src_a_id]
+    assert claim["scores"] == [1.0]
+    assert data["claims"][1]["source_ids"] == [src_b_id]
 
     # Also verify session detail exposes claims via infographic
     res = await client.get(f"/api/sessions/{session_id}")
@@ -64,4 +67,4 @@ async def test_infographic_generation_includes_claims_with_source_ids(client):
     detail = res.json()
     assert detail["infographic"] is not None
     assert "claims" in detail["infographic"]
-    assert detail["infographic"]["claims"][0]["source_ids"] == [src_a_id, src_b_id]
+    assert detail["infographic"]["claims"][0]["source_ids"] == [src_a_id]
@@ -9,7 +9,7 @@ async def test_search_endpoint_requires_auth(client):
 
 @pytest.mark.asyncio
 async def test_search_attaches_sources(monkeypatch, client):
-    # Patch the DDG client used by the endpoint by replacing the class in module.
+    # Patch the configured search provider used by the endpoint.
     # This avoids external network by swapping with a deterministic implementation.
     from app.api import search as search_api
 
@@ -34,8 +34,8 @@ async def test_search_attaches_sources(monkeypatch, client):
 
     monkeypatch.setattr(
         search_api,
-        "DuckDuckGoHTMLSearchClient",
-        lambda **_: FakeClient(),
+        "get_search_provider",
+        lambda: FakeClient(),
     )
 
     r = await client.get(
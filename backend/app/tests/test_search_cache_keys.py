@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.web_search import DuckDuckGoHTMLSearchClient, normalize_query
+
+
+class _Resp:
+    status_code = 200
+    headers = {"content-type": "text/html"}
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class _CountingClient:
+    def __init__(self, n_results: int) -> None:
+        self.calls = 0
+        self._html = "".join(
+            f'<a href="https://example.com/{i}" class="result__a">R{i}</a>'
+            for i in range(n_results)
+        )
+
+    async def post(self, url: str, **_: object) -> _Resp:  # noqa: ARG002
+        self.calls += 1
+        return _Resp(self._html)
+
+
+def test_normalize_query_folds_case_whitespace_and_unicode() -> None:
+    assert normalize_query("Solar Panels") == normalize_query("solar  panels ")
+    # Full-width characters and ligatures normalize under NFKC.
+    assert normalize_query("ＳＯＬＡＲ panels") == "solar panels"
+    assert normalize_query("ﬁnance") == "finance"
+    assert normalize_query("   ") == ""
+
+
+@pytest.mark.asyncio
+async def test_equivalent_queries_share_a_cache_entry() -> None:
+    http = _CountingClient(n_results=5)
+    client = DuckDuckGoHTMLSearchClient(http_client=http)
+
+    await client.search("Solar Panels")
+    await client.search("solar  panels ")
+    await client.search("SOLAR\tPANELS")
+
+    assert http.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_larger_cached_result_list_answers_smaller_requests() -> None:
+    http = _CountingClient(n_results=10)
+    client = DuckDuckGoHTMLSearchClient(http_client=http)
+
+    five = await client.search("ev market", max_results=5)
+    three = await client.search("ev market", max_results=3)
+    assert http.calls == 1
+    assert [r.url for r in three] == [r.url for r in five[:3]]
+
+    # A request for more than is cached goes upstream once, then covers both.
+    assert len(await client.search("ev market", max_results=8)) == 8
+    await client.search("ev market", max_results=5)
+    assert http.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_short_upstream_result_list_answers_larger_requests() -> None:
+    http = _CountingClient(n_results=2)
+    client = DuckDuckGoHTMLSearchClient(http_client=http)
+
+    assert len(await client.search("rare topic", max_results=5)) == 2
+    assert len(await client.search("rare topic", max_results=10)) == 2
+    assert http.calls == 1
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.search_providers import (
+    CompositeSearchProvider,
+    LocalCorpusSearchProvider,
+    SearchProvider,
+    build_search_provider,
+)
+from app.services.web_search import DuckDuckGoHTMLSearchClient, SearchError, SearchResult
+
+
+class _StubProvider:
+    def __init__(self, name: str, *, results=None, fail: bool = False, delay: float = 0.0):
+        self.name = name
+        self.calls = 0
+        self._results = results or []
+        self._fail = fail
+        self._delay = delay
+
+    async def search(self, query: str, *, max_results: int = 5) -> list[SearchResult]:
+        self.calls += 1
+        await asyncio.sleep(self._delay)
+        if self._fail:
+            raise SearchError(f"{self.name} down")
+        return self._results[:max_results]
+
+
+def _hit(url: str) -> SearchResult:
+    return SearchResult(title=url, url=url)
+
+
+def test_ddg_client_and_local_provider_satisfy_protocol() -> None:
+    assert isinstance(DuckDuckGoHTMLSearchClient(), SearchProvider)
+    assert isinstance(LocalCorpusSearchProvider.from_path(), SearchProvider)
+
+
+@pytest.mark.asyncio
+async def test_local_provider_ranks_bundled_corpus_offline() -> None:
+    provider = build_search_provider("local")
+    results = await provider.search("EV market trends", max_results=3)
+
+    assert results
+    assert results[0].url == "https://www.iea.org/reports/global-ev-outlook-2024"
+    assert await provider.search("zzzz-unknown", max_results=3) == []
+
+
+@pytest.mark.asyncio
+async def test_composite_fallback_prefers_healthy_provider_and_tracks_errors() -> None:
+    ddg = _StubProvider("duckduckgo", fail=True)
+    local = _StubProvider("local", results=[_hit("https://example.com/")])
+    composite = CompositeSearchProvider([ddg, local])
+
+    for _ in range(3):
+        assert (await composite.search("q"))[0].url == "https://example.com/"
+
+    stats = composite.stats()
+    # Configuration order is tried first; after an error the healthy provider leads.
+    assert ddg.calls == 1
+    assert stats["duckduckgo"]["errors"] == 1
+    assert stats["duckduckgo"]["consecutive_errors"] == 1
+    assert stats["local"]["calls"] == 3
+    assert stats["local"]["ewma_latency_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_composite_skips_unhealthy_provider_until_cooldown() -> None:
+    flaky = _StubProvider("duckduckgo", fail=True)
+    backup = _StubProvider("local")  # answers, but with no results
+    composite = CompositeSearchProvider(
+        [flaky, backup], unhealthy_after=1, cooldown_seconds=60
+    )
+
+    assert await composite.search("q") == []
+    assert await composite.search("q") == []
+    assert flaky.calls == 1
+    assert backup.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_composite_race_returns_fastest_non_empty_answer() -> None:
+    slow = _StubProvider("duckduckgo", results=[_hit("https://slow.example/")], delay=0.5)
+    fast = _StubProvider("local", results=[_hit("https://fast.example/")])
+    composite = CompositeSearchProvider([slow, fast], strategy="race")
+
+    results = await composite.search("q")
+    assert results[0].url == "https://fast.example/"
+
+
+@pytest.mark.asyncio
+async def test_composite_raises_when_every_provider_fails() -> None:
+    composite = CompositeSearchProvider(
+        [_StubProvider("a", fail=True), _StubProvider("b", fail=True)]
+    )
+    with pytest.raises(SearchError):
+        await composite.search("q")
+
+
+def test_build_search_provider_rejects_unknown_names() -> None:
+    with pytest.raises(ValueError):
+        build_search_provider("bing")
@@ -64,3 +64,37 @@ async def test_create_and_get_session_authenticated(client):
     assert r8.headers["content-type"].startswith("image/svg+xml")
     assert "content-disposition" in {k.lower(): v for k, v in r8.headers.items()}
     assert r8.text.startswith("<svg")
+
+
+@pytest.mark.asyncio
+async def test_infographic_png_export_is_generated_lazily_and_cached(client):
+    from app.services.infographic_export import get_raster_exporter, shutdown_raster_exporter
+
+    r = await client.get(
+        "/api/auth/dev/login",
+        params={"email": "png@example.com"},
+        follow_redirects=False,
+    )
+    client.headers.update({"cookie": r.headers["set-cookie"].split(";", 1)[0]})
+    sid = (await client.post("/api/sessions", json={"prompt": "png export"})).json()["id"]
+
+    r = await client.get(f"/api/sessions/{sid}/infographic.png")
+    assert r.status_code == 404
+    # Start from a fresh exporter so its conversion count is this test's alone.
+    shutdown_raster_exporter()
+
+    assert (await client.post(f"/api/sessions/{sid}/infographic")).status_code == 201
+    try:
+        r1 = await client.get(f"/api/sessions/{sid}/infographic.png")
+        assert r1.status_code == 200
+        assert r1.headers["content-type"] == "image/png"
+        assert r1.content.startswith(b"\x89PNG")
+        assert get_raster_exporter().conversions == 1
+
+        r2 = await client.get(f"/api/sessions/{sid}/infographic.png")
+        thumb = await client.get(f"/api/sessions/{sid}/infographic.png", params={"size": "thumbnail"})
+        assert r2.content == r1.content
+        assert thumb.status_code == 200 and len(thumb.content) < len(r1.content)
+        assert get_raster_exporter().conversions == 1
+    finally:
+        shutdown_raster_exporter()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+from app.services.source_fetcher import FetchError, HTTPSourceFetcher
+from app.services.web_search import DuckDuckGoHTMLSearchClient
+
+_DDG_HTML = '<a rel="nofollow" href="https://example.com" class="result__a">Example</a>'
+_PAGE_HTML = "<html><title>T</title><body><p>" + "word " * 50 + "</p></body></html>"
+
+
+class _Resp:
+    def __init__(self, text: str, status_code: int = 200) -> None:
+        self.text = text
+        self.headers = {"content-type": "text/html"}
+        self.status_code = status_code
+        self.charset_encoding = "utf-8"
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError("http error")
+
+    async def aiter_bytes(self):
+        yield self.text.encode("utf-8")
+
+
+class _SlowClient:
+    """Fake httpx client that counts calls and yields before answering."""
+
+    def __init__(self, text: str, status_code: int = 200) -> None:
+        self.calls = 0
+        self._resp = _Resp(text, status_code)
+
+    async def _respond(self) -> _Resp:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self._resp
+
+    async def post(self, url: str, **_: object) -> _Resp:  # noqa: ARG002
+        return await self._respond()
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **_: object):  # noqa: ARG002
+        yield await self._respond()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_request() -> None:
+    http = _SlowClient(_DDG_HTML)
+    client = DuckDuckGoHTMLSearchClient(http_client=http)
+
+    results = await asyncio.gather(*(client.search("ev market") for _ in range(5)))
+
+    assert http.calls == 1
+    assert all(r[0].url == "https://example.com/" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_fetches_share_one_request_and_error() -> None:
+    http = _SlowClient(_PAGE_HTML)
+    fetcher = HTTPSourceFetcher(http_client=http, min_text_length=1)
+    fetched = await asyncio.gather(*(fetcher.fetch("https://example.com") for _ in range(4)))
+    assert http.calls == 1
+    assert len({id(f) for f in fetched}) == 1
+
+    failing = _SlowClient("", status_code=500)
+    fetcher = HTTPSourceFetcher(http_client=failing, min_text_length=1)
+    outcomes = await asyncio.gather(
+        *(fetcher.fetch("https://example.com/bad") for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert failing.calls == 1
+    assert all(isinstance(o, FetchError) for o in outcomes)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_does_not_cancel_shared_work() -> None:
+    flight = SingleFlight()
+    release = asyncio.Event()
+    runs = 0
+
+    async def work() -> str:
+        nonlocal runs
+        runs += 1
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", work))
+    second = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+    assert runs == 1
+    assert not flight.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_cancelling_last_waiter_cancels_shared_work() -> None:
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def work() -> None:
+        started.set()
+        await asyncio.sleep(10)
+
+    waiter = asyncio.create_task(flight.do("k", work))
+    await started.wait()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.sleep(0)
+
+    assert not flight.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_caller_arriving_after_the_last_waiter_is_cancelled_gets_a_result() -> None:
+    flight = SingleFlight()
+    started = asyncio.Event()
+    runs = 0
+
+    async def work() -> str:
+        nonlocal runs
+        runs += 1
+        started.set()
+        await asyncio.sleep(0.01)
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", work))
+    await started.wait()
+    first.cancel()
+    await asyncio.sleep(0)
+    late = asyncio.create_task(flight.do("k", work))
+
+    assert await late == "done"
+    assert first.cancelled()
+    assert runs == 2
+    assert not flight.in_flight("k")
@@ -0,0 +1,66 @@
+"""Measure how much boilerplate main-content extraction removes before summarization.
+
+    python -m benchmarks.bench_content_extraction
+
+For each page we take the text that would be handed to the summarizer (capped
+at the ingest budget) and count how many ground-truth article sentences it
+contains. The headline metric is characters processed per useful sentence
+(lower is better). We also report how much of the 800-character summary window
+is article text rather than menus and banners.
+"""
+
+from __future__ import annotations
+
+import time
+
+from app.services.content_extraction import MainContentExtractor
+from app.services.page_analysis import analyze_page
+from app.services.summarizer import SimpleSummarizer
+from benchmarks.corpus import articles
+
+BUDGET_CHARS = 20_000  # Settings.ingest_max_source_chars_for_summarization
+
+
+def _useful_sentences(text: str, useful: list[str]) -> int:
+    return sum(1 for s in useful if s in text)
+
+
+def _summary_useful_share(summary: str, useful: list[str]) -> float:
+    covered = sum(len(s) for s in useful if s[:40] in summary)
+    return min(1.0, covered / len(summary)) if summary else 0.0
+
+
+def main() -> None:
+    extractor = MainContentExtractor()
+    summarizer = SimpleSummarizer()
+    totals = {
+        "full": {"chars": 0, "sentences": 0, "share": 0.0},
+        "main": {"chars": 0, "sentences": 0, "share": 0.0},
+    }
+    extract_s = 0.0
+    pages = articles()
+    for html, useful in pages:
+        page = analyze_page(html)
+        started = time.perf_counter()
+        main_text = extractor.extract(page.blocks, fallback=page.text)
+        extract_s += time.perf_counter() - started
+
+        for label, text in (("full", page.text), ("main", main_text)):
+            text = text[:BUDGET_CHARS]
+            summary = summarizer.summarize(url="", title=None, text=text).summary
+            totals[label]["chars"] += len(text)
+            totals[label]["sentences"] += _useful_sentences(text, useful)
+            totals[label]["share"] += _summary_useful_share(summary, useful)
+
+    print(f"pages: {len(pages)}  extraction: {extract_s / len(pages) * 1000:.2f} ms/page")
+    print(f"{'text':<6}{'chars':>10}{'useful':>9}{'chars/useful':>14}{'summary useful':>16}")
+    for label, t in totals.items():
+        per = t["chars"] / t["sentences"] if t["sentences"] else float("inf")
+        print(
+            f"{label:<6}{t['chars']:>10}{t['sentences']:>9}{per:>14.1f}"
+            f"{t['share'] / len(pages):>15.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare the tag-to-tag HTML-to-text extractor with the old char-by-char loop.
+
+    python -m benchmarks.bench_html_to_text
+"""
+
+from __future__ import annotations
+
+import time
+
+from app.services.page_analysis import html_to_text
+from benchmarks.corpus import corpus
+
+
+def legacy_html_to_text(html: str) -> str:
+    """The previous implementation, kept here as the benchmark baseline."""
+
+    lower = html.lower()
+    out: list[str] = []
+    i = 0
+    while i < len(html):
+        if lower.startswith("<script", i):
+            end = lower.find("</script>", i)
+            if end == -1:
+                break
+            i = end + len("</script>")
+            continue
+        if lower.startswith("<style", i):
+            end = lower.find("</style>", i)
+            if end == -1:
+                break
+            i = end + len("</style>")
+            continue
+
+        ch = html[i]
+        if ch == "<":
+            end = html.find(">", i)
+            if end == -1:
+                break
+            tag = lower[i + 1 : end].strip()
+            if tag.startswith("br") or tag.startswith("p") or tag.startswith("/p"):
+                out.append("\n")
+            i = end + 1
+            continue
+
+        out.append(ch)
+        i += 1
+
+    cleaned = "".join(out)
+    return (
+        cleaned.replace("&amp;", "&")
+        .replace("&quot;", '"')
+        .replace("&#39;", "'")
+        .replace("&lt;", "<")
+        .replace("&gt;", ">")
+    )
+
+
+def _best_of(fn, arg: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    print(f"{'page':>6} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+    for name, html in corpus().items():
+        repeat = 5 if len(html) < 500_000 else 2
+        legacy = _best_of(legacy_html_to_text, html, repeat)
+        new = _best_of(html_to_text, html, repeat)
+        print(f"{name:>6} {legacy * 1000:10.1f} {new * 1000:8.1f} {legacy / new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Memory allocated per ingest, with and without stopping at the text budget.
+
+    python -m benchmarks.bench_ingest_memory
+
+Runs the parse -> extract -> truncate -> summarize path on synthetic pages of
+increasing size under tracemalloc. "full" analyzes the whole page and cuts
+afterwards (the previous behaviour); "budgeted" stops analysis at the
+fetcher's text cap, and the summarizer only normalizes the prefix it keeps.
+Extraction runs over all the analyzed text in both, since the document
+store keeps it in full; only the summarizer's input is cut to the budget. Reports peak traced memory per ingest
+(the downloaded HTML itself is allocated before tracing starts) and checks
+that both paths produce the same summary.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+from app.services.content_extraction import MainContentExtractor
+from app.services.page_analysis import analyze_page
+from app.services.summarizer import SimpleSummarizer
+from benchmarks.corpus import make_page
+
+FETCH_MAX_TEXT = 60_000  # HTTPSourceFetcher.max_text_length
+INGEST_BUDGET = 20_000  # Settings.ingest_max_source_chars_for_summarization
+PAGE_SIZES = (200_000, 1_000_000, 5_000_000)
+
+
+def _full(html: str, extractor: MainContentExtractor, summarizer: SimpleSummarizer) -> str:
+    page = analyze_page(html)
+    text = page.text[:FETCH_MAX_TEXT]
+    text = extractor.extract(page.blocks, fallback=text)[:INGEST_BUDGET]
+    return " ".join(text.split())[: summarizer.max_chars]
+
+
+def _budgeted(html: str, extractor: MainContentExtractor, summarizer: SimpleSummarizer) -> str:
+    page = analyze_page(html, max_text_chars=FETCH_MAX_TEXT)
+    text = page.text[:FETCH_MAX_TEXT]
+    text = extractor.extract(page.blocks, fallback=text)[:INGEST_BUDGET]
+    return summarizer.summarize(url="", title=None, text=text).summary
+
+
+def _measure(fn, html: str) -> tuple[int, float, str]:
+    extractor = MainContentExtractor()
+    summarizer = SimpleSummarizer()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    out = fn(html, extractor, summarizer)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, out
+
+
+def main() -> None:
+    print(
+        f"{'page':>10}{'full peak':>14}{'budgeted peak':>16}{'ratio':>8}"
+        f"{'full ms':>10}{'budgeted ms':>13}"
+    )
+    for size in PAGE_SIZES:
+        html = make_page(size, seed=size)
+        full_peak, full_s, full_out = _measure(_full, html)
+        budget_peak, budget_s, budget_out = _measure(_budgeted, html)
+        assert full_out == budget_out, "budgeted path must produce the same summary"
+        print(
+            f"{size:>10}{full_peak / 1e6:>12.1f}MB{budget_peak / 1e6:>14.1f}MB"
+            f"{full_peak / budget_peak:>7.1f}x{full_s * 1000:>10.1f}{budget_s * 1000:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Infographic render throughput for sessions of 5, 50 and 500 sources.
+
+    python -m benchmarks.bench_render
+
+Renders per second through `InfographicRenderer` (precompiled fragments,
+one output buffer), with claims from source titles and from key points.
+Each render also matches its claims against the sources (provenance); at
+500 sources that, the layout hash and the per-site counts dominate, all
+linear in the number of sources, while the SVG itself is capped.
+"""
+
+from __future__ import annotations
+
+import time
+
+from app.services.infographic import InfographicRenderer, choose_layout
+from app.services.key_points import KeyPoint
+
+SESSION_SIZES = (5, 50, 500)
+MIN_SECONDS = 0.5
+
+
+def _rate(fn) -> float:
+    fn()  # warm-up
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < MIN_SECONDS:
+        fn()
+        count += 1
+    return count / elapsed
+
+
+def _session(n: int) -> tuple[list[dict], list[KeyPoint]]:
+    sources = [
+        {
+            "source_id": i,
+            "title": f"Quarterly energy report #{i}: prices & <grid> \"outlook\"",
+            "url": f"https://www.publisher{i % 17}.example/reports/{i}",
+            "confidence": 0.5 + (i % 5) / 10,
+        }
+        for i in range(1, n + 1)
+    ]
+    key_points = [
+        KeyPoint(
+            text=f"Finding {k}: storage capacity grew while prices fell & demand rose.",
+            source_ids=tuple(range(1 + k, n + 1, 3)),
+        )
+        for k in range(min(n, 12))
+    ]
+    return sources, key_points
+
+
+def main() -> None:
+    renderer = InfographicRenderer()
+    print(f"{'sources':>8}{'layout':>10}{'titles r/s':>14}{'key points r/s':>16}{'svg bytes':>11}")
+    for n in SESSION_SIZES:
+        sources, key_points = _session(n)
+        by_title = _rate(
+            lambda: renderer.render_session_infographic(prompt="Energy storage trends", sources=sources)
+        )
+        with_points = _rate(
+            lambda: renderer.render_session_infographic(
+                prompt="Energy storage trends", sources=sources, key_points=key_points
+            )
+        )
+        size = len(
+            renderer.render_session_infographic(
+                prompt="Energy storage trends", sources=sources, key_points=key_points
+            ).svg_bytes
+        )
+        layout = choose_layout(source_count=n, has_key_points=True).name
+        print(f"{n:>8}{layout:>10}{by_title:>14,.0f}{with_points:>16,.0f}{size:>11,}")
+
+
+if __name__ == "__main__":
+    main()
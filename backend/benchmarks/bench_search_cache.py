@@ -0,0 +1,88 @@
+"""Replay a query log against the search cache and report hit rates.
+
+Compares the legacy keying scheme (raw query + max_results) with normalized
+query keys plus superset reuse, counting upstream calls with a fake client.
+
+    python -m benchmarks.bench_search_cache [path/to/query_log.tsv]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+from app.services.web_search import DuckDuckGoHTMLSearchClient
+
+DEFAULT_LOG = Path(__file__).parent / "fixtures" / "query_log.tsv"
+
+
+class _Resp:
+    status_code = 200
+    headers = {"content-type": "text/html"}
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class _FakeDDG:
+    """Always returns ten results; counts upstream calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._html = "".join(
+            f'<a href="https://example.com/{i}" class="result__a">Result {i}</a>'
+            for i in range(10)
+        )
+
+    async def post(self, url: str, **_: object) -> _Resp:  # noqa: ARG002
+        self.calls += 1
+        return _Resp(self._html)
+
+
+def load_log(path: Path) -> list[tuple[str, int]]:
+    entries = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        n, query = line.split("\t", 1)
+        entries.append((query, int(n)))
+    return entries
+
+
+def legacy_misses(entries: list[tuple[str, int]]) -> int:
+    seen: set[tuple[str, int]] = set()
+    misses = 0
+    for query, n in entries:
+        if (query, n) not in seen:
+            misses += 1
+            seen.add((query, n))
+    return misses
+
+
+async def normalized_misses(entries: list[tuple[str, int]]) -> int:
+    http = _FakeDDG()
+    client = DuckDuckGoHTMLSearchClient(http_client=http, rate_per_minute=10**6)
+    for query, n in entries:
+        await client.search(query, max_results=n)
+    return http.calls
+
+
+def main() -> None:
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LOG
+    entries = load_log(path)
+    total = len(entries)
+
+    legacy = legacy_misses(entries)
+    normalized = asyncio.run(normalized_misses(entries))
+
+    print(f"queries replayed: {total}")
+    print(f"legacy keys      : {legacy:4d} upstream calls, hit rate {1 - legacy / total:.1%}")
+    print(f"normalized+reuse : {normalized:4d} upstream calls, hit rate {1 - normalized / total:.1%}")
+
+
+if __name__ == "__main__":
+    main()
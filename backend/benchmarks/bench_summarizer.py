@@ -0,0 +1,55 @@
+"""Per-document summarization latency at the ingest budget (20k characters).
+
+    python -m benchmarks.bench_summarizer
+
+Compares the naive leading-text summarizer with the TF-IDF extractive one,
+called once per document and batched over a whole session's sources.
+"""
+
+from __future__ import annotations
+
+import time
+
+from app.services.summarizer import SimpleSummarizer, TfidfSummarizer
+from benchmarks.corpus import make_text
+
+DOC_CHARS = 20_000  # Settings.ingest_max_source_chars_for_summarization
+SESSION_SOURCES = 20
+REPEATS = 5
+
+
+def _per_doc_ms(fn, docs: int) -> float:
+    fn()  # warm-up
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best / docs * 1000
+
+
+def main() -> None:
+    docs = [
+        (f"https://example.com/{i}", "Energy market report", make_text(DOC_CHARS, seed=i))
+        for i in range(SESSION_SOURCES)
+    ]
+    simple = SimpleSummarizer()
+    tfidf = TfidfSummarizer()
+
+    rows = {
+        "simple (per doc)": _per_doc_ms(
+            lambda: [simple.summarize(url=u, title=t, text=x) for u, t, x in docs], len(docs)
+        ),
+        "tfidf (per doc)": _per_doc_ms(
+            lambda: [tfidf.summarize(url=u, title=t, text=x) for u, t, x in docs], len(docs)
+        ),
+        f"tfidf (batch of {len(docs)})": _per_doc_ms(lambda: tfidf.summarize_batch(docs), len(docs)),
+    }
+    print(f"documents: {len(docs)} x {DOC_CHARS} chars")
+    print(f"{'summarizer':<24}{'ms/doc':>10}")
+    for label, ms in rows.items():
+        print(f"{label:<24}{ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Round trips and wall time for a model-like summarizer, with and without micro-batching.
+
+    python -m benchmarks.bench_summary_batching
+
+Simulates concurrent research jobs, each summarizing its sources one at a
+time as ingests finish. The backend is the deterministic stub with a fixed
+per-call latency (the round trip) plus a small per-document cost, and at
+most `BACKEND_CONCURRENCY` calls in flight, as with a rate-limited API.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.services.summarizer import StubSummarizer
+from app.services.summary_batching import MicroBatchingSummarizer
+from benchmarks.corpus import make_text
+
+JOBS = 20
+SOURCES_PER_JOB = 5
+ROUND_TRIP_SECONDS = 0.05
+PER_DOC_SECONDS = 0.002
+BACKEND_CONCURRENCY = 4
+
+
+class _LimitedStub(StubSummarizer):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._slots = asyncio.Semaphore(BACKEND_CONCURRENCY)
+
+    async def summarize_many(self, documents):
+        async with self._slots:
+            return await super().summarize_many(documents)
+
+
+async def _run(summarizer, docs: list[list[tuple[str, str, str]]]) -> float:
+    async def job(sources: list[tuple[str, str, str]]) -> None:
+        await asyncio.gather(*(summarizer.summarize_many([doc]) for doc in sources))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(job(sources) for sources in docs))
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    text = make_text(2_000)
+    docs = [
+        [(f"https://example.com/{j}/{i}", "Report", text) for i in range(SOURCES_PER_JOB)]
+        for j in range(JOBS)
+    ]
+    print(
+        f"jobs: {JOBS} x {SOURCES_PER_JOB} sources, round trip {ROUND_TRIP_SECONDS * 1000:.0f} ms, "
+        f"{BACKEND_CONCURRENCY} concurrent calls"
+    )
+    print(f"{'mode':<22}{'backend calls':>14}{'wall ms':>10}")
+    for label, wait_ms, size in (("per document", None, None), ("batched 16 / 20 ms", 20, 16)):
+        backend = _LimitedStub(latency_seconds=ROUND_TRIP_SECONDS, per_doc_seconds=PER_DOC_SECONDS)
+        summarizer = (
+            backend
+            if wait_ms is None
+            else MicroBatchingSummarizer(backend, max_batch_size=size, max_wait_ms=wait_ms)
+        )
+        wall = await _run(summarizer, docs)
+        print(f"{label:<22}{backend.calls:>14}{wall * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""Deterministic synthetic HTML pages for the extraction benchmarks."""
+
+from __future__ import annotations
+
+import random
+
+_WORDS = (
+    "solar battery grid market policy capacity storage lithium charging vehicle "
+    "efficiency demand supply growth report analysis energy price forecast region "
+    "investment technology emissions carbon hydrogen wind turbine module inverter"
+).split()
+
+_NAV = (
+    "<nav class='site-nav'><ul>"
+    + "".join(f"<li><a href='/section/{i}'>Section {i}</a></li>" for i in range(12))
+    + "</ul></nav>"
+)
+_FOOTER = (
+    "<footer id='footer'><div class='cookie-banner'>We use cookies to improve your "
+    "experience. <a href='/privacy'>Privacy</a> &middot; <a href='/terms'>Terms</a>"
+    "</div><p>&copy; 2026 Example Media. All rights reserved.</p></footer>"
+)
+_SCRIPT = "<script>window.dataLayer=window.dataLayer||[];function gtag(){dataLayer.push(arguments)}" + "var x='<p>not text</p>';" * 20 + "</script>"
+_STYLE = "<style>" + "body{margin:0;padding:0}.a>.b{color:#333}" * 20 + "</style>"
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 20))]
+    words[0] = words[0].capitalize()
+    return " ".join(words) + rng.choice([".", ".", ".", "!", "?"])
+
+
+def make_page(target_bytes: int, *, seed: int = 0) -> str:
+    """Build an article-like page of roughly `target_bytes` characters."""
+
+    rng = random.Random(seed)
+    parts = [
+        "<!DOCTYPE html><html><head><title>Energy Market Report &#8211; 2026</title>",
+        _STYLE,
+        _SCRIPT,
+        "</head><body>",
+        _NAV,
+        "<main><article><h1>Energy market report</h1>",
+    ]
+    size = sum(len(p) for p in parts)
+    while size < target_bytes:
+        if rng.random() < 0.1:
+            chunk = _SCRIPT
+        elif rng.random() < 0.2:
+            chunk = "<div class='related'><a href='/x'>" + _sentence(rng) + "</a></div>"
+        else:
+            body = " ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+            chunk = f"<p>{body} <b>Key figure:</b> {rng.randint(1, 999)}&#37; &amp; more.</p>\n"
+        parts.append(chunk)
+        size += len(chunk)
+    parts += ["</article></main>", _FOOTER, "</body></html>"]
+    return "".join(parts)
+
+
+def corpus() -> dict[str, str]:
+    """Pages from 10 KB to 2 MB."""
+
+    return {
+        "10KB": make_page(10_000, seed=1),
+        "200KB": make_page(200_000, seed=2),
+        "1MB": make_page(1_000_000, seed=3),
+        "2MB": make_page(2_000_000, seed=4),
+    }
+
+
+_COOKIE_BANNER = (
+    "<div id='cookie-consent' class='banner'><p>We value your privacy. We and our "
+    "partners use cookies and similar technologies to store and access information on "
+    "your device for personalised ads and content, ad and content measurement and "
+    "audience insights. <a href='/privacy'>Manage preferences</a></p>"
+    "<button>Accept all</button></div>"
+)
+_SIDEBAR = (
+    "<aside class='sidebar'><h3>Most read</h3><ul>"
+    + "".join(f"<li><a href='/story/{i}'>Top story number {i} everyone is reading</a></li>" for i in range(8))
+    + "</ul><div class='newsletter'><p>Sign up for our daily briefing and get the top "
+    "energy stories delivered to your inbox every morning.</p></div></aside>"
+)
+
+
+def make_article(seed: int, *, paragraphs: int = 12) -> tuple[str, list[str]]:
+    """Build a news-style page and return it with its article sentences.
+
+    The page has the usual chrome around the article (menu, breadcrumb, cookie
+    banner, sidebar, related links, comments, footer). The returned sentences
+    are the ground truth for "useful" text.
+    """
+
+    rng = random.Random(seed)
+    useful: list[str] = []
+    body: list[str] = []
+    for i in range(paragraphs):
+        sentences = [_sentence(rng) for _ in range(rng.randint(2, 5))]
+        useful += sentences
+        if i and i % 4 == 0:
+            body.append(f"<h2>{_sentence(rng)[:-1]}</h2>")
+        body.append("<p>" + " ".join(sentences) + "</p>")
+
+    related = "".join(
+        f"<li><a href='/related/{i}'>{_sentence(rng)}</a></li>" for i in range(5)
+    )
+    comments = "".join(
+        f"<div class='comment'><p>{_sentence(rng)}</p><a href='/reply'>Reply</a></div>"
+        for _ in range(4)
+    )
+    html = "".join(
+        [
+            "<!DOCTYPE html><html><head><title>Energy report</title>",
+            _STYLE,
+            _SCRIPT,
+            "</head><body>",
+            _COOKIE_BANNER,
+            "<header>",
+            _NAV,
+            "<div class='breadcrumb'><a href='/'>Home</a> &rsaquo; <a href='/energy'>Energy</a></div>",
+            "</header><div class='layout'>",
+            "<main><article><h1>Energy market report</h1>",
+            "<p class='byline'>By Staff Reporter</p>",
+            *body,
+            f"</article><section class='related'><h3>Related</h3><ul>{related}</ul></section>",
+            f"<section id='comments'>{comments}</section></main>",
+            _SIDEBAR,
+            "</div>",
+            _FOOTER,
+            "</body></html>",
+        ]
+    )
+    return html, useful
+
+
+def articles(count: int = 20) -> list[tuple[str, list[str]]]:
+    return [make_article(seed, paragraphs=6 + seed % 10) for seed in range(count)]
+
+
+def make_text(target_chars: int, *, seed: int = 0) -> str:
+    """Plain extracted-article text of roughly `target_chars` characters."""
+
+    rng = random.Random(seed)
+    paragraphs: list[str] = []
+    size = 0
+    while size < target_chars:
+        paragraph = " ".join(_sentence(rng) for _ in range(rng.randint(3, 7)))
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 1
+    return "\n".join(paragraphs)[:target_chars]
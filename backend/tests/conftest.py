@@ -16,6 +16,8 @@ def _set_required_env(monkeypatch, tmp_path) -> None:
     monkeypatch.setenv(
         "INFOGRAPH_DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/test.db"
     )
+    monkeypatch.setenv("INFOGRAPH_MEDIA_ROOT", f"{tmp_path}/media")
+    monkeypatch.setenv("INFOGRAPH_FETCH_STORE_PATH", f"{tmp_path}/fetch_cache.sqlite3")
 
 
 @pytest.fixture
@@ -0,0 +1,80 @@
+from app.services.content_extraction import MainContentExtractor
+from app.services.ingest import IngestPipeline
+from app.services.page_analysis import TextBlock, analyze_page
+from app.services.source_fetcher import FetchedSource
+
+_PARA = (
+    "Battery storage capacity doubled last year as prices kept falling. "
+    "Analysts expect another record year for grid-scale projects."
+)
+
+_PAGE = f"""
+<html><body>
+<div class="cookie-banner"><p>We use cookies to personalise content and ads. Accept to continue browsing.</p></div>
+<nav><ul><li><a href="/">Home</a></li><li><a href="/news">News</a></li></ul></nav>
+<main><article>
+  <h1>Storage boom</h1>
+  <p>{_PARA}</p>
+  <p>By a reporter</p>
+  <p>{_PARA} More detail follows here.</p>
+  <div class="related"><a href="/a">Another story about batteries and the grid that is long</a></div>
+</article></main>
+<aside><p>Subscribe to our newsletter for the latest energy stories every morning.</p></aside>
+<footer><p>Copyright 2026 Example Media. All rights reserved.</p></footer>
+</body></html>
+"""
+
+
+def test_analyze_page_marks_boilerplate_headings_and_links() -> None:
+    blocks = {b.text: b for b in analyze_page(_PAGE).blocks}
+
+    assert blocks["Home"].boilerplate and blocks["Home"].link_density == 1.0
+    assert blocks["Storage boom"].heading and not blocks["Storage boom"].boilerplate
+    assert blocks[_PARA].link_density == 0.0 and not blocks[_PARA].boilerplate
+    assert blocks["Copyright 2026 Example Media. All rights reserved."].boilerplate
+
+
+def test_extractor_keeps_article_text_and_drops_chrome() -> None:
+    page = analyze_page(_PAGE)
+    text = MainContentExtractor(min_output_chars=50).extract(page.blocks, fallback=page.text)
+
+    assert text.splitlines() == [
+        "Storage boom",
+        _PARA,
+        "By a reporter",
+        f"{_PARA} More detail follows here.",
+    ]
+
+
+def test_extractor_falls_back_to_full_text_when_too_little_survives() -> None:
+    blocks = (TextBlock(text="Short line"), TextBlock(text="Menu", link_chars=4))
+    assert MainContentExtractor().extract(blocks, fallback="full text") == "full text"
+    assert MainContentExtractor().extract((), fallback="full text") == "full text"
+
+
+async def test_ingest_pipeline_summarizes_main_content_when_enabled() -> None:
+    page = analyze_page(_PAGE)
+
+    class _Fetcher:
+        async def fetch(self, url: str) -> FetchedSource:
+            return FetchedSource(url=url, title=page.title, text=page.text, blocks=page.blocks)
+
+    plain = await IngestPipeline(fetcher=_Fetcher()).ingest("https://example.com")
+    extracted = await IngestPipeline(
+        fetcher=_Fetcher(), extractor=MainContentExtractor(min_output_chars=50)
+    ).ingest("https://example.com")
+
+    assert plain.summary.summary.startswith("We use cookies")
+    assert extracted.summary.summary.startswith("Storage boom Battery storage")
+
+
+def test_extractor_stops_at_max_chars() -> None:
+    blocks = [TextBlock(text=f"Paragraph {i}. " + "Sentence-like article text. " * 3) for i in range(50)]
+    extractor = MainContentExtractor(min_output_chars=50)
+
+    full = extractor.extract(blocks)
+    assert extractor.extract(blocks, max_chars=300) == full[:300]
+    # Too little main text: the fallback is cut to the same budget.
+    heading_only = [TextBlock(text="Heading", heading=True)]
+    fallback = "fallback " * 50
+    assert extractor.extract(heading_only, fallback=fallback, max_chars=20) == fallback[:20]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Document, DocumentURL
+from app.services.document_store import DocumentStore, content_hash
+from app.services.ingest import IngestPipeline
+from app.services.source_fetcher import FetchedSource
+from app.services.summarizer import SimpleSummarizer
+
+_TEXT = "Solar power is growing fast. Panels got cheaper. " * 20
+
+
+class _CountingFetcher:
+    def __init__(self, text: str = _TEXT) -> None:
+        self.text = text
+        self.calls: list[str] = []
+
+    async def fetch(self, url: str) -> FetchedSource:
+        self.calls.append(url)
+        return FetchedSource(url=url, title="Solar", text=self.text, status_code=200)
+
+
+def test_content_hash_ignores_whitespace_layout() -> None:
+    assert content_hash("a  b\n\nc") == content_hash(" a b c ")
+    assert content_hash("a b c") != content_hash("a b d")
+
+
+@pytest.mark.asyncio
+async def test_known_url_is_served_from_the_store_without_fetching(test_db_session) -> None:
+    fetcher = _CountingFetcher()
+    pipeline = IngestPipeline(fetcher=fetcher, documents=DocumentStore(test_db_session))
+
+    first = await pipeline.ingest("https://Example.com/solar?utm_source=news")
+    await test_db_session.commit()
+    second = await pipeline.ingest("https://example.com/solar#intro")
+
+    assert fetcher.calls == ["https://Example.com/solar?utm_source=news"]
+    assert second.document_id == first.document_id is not None
+    assert second.summary.summary == first.summary.summary
+
+    doc = await test_db_session.get(Document, first.document_id)
+    assert doc.text_chars == len(_TEXT)
+    texts = await DocumentStore(test_db_session).load_texts([first.document_id])
+    assert texts == {first.document_id: _TEXT}
+
+
+class _RecordingSummarizer(SimpleSummarizer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.texts: list[str] = []
+
+    def summarize(self, *, url, title, text):
+        self.texts.append(text)
+        return super().summarize(url=url, title=title, text=text)
+
+
+@pytest.mark.asyncio
+async def test_full_text_is_stored_while_only_the_summarizer_input_is_capped(test_db_session) -> None:
+    summarizer = _RecordingSummarizer()
+    pipeline = IngestPipeline(
+        fetcher=_CountingFetcher(),
+        summarizer=summarizer,
+        max_chars=100,
+        documents=DocumentStore(test_db_session),
+    )
+
+    ingested = await pipeline.ingest("https://example.com/solar")
+
+    assert summarizer.texts == [_TEXT[:100]]
+    texts = await DocumentStore(test_db_session).load_texts([ingested.document_id])
+    assert texts == {ingested.document_id: _TEXT}
+    doc = await test_db_session.get(Document, ingested.document_id)
+    assert doc.content_hash == content_hash(_TEXT)
+
+
+@pytest.mark.asyncio
+async def test_mirrors_with_identical_content_collapse_into_one_document(test_db_session) -> None:
+    pipeline = IngestPipeline(fetcher=_CountingFetcher(), documents=DocumentStore(test_db_session))
+
+    a = await pipeline.ingest("https://news.example/solar")
+    b = await pipeline.ingest("https://mirror.example/syndicated/solar")
+    await test_db_session.commit()
+
+    assert a.document_id == b.document_id
+    assert await test_db_session.scalar(select(func.count(Document.id))) == 1
+    assert await test_db_session.scalar(select(func.count(DocumentURL.id))) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_documents_are_fetched_again(test_db_session) -> None:
+    fetcher = _CountingFetcher()
+    store = DocumentStore(test_db_session, max_age_seconds=60)
+    pipeline = IngestPipeline(fetcher=fetcher, documents=store)
+
+    first = await pipeline.ingest("https://example.com/solar")
+    doc = await test_db_session.get(Document, first.document_id)
+    doc.fetched_at = doc.fetched_at.replace(year=2000)
+    await test_db_session.commit()
+
+    # Same content again: refreshed in place, still one document.
+    again = await pipeline.ingest("https://example.com/solar")
+    assert len(fetcher.calls) == 2
+    assert again.document_id == first.document_id
+
+
+@pytest.mark.asyncio
+async def test_resummarize_session_runs_offline_from_stored_text(test_db_session) -> None:
+    from app.models import ResearchSession, Source
+    from app.services.resummarize import resummarize_session
+    from app.services.summarizer import SimpleSummarizer
+
+    session = ResearchSession(user_id=1, prompt="solar", status="completed")
+    test_db_session.add(session)
+    await test_db_session.flush()
+
+    pipeline = IngestPipeline(fetcher=_CountingFetcher(), documents=DocumentStore(test_db_session))
+    ingested = await pipeline.ingest("https://example.com/solar")
+    test_db_session.add_all(
+        [
+            Source(
+                session_id=session.id,
+                title="Solar",
+                url=ingested.url,
+                snippet=ingested.snippet,
+                document_id=ingested.document_id,
+            ),
+            Source(session_id=session.id, title="Manual", url="https://manual.example/"),
+        ]
+    )
+    await test_db_session.commit()
+
+    result = await resummarize_session(
+        test_db_session, session.id, summarizer=SimpleSummarizer(max_chars=40)
+    )
+    await test_db_session.commit()
+
+    assert result == {"resummarized": 1, "missing_text": 1}
+    source = await test_db_session.scalar(
+        select(Source).where(Source.document_id == ingested.document_id)
+    )
+    assert source.summary == _TEXT[:40] and source.key_points
+    # The document is shared with other sessions and keeps its summary.
+    doc = await test_db_session.get(Document, ingested.document_id)
+    assert doc.summary == ingested.summary.summary != source.summary
@@ -0,0 +1,65 @@
+from app.services.page_analysis import analyze_page, html_to_text
+
+
+def test_html_to_text_skips_script_style_and_comments() -> None:
+    html = (
+        "<html><head><style>p{color:red}</style>"
+        "<SCRIPT type='text/javascript'>var s = '<p>hidden</p>';</SCRIPT></head>"
+        "<body><!-- <p>commented</p> --><p>Visible</p></body></html>"
+    )
+    text = html_to_text(html)
+    assert "hidden" not in text
+    assert "commented" not in text
+    assert "color" not in text
+    assert "Visible" in text
+
+
+def test_html_to_text_turns_block_tags_into_newlines() -> None:
+    text = html_to_text("<div>one</div><p>two<br>three</p><span>four</span><b>five</b>")
+    lines = [line for line in text.splitlines() if line]
+    assert lines == ["one", "two", "three", "fourfive"]
+
+
+def test_html_to_text_decodes_named_and_numeric_entities() -> None:
+    text = html_to_text("<p>A &amp; B &#8212; caf&#xE9; &quot;q&quot; &copy; 5 &lt; 6</p>")
+    assert text.strip() == 'A & B — café "q" © 5 < 6'
+
+
+def test_html_to_text_keeps_stray_angle_brackets_and_drops_unclosed_script() -> None:
+    assert html_to_text("<p>a < b</p>").strip() == "a < b"
+    assert html_to_text("<p>kept</p><script>never closed <p>dropped").strip() == "kept"
+
+
+def test_analyze_page_extracts_title_text_and_stats_in_one_pass() -> None:
+    page = analyze_page(
+        "<html><head><title> Energy &#8211;\n Report </title></head>"
+        "<body><p>Line   one\n\n\n\nLine two</p><nav><a href='/'>Home link</a></nav></body></html>"
+    )
+    assert page.title == "Energy – Report"
+    assert page.text == "Line one\n\nLine two\n\nHome link"
+    assert not page.blocked
+    assert 0 < page.stats.link_density < 1
+    assert 0 < page.stats.text_ratio < 1
+
+
+def test_block_detection_ignores_scripts_and_long_articles() -> None:
+    beacon = "<script src='https://static.cloudflareinsights.com/beacon.js'>cloudflare captcha</script>"
+    article = "<p>" + "Cloudflare reported record traffic this quarter. " * 80 + "</p>"
+    assert not analyze_page(f"<html><head>{beacon}</head><body><p>Hello</p></body></html>").blocked
+    assert not analyze_page(f"<html><title>News</title><body>{article}</body></html>").blocked
+
+    challenge = "<html><title>Just a moment...</title><body><p>Verify you are human</p></body></html>"
+    assert analyze_page(challenge).block_signals == ("verify you are human",)
+
+
+def test_analyze_page_stops_scanning_at_max_text_chars() -> None:
+    html = "<html><head><title>Long</title></head><body>" + "<p>paragraph of text</p>" * 1000
+    full = analyze_page(html)
+    limited = analyze_page(html, max_text_chars=100)
+
+    assert limited.truncated and not full.truncated
+    assert limited.title == "Long"
+    assert 100 <= len(limited.text) < 150
+    assert full.text.startswith(limited.text)
+    assert limited.blocks == full.blocks[: len(limited.blocks)]
+    assert limited.stats.html_chars < len(html) // 10
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from app.services.infographic import InfographicRenderer
+from app.services.infographic_export import RasterExporter, rasterize_svg
+from app.services.storage import LocalMediaStorage
+
+_SVG = (
+    b"<svg xmlns='http://www.w3.org/2000/svg' width='200' height='100'>"
+    b"<rect width='100%' height='100%' fill='#0B1220'/>"
+    b"<rect x='10' y='60' width='50' height='20' rx='4' fill='#38BDF8'/>"
+    b"<text x='10' y='30' fill='#E5E7EB' font-family='Arial' font-size='18' font-weight='700'>A &amp; B</text>"
+    b"</svg>"
+)
+
+
+def test_rasterize_svg_draws_supported_subset_at_full_and_thumbnail_size() -> None:
+    images = rasterize_svg(_SVG, thumbnail_width=50)
+
+    full = Image.open(io.BytesIO(images.png))
+    assert full.format == "PNG" and full.size == (200, 100)
+    assert full.getpixel((190, 90)) == (0x0B, 0x12, 0x20)
+    assert full.getpixel((35, 70)) == (0x38, 0xBD, 0xF8)
+    # Some text pixels were drawn in the header band.
+    header = full.crop((10, 10, 120, 32))
+    assert (0xE5, 0xE7, 0xEB) in {color for _, color in header.getcolors(maxcolors=10_000)}
+
+    assert Image.open(io.BytesIO(images.thumbnail)).size == (50, 25)
+
+
+def test_rasterize_svg_handles_renderer_output() -> None:
+    sources = [
+        {"source_id": i, "title": f"Report {i}", "url": f"https://s{i}.example/", "confidence": 0.5}
+        for i in range(1, 20)
+    ]
+    svg = InfographicRenderer().render_session_infographic(prompt="Grid", sources=sources).svg_bytes
+
+    full = Image.open(io.BytesIO(rasterize_svg(svg).png))
+    assert full.size[0] == 1000 and full.size[1] >= 450
+
+
+@pytest.mark.asyncio
+async def test_exporter_converts_once_per_svg_and_replaces_stale_renditions(tmp_path) -> None:
+    storage = LocalMediaStorage(str(tmp_path), "http://media.test")
+    exporter = RasterExporter(thumbnail_width=40)
+    try:
+        first, again = await asyncio.gather(
+            exporter.export(storage, session_id=7, svg=_SVG),
+            exporter.export(storage, session_id=7, svg=_SVG),
+        )
+        cached = await exporter.export(storage, session_id=7, svg=_SVG)
+
+        assert exporter.conversions == 1
+        assert first.generated and not cached.generated
+        assert again.png.path == first.png.path == cached.png.path
+        assert first.png.url.startswith("http://media.test/sessions/7/infographic-")
+        assert first.thumbnail.path.name.endswith("-thumb.png")
+        assert Image.open(first.thumbnail.path).size == (40, 20)
+
+        changed = await exporter.export(storage, session_id=7, svg=_SVG.replace(b"A &amp; B", b"C"))
+        assert changed.generated and changed.png.path != first.png.path
+        assert sorted(p.name for p in (tmp_path / "sessions" / "7").iterdir()) == sorted(
+            [changed.png.path.name, changed.thumbnail.path.name]
+        )
+    finally:
+        exporter.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_exporter_accepts_an_injected_executor(tmp_path) -> None:
+    storage = LocalMediaStorage(str(tmp_path), "http://media.test")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        exporter = RasterExporter(executor=pool)
+        exported = await exporter.export(storage, session_id=1, svg=_SVG)
+        exporter.shutdown()  # Not owned: the pool stays usable.
+        assert pool.submit(lambda: 1).result() == 1
+
+    assert exported.png.path.read_bytes().startswith(b"\x89PNG")
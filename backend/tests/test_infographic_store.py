@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pytest
+
+from app.models import ResearchSession, Source, User
+from app.services.infographic import RenderCache
+from app.services.infographic_store import render_and_store_infographic
+from app.services.storage import LocalMediaStorage
+
+
+class _CountingStorage(LocalMediaStorage):
+    def __init__(self, root) -> None:
+        super().__init__(str(root), "http://media.test")
+        self.saves = 0
+
+    def save_bytes(self, *, rel_path: str, content: bytes):
+        self.saves += 1
+        return super().save_bytes(rel_path=rel_path, content=content)
+
+
+async def _session(db) -> ResearchSession:
+    user = User(email="r@example.com")
+    db.add(user)
+    await db.flush()
+    session = ResearchSession(user_id=user.id, prompt="Grid storage")
+    db.add(session)
+    await db.flush()
+    db.add(Source(session_id=session.id, title="Storage report", url="https://a.example/r"))
+    await db.commit()
+    await db.refresh(session, attribute_names=["sources", "infographic"])
+    return session
+
+
+@pytest.mark.asyncio
+async def test_unchanged_inputs_skip_render_and_storage(test_db_session, tmp_path) -> None:
+    db = test_db_session
+    session = await _session(db)
+    storage = _CountingStorage(tmp_path)
+    cache = RenderCache()
+
+    first = await render_and_store_infographic(db, session, storage=storage, cache=cache)
+    await db.commit()
+    await db.refresh(session, attribute_names=["infographic"])
+    second = await render_and_store_infographic(db, session, storage=storage, cache=cache)
+
+    assert not first.unchanged and second.unchanged
+    assert storage.saves == 1
+    assert second.layout_meta["layout_hash"] == first.layout_meta["layout_hash"]
+
+    # A changed source changes the hash: render and store again.
+    session.sources[0].title = "Storage report (updated)"
+    third = await render_and_store_infographic(db, session, storage=storage, cache=cache)
+    assert not third.unchanged
+    assert third.layout_meta["layout_hash"] != first.layout_meta["layout_hash"]
+    assert storage.saves == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_file_is_rewritten_from_the_render_cache(test_db_session, tmp_path) -> None:
+    db = test_db_session
+    session = await _session(db)
+    storage = _CountingStorage(tmp_path)
+    cache = RenderCache()
+
+    await render_and_store_infographic(db, session, storage=storage, cache=cache)
+    await db.commit()
+    await db.refresh(session, attribute_names=["infographic"])
+    storage.resolve(f"sessions/{session.id}/infographic.svg").unlink()
+
+    again = await render_and_store_infographic(db, session, storage=storage, cache=cache)
+
+    assert not again.unchanged
+    assert storage.saves == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_render_cache_evicts_least_recently_used() -> None:
+    cache = RenderCache(max_items=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("A", "C")
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import pytest
+
+from app.models import Document, ResearchSession, Source, User
+from app.services.infographic import InfographicRenderer
+from app.services.infographic_store import load_render_inputs
+from app.services.key_points import KeyPoint, MinHashDeduplicator
+
+_WIRE = "The central bank raised interest rates by a quarter point on Wednesday, citing persistent inflation."
+
+
+def test_wire_copy_across_sources_is_merged_with_combined_provenance() -> None:
+    merged = MinHashDeduplicator().dedupe(
+        [
+            (_WIRE, 1),
+            ("Exports fell for a third month in a row.", 1),
+            (_WIRE.replace("on Wednesday", "Wednesday"), 2),
+            ("  " + _WIRE.upper(), 3),
+            ("Exports fell for a third month in a row.", 1),
+            ("Housing starts rose sharply in the north.", 3),
+        ]
+    )
+
+    assert merged == [
+        KeyPoint(text=_WIRE, source_ids=(1, 2, 3)),
+        KeyPoint(text="Exports fell for a third month in a row.", source_ids=(1,)),
+        KeyPoint(text="Housing starts rose sharply in the north.", source_ids=(3,)),
+    ]
+
+
+def test_sentences_sharing_a_few_words_are_kept_apart() -> None:
+    merged = MinHashDeduplicator().dedupe(
+        [
+            ("The central bank raised interest rates on Wednesday.", 1),
+            ("The central bank left interest rates unchanged in March.", 2),
+            ("", 3),
+        ]
+    )
+    assert [kp.source_ids for kp in merged] == [(1,), (2,)]
+
+
+def test_renderer_claims_follow_key_points_ranked_by_support() -> None:
+    rendered = InfographicRenderer().render_session_infographic(
+        prompt="Rates",
+        sources=[{"source_id": 1, "title": "A"}, {"source_id": 2, "title": "B"}],
+        key_points=[KeyPoint("Exports fell.", (1,)), KeyPoint("Rates rose.", (1, 2))],
+    )
+    claims = rendered.layout_meta["claims"]
+    assert [(c["text"], c["source_ids"]) for c in claims] == [
+        ("Rates rose.", [1, 2]),
+        ("Exports fell.", [1]),
+    ]
+    assert rendered.layout_meta["key_bullets"] == ["1. Rates rose.", "2. Exports fell."]
+
+
+@pytest.mark.asyncio
+async def test_session_key_points_are_merged_across_documents(test_db_session) -> None:
+    db = test_db_session
+    user = User(email="a@example.com")
+    db.add(user)
+    await db.flush()
+    session = ResearchSession(user_id=user.id, prompt="rates")
+    doc_a = Document(content_hash="a", canonical_url="https://a.example/x", summary="", key_points=[f"- {_WIRE}"])
+    doc_b = Document(
+        content_hash="b",
+        canonical_url="https://b.example/y",
+        summary="",
+        key_points=[f"- {_WIRE}", "- Exports fell for a third month."],
+    )
+    doc_a.text = doc_b.text = ""
+    db.add_all([session, doc_a, doc_b])
+    await db.flush()
+    sources = [
+        Source(session_id=session.id, document_id=doc_a.id, title="A", url="https://a.example/x"),
+        Source(session_id=session.id, document_id=doc_b.id, title="B", url="https://b.example/y"),
+        Source(session_id=session.id, title="Manual", url="https://c.example/"),
+    ]
+    db.add_all(sources)
+    await db.flush()
+
+    await db.refresh(session, attribute_names=["sources"])
+    points = (await load_render_inputs(db, [session]))[session.id].key_points
+
+    assert points == [
+        KeyPoint(_WIRE, (sources[0].id, sources[1].id)),
+        KeyPoint("Exports fell for a third month.", (sources[1].id,)),
+    ]
+
+
+def test_a_sources_own_key_points_replace_its_documents() -> None:
+    from app.services.key_points import session_key_points
+
+    shared = Source(id=1, session_id=1, document_id=7, title="A", url="https://a.example/")
+    resummarized = Source(id=2, session_id=2, document_id=7, title="A", url="https://a.example/")
+    resummarized.key_points = ["- Exports fell for a third month."]
+    points = {7: [f"- {_WIRE}"]}
+
+    assert session_key_points([shared], points) == [KeyPoint(_WIRE, (1,))]
+    assert session_key_points([resummarized], points) == [
+        KeyPoint("Exports fell for a third month.", (2,))
+    ]
+
+
+def test_texts_without_words_are_not_merged() -> None:
+    points = MinHashDeduplicator().dedupe([("—", 1), ("***", 2), ("…", 3), (_WIRE, 4)])
+
+    assert points == [
+        KeyPoint("—", (1,)),
+        KeyPoint("***", (2,)),
+        KeyPoint("…", (3,)),
+        KeyPoint(_WIRE, (4,)),
+    ]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import math
+import random
+import re
+
+import numpy as np
+import pytest
+
+from app.models import Document, ResearchSession, Source, User
+from app.services.infographic import RenderCache
+from app.services.infographic_store import render_and_store_infographic
+from app.services.provenance import ProvenanceIndex, SourceMatch
+from app.services.storage import LocalMediaStorage
+
+_SOURCES = [
+    (10, "Battery pack prices fell 14% in 2023 as lithium costs dropped sharply."),
+    (11, "Lithium costs dropped sharply; analysts expect battery pack prices to keep falling."),
+    (12, "Offshore wind auctions stalled in the North Sea after turbine costs rose."),
+]
+
+
+def test_claims_are_ranked_by_weighted_overlap_and_thresholded() -> None:
+    index = ProvenanceIndex(_SOURCES, min_score=0.3)
+
+    matches = index.match("Battery pack prices fell as lithium costs dropped")
+    assert [m.source_id for m in matches] == [10, 11]
+    assert 1.0 >= matches[0].score > matches[1].score >= 0.3
+
+    assert [m.source_id for m in index.match("Turbine costs rose in North Sea wind auctions")] == [12]
+    assert index.match("Completely unrelated gardening advice") == []
+
+
+def test_stated_sources_are_always_kept_first_and_max_sources_applies() -> None:
+    index = ProvenanceIndex(_SOURCES, min_score=0.0, max_sources=2)
+
+    matches = index.match("Lithium costs dropped sharply", include=[12])
+    assert matches[0] == SourceMatch(source_id=12, score=1.0)
+    assert len(matches) == 2
+
+
+def _naive_scores(documents: list[tuple[int, str]], claim: str) -> list[float]:
+    """Quadratic reference: compare the claim with every source's term set."""
+
+    def terms(text: str) -> set[str]:
+        tokens = re.findall(r"[^\W_]+", text.lower())
+        return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+    doc_terms = [terms(text) for _, text in documents]
+    n = len(documents)
+    claim_terms = terms(claim)
+    weights = {}
+    for t in claim_terms:
+        df = max(1, sum(t in d for d in doc_terms))
+        weights[t] = math.log1p((n - df + 0.5) / (df + 0.5))
+    total = sum(weights.values())
+    return [sum(w for t, w in weights.items() if t in d) / total for d in doc_terms]
+
+
+def test_index_scores_match_a_brute_force_comparison() -> None:
+    rng = random.Random(3)
+    words = [f"w{i}" for i in range(60)] + ["the", "and", "of"]
+    documents = [(i, " ".join(rng.choices(words, k=rng.randint(0, 80)))) for i in range(25)]
+    index = ProvenanceIndex(documents)
+
+    for _ in range(20):
+        claim = " ".join(rng.choices(words + ["unseen"], k=rng.randint(1, 12)))
+        np.testing.assert_allclose(index.scores(claim), _naive_scores(documents, claim))
+
+
+@pytest.mark.asyncio
+async def test_stored_claims_are_matched_against_document_text(test_db_session, tmp_path) -> None:
+    db = test_db_session
+    user = User(email="p@example.com")
+    db.add(user)
+    await db.flush()
+    session = ResearchSession(user_id=user.id, prompt="Battery prices")
+    point = "Battery pack prices fell 14% in 2023."
+    doc_a = Document(content_hash="a", canonical_url="https://a.example/", key_points=[f"- {point}"])
+    doc_a.text = f"Market update. {point} Demand grew."
+    doc_b = Document(content_hash="b", canonical_url="https://b.example/", key_points=[])
+    doc_b.text = "Analysts confirm battery pack prices fell 14% in 2023 across markets."
+    doc_c = Document(content_hash="c", canonical_url="https://c.example/", key_points=[])
+    doc_c.text = "Offshore wind auctions stalled."
+    db.add_all([session, doc_a, doc_b, doc_c])
+    await db.flush()
+    sources = [
+        Source(session_id=session.id, document_id=doc.id, title=title, url=doc.canonical_url)
+        for doc, title in ((doc_a, "Update"), (doc_b, "Analysis"), (doc_c, "Wind"))
+    ]
+    db.add_all(sources)
+    await db.commit()
+    await db.refresh(session, attribute_names=["sources", "infographic"])
+
+    storage = LocalMediaStorage(str(tmp_path), "http://media.test")
+    stored = await render_and_store_infographic(db, session, storage=storage, cache=RenderCache())
+
+    [claim] = stored.layout_meta["claims"]
+    # The key point came from A; B states it too (found through its text); C does not.
+    assert claim["source_ids"] == [sources[0].id, sources[1].id]
+    assert claim["scores"][0] == 1.0 and claim["scores"][1] >= 0.35
+
+    await db.commit()
+    await db.refresh(session, attribute_names=["infographic"])
+    # Re-rendering is skipped while the stored texts are unchanged...
+    again = await render_and_store_infographic(db, session, storage=storage, cache=RenderCache())
+    assert again.unchanged
+    # ...and not once a source points at different text.
+    doc_d = Document(content_hash="d", canonical_url="https://d.example/", key_points=[])
+    doc_d.text = "Battery pack prices fell 14% in 2023, a record drop."
+    db.add(doc_d)
+    await db.flush()
+    session.sources[2].document_id = doc_d.id
+    changed = await render_and_store_infographic(db, session, storage=storage, cache=RenderCache())
+    assert not changed.unchanged
+    assert sources[2].id in changed.layout_meta["claims"][0]["source_ids"]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Document, Infographic, ResearchSession, Source, User
+from app.services.infographic import TEMPLATE_VERSION, RenderCache
+from app.services.infographic_store import render_and_store_infographic
+from app.services.rerender import (
+    Checkpoint,
+    read_checkpoint,
+    rerender_infographics,
+    write_checkpoint,
+)
+from app.services.storage import LocalMediaStorage
+
+
+async def _sessions_with_infographics(db, storage, count: int) -> list[int]:
+    user = User(email="bulk@example.com")
+    db.add(user)
+    doc = Document(
+        content_hash="h", canonical_url="https://a.example/", key_points=["- Grid storage doubled."]
+    )
+    doc.text = "Grid storage doubled last year."
+    db.add(doc)
+    await db.flush()
+
+    ids = []
+    for i in range(count):
+        session = ResearchSession(user_id=user.id, prompt=f"Topic {i}")
+        db.add(session)
+        await db.flush()
+        db.add(Source(session_id=session.id, document_id=doc.id, title=f"S{i}", url="https://a.example/"))
+        await db.flush()
+        await db.refresh(session, attribute_names=["sources", "infographic"])
+        await render_and_store_infographic(db, session, storage=storage, cache=RenderCache())
+        ids.append(session.id)
+    # A session without an infographic is not part of the job.
+    db.add(ResearchSession(user_id=user.id, prompt="never rendered"))
+    await db.commit()
+    return ids
+
+
+async def _meta(db, session_id: int) -> dict:
+    res = await db.execute(select(Infographic.layout_meta).where(Infographic.session_id == session_id))
+    return res.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_rerender_skips_current_sessions_and_bulk_updates_stale_ones(test_db_session, tmp_path) -> None:
+    db = test_db_session
+    storage = LocalMediaStorage(str(tmp_path / "media"), "http://media.test")
+    ids = await _sessions_with_infographics(db, storage, 5)
+
+    # Simulate renders from an older template for two sessions, and a lost file for one.
+    for session_id in ids[:2]:
+        row = (await db.execute(select(Infographic).where(Infographic.session_id == session_id))).scalar_one()
+        row.layout_meta = {**row.layout_meta, "layout_hash": "old", "version": TEMPLATE_VERSION - 1}
+    await db.commit()
+    storage.resolve(f"sessions/{ids[4]}/infographic.svg").unlink()
+    db.expunge_all()
+
+    batches = []
+    checkpoint = tmp_path / "checkpoint.json"
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as pool:
+        report = await rerender_infographics(
+            db,
+            storage=storage,
+            executor=pool,
+            batch_size=2,
+            checkpoint=checkpoint,
+            on_batch=lambda r: batches.append((r.scanned, r.last_session_id)),
+        )
+
+    assert (report.scanned, report.rendered, report.skipped) == (5, 3, 2)
+    assert report.failed_session_ids == []
+    assert batches == [(2, ids[1]), (4, ids[3]), (5, ids[4])]
+    assert report.sessions_per_s > 0 and "3 rendered" in report.summary()
+    assert read_checkpoint(checkpoint) == Checkpoint(last_session_id=ids[4])
+
+    for session_id in ids[:2]:
+        meta = await _meta(db, session_id)
+        assert meta["version"] == TEMPLATE_VERSION and meta["layout_hash"] != "old"
+    assert storage.resolve(f"sessions/{ids[4]}/infographic.svg").exists()
+
+    # Everything is current now: a second pass renders nothing.
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        again = await rerender_infographics(db, storage=storage, executor=pool)
+    assert (again.scanned, again.rendered, again.skipped) == (5, 0, 5)
+
+
+@pytest.mark.asyncio
+async def test_rerender_resumes_after_the_checkpointed_session(test_db_session, tmp_path) -> None:
+    db = test_db_session
+    storage = LocalMediaStorage(str(tmp_path / "media"), "http://media.test")
+    ids = await _sessions_with_infographics(db, storage, 3)
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        report = await rerender_infographics(
+            db, storage=storage, executor=pool, resume=Checkpoint(last_session_id=ids[0])
+        )
+
+    assert report.scanned == 2 and report.last_session_id == ids[2]
+
+
+def test_checkpoint_from_another_template_version_is_ignored(tmp_path) -> None:
+    path = tmp_path / "checkpoint.json"
+    assert read_checkpoint(path) == Checkpoint()
+
+    write_checkpoint(path, Checkpoint(42, (7, 9)))
+    assert read_checkpoint(path) == Checkpoint(42, (7, 9))
+
+    path.write_text(json.dumps({"last_session_id": 42, "template_version": TEMPLATE_VERSION - 1}))
+    assert read_checkpoint(path) == Checkpoint()
+
+
+def _boom(job):
+    raise RuntimeError(f"cannot render session {job.session_id}")
+
+
+class _FailingExecutor(ThreadPoolExecutor):
+    """Runs renders in a thread, failing those of the given sessions."""
+
+    def __init__(self, session_ids: set[int]) -> None:
+        super().__init__(max_workers=2)
+        self.session_ids = session_ids
+
+    def submit(self, fn, job, /):
+        return super().submit(_boom if job.session_id in self.session_ids else fn, job)
+
+
+@pytest.mark.asyncio
+async def test_failed_sessions_are_kept_in_the_checkpoint_and_retried_on_resume(
+    test_db_session, tmp_path
+) -> None:
+    db = test_db_session
+    storage = LocalMediaStorage(str(tmp_path / "media"), "http://media.test")
+    ids = await _sessions_with_infographics(db, storage, 3)
+    for row in (await db.execute(select(Infographic))).scalars():
+        row.layout_meta = {**row.layout_meta, "layout_hash": "old"}
+    await db.commit()
+    db.expunge_all()
+    checkpoint = tmp_path / "checkpoint.json"
+
+    with _FailingExecutor({ids[1]}) as pool:
+        report = await rerender_infographics(
+            db, storage=storage, executor=pool, batch_size=1, checkpoint=checkpoint
+        )
+    assert report.failed_session_ids == [ids[1]] and report.rendered == 2
+    assert read_checkpoint(checkpoint) == Checkpoint(ids[2], (ids[1],))
+    assert (await _meta(db, ids[1]))["layout_hash"] == "old"
+
+    # Still failing: it stays recorded.
+    with _FailingExecutor({ids[1]}) as pool:
+        again = await rerender_infographics(
+            db, storage=storage, executor=pool, resume=read_checkpoint(checkpoint), checkpoint=checkpoint
+        )
+    assert (again.scanned, again.failed_session_ids) == (1, [ids[1]])
+    assert read_checkpoint(checkpoint) == Checkpoint(ids[2], (ids[1],))
+
+    with _FailingExecutor(set()) as pool:
+        fixed = await rerender_infographics(
+            db, storage=storage, executor=pool, resume=read_checkpoint(checkpoint), checkpoint=checkpoint
+        )
+    assert (fixed.scanned, fixed.rendered, fixed.failed_session_ids) == (1, 1, [])
+    assert read_checkpoint(checkpoint) == Checkpoint(ids[2])
+    assert (await _meta(db, ids[1]))["layout_hash"] != "old"
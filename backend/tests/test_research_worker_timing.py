@@ -14,14 +14,14 @@ class _FakeSearchClient:
 
 
 class _FakeIngestPipeline:
-    def __init__(self, *, max_chars: int):
+    def __init__(self, *, max_chars: int, **_kwargs):
         self.max_chars = max_chars
 
     async def ingest(self, url: str):
         return type(
             "Ingested",
             (),
-            {"title": "T", "url": url, "snippet": "S"},
+            {"title": "T", "url": url, "snippet": "S", "document_id": None},
         )()
 
 
@@ -40,7 +40,7 @@ async def test_research_worker_returns_timing_ms(test_db_session):
     from app.services import research_worker as rw
 
     hits = [type("Hit", (), {"title": "H", "url": "https://example.com", "snippet": "snip"})()]
-    rw.DuckDuckGoHTMLSearchClient = lambda: _FakeSearchClient(hits)  # type: ignore[assignment]
+    rw.get_search_provider = lambda: _FakeSearchClient(hits)  # type: ignore[assignment]
     rw.IngestPipeline = _FakeIngestPipeline  # type: ignore[assignment]
 
     result = await run_research_and_render(session_id=s.id, db=test_db_session)
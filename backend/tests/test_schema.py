@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.models  # noqa: F401  (registers the tables)
+from app.db.schema import create_schema
+
+
+async def test_columns_added_to_models_later_are_added_to_existing_tables(tmp_path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/old.db")
+    async with engine.begin() as conn:
+        # A database created before sources.document_id existed.
+        await conn.exec_driver_sql(
+            "CREATE TABLE sources (id INTEGER PRIMARY KEY, session_id INTEGER, "
+            "title VARCHAR(500), url VARCHAR(2000), snippet VARCHAR, fetched_at DATETIME, "
+            "confidence FLOAT, score FLOAT)"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO sources (id, session_id, title, url) VALUES (1, 1, 't', 'https://a.example/')"
+        )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(create_schema)
+        # Running it again is a no-op.
+        await conn.run_sync(create_schema)
+
+        def describe(sync_conn):
+            inspector = inspect(sync_conn)
+            return (
+                {c["name"] for c in inspector.get_columns("sources")},
+                {i["name"] for i in inspector.get_indexes("sources")},
+            )
+
+        columns, indexes = await conn.run_sync(describe)
+        rows = (await conn.exec_driver_sql("SELECT id, document_id FROM sources")).all()
+    await engine.dispose()
+
+    assert {"document_id", "summary", "key_points"} <= columns
+    assert "ix_sources_document_id" in indexes
+    assert rows == [(1, None)]
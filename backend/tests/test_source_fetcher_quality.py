@@ -1,25 +1,44 @@
+from contextlib import asynccontextmanager
+
 import pytest
 
 from app.services.source_fetcher import ContentQualityError, HTTPSourceFetcher
 
 
 class _Resp:
-    def __init__(self, text: str, headers: dict[str, str] | None = None, status_code: int = 200):
+    def __init__(
+        self,
+        text: str,
+        headers: dict[str, str] | None = None,
+        status_code: int = 200,
+        chunk_size: int = 64,
+    ):
         self.text = text
         self.headers = headers or {}
         self.status_code = status_code
+        self.charset_encoding = "utf-8"
+        self.bytes_read = 0
+        self._chunk_size = chunk_size
 
     def raise_for_status(self) -> None:
         if self.status_code >= 400:
             raise RuntimeError("http error")
 
+    async def aiter_bytes(self):
+        body = self.text.encode("utf-8")
+        for i in range(0, len(body), self._chunk_size):
+            chunk = body[i : i + self._chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
 
 class _Client:
     def __init__(self, resp: _Resp):
         self._resp = resp
 
-    async def get(self, url: str, headers: dict[str, str] | None = None) -> _Resp:  # noqa: ARG002
-        return self._resp
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **_: object):  # noqa: ARG002
+        yield self._resp
 
 
 @pytest.mark.asyncio
@@ -65,3 +84,39 @@ async def test_fetch_truncates_long_text() -> None:
     )
     fetched = await fetcher.fetch("https://example.com")
     assert len(fetched.text) == 100
+
+
+@pytest.mark.asyncio
+async def test_fetch_rejects_content_type_before_reading_body() -> None:
+    resp = _Resp("%PDF-1.7" + "x" * 10_000, headers={"content-type": "application/pdf"})
+    fetcher = HTTPSourceFetcher(http_client=_Client(resp), min_text_length=1)
+    with pytest.raises(ContentQualityError):
+        await fetcher.fetch("https://example.com/report.pdf")
+    assert resp.bytes_read == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_aborts_once_max_bytes_is_exceeded() -> None:
+    html = "<html><body><p>" + "word " * 10_000 + "</p></body></html>"
+    resp = _Resp(html, headers={"content-type": "text/html"}, chunk_size=1_000)
+    fetcher = HTTPSourceFetcher(http_client=_Client(resp), min_text_length=1, max_bytes=5_000)
+    with pytest.raises(ContentQualityError):
+        await fetcher.fetch("https://example.com/huge")
+    assert resp.bytes_read <= 6_000
+
+    declared = _Resp(html, headers={"content-type": "text/html", "content-length": "50000"})
+    fetcher = HTTPSourceFetcher(http_client=_Client(declared), min_text_length=1, max_bytes=5_000)
+    with pytest.raises(ContentQualityError):
+        await fetcher.fetch("https://example.com/huge")
+    assert declared.bytes_read == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_decodes_multibyte_characters_split_across_chunks() -> None:
+    html = "<html><title>Café</title><body><p>" + "naïve café — " * 50 + "</p></body></html>"
+    resp = _Resp(html, headers={"content-type": "text/html; charset=utf-8"}, chunk_size=7)
+    fetcher = HTTPSourceFetcher(http_client=_Client(resp), min_text_length=1)
+    fetched = await fetcher.fetch("https://example.com/cafe")
+    assert fetched.title == "Café"
+    assert "\ufffd" not in fetched.text
+    assert fetched.text.startswith("naïve café —")
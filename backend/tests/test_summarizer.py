@@ -0,0 +1,71 @@
+import pytest
+
+from app.services.summarizer import (
+    TfidfSummarizer,
+    build_summarizer,
+    collapsed_prefix,
+    split_sentences,
+)
+from benchmarks.corpus import make_text
+
+_ARTICLE = (
+    "Battery storage capacity doubled last year as battery prices kept falling. "
+    "Grid operators now treat battery storage as core capacity. "
+    "The weather was mild in the capital on Tuesday. "
+    "Analysts expect battery storage prices to fall again next year. "
+    "Battery storage capacity doubled last year as battery prices kept falling!"
+)
+
+
+def test_split_sentences_keeps_abbreviations_and_decimals() -> None:
+    text = "Dr. Smith met Mr. Jones on Jan. 5. Prices rose 3.5% in the U.S. last year! Why?\nNext line"
+    assert split_sentences(text) == [
+        "Dr. Smith met Mr. Jones on Jan. 5.",
+        "Prices rose 3.5% in the U.S. last year!",
+        "Why?",
+        "Next line",
+    ]
+
+
+def test_picks_central_sentences_within_budget_in_document_order() -> None:
+    summarizer = TfidfSummarizer(max_chars=200)
+    summary = summarizer.summarize(url="u", title="Battery storage", text=_ARTICLE)
+
+    assert len(summary.summary) <= 200
+    assert "weather" not in summary.summary
+    # The exact repeat at the end is redundant with the first sentence.
+    assert summary.summary.count("doubled last year") == 1
+    assert summary.summary.startswith("Battery storage capacity doubled")
+    assert summary.key_points[0] == "- Battery storage capacity doubled last year as battery prices kept falling."
+
+
+def test_batch_matches_single_calls_and_is_deterministic() -> None:
+    summarizer = TfidfSummarizer()
+    docs = [(f"https://example.com/{i}", "Energy market", make_text(5_000, seed=i)) for i in range(4)]
+    docs.append(("https://example.com/empty", None, ""))
+
+    batch = summarizer.summarize_batch(docs)
+
+    assert batch == [summarizer.summarize(url=u, title=t, text=x) for u, t, x in docs]
+    assert batch == summarizer.summarize_batch(docs)
+    assert all(len(s.summary) <= 800 for s in batch)
+    assert batch[-1].summary == "" and batch[-1].key_points == []
+
+
+def test_overlong_single_sentence_is_cut_at_a_word() -> None:
+    summary = TfidfSummarizer(max_chars=50).summarize(url="u", title=None, text="word " * 100)
+    assert 0 < len(summary.summary) <= 50
+    assert summary.summary.endswith("word")
+
+
+def test_build_summarizer_by_name() -> None:
+    assert build_summarizer("simple").name == "simple"
+    assert build_summarizer(" TFIDF ").name == "tfidf"
+    with pytest.raises(ValueError):
+        build_summarizer("llm")
+
+
+def test_collapsed_prefix_matches_full_normalization() -> None:
+    text = "  Lead   paragraph\n\nwith\tspacing.  " * 50
+    for limit in (0, 1, 5, 17, 200, 10_000):
+        assert collapsed_prefix(text, limit) == " ".join(text.split())[:limit]
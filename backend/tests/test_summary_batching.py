@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.document_store import DocumentStore
+from app.services.ingest import IngestPipeline, ingest_many
+from app.services.source_fetcher import FetchedSource
+from app.services.summarizer import StubSummarizer
+from app.services.summary_batching import (
+    BudgetedSummarizer,
+    MicroBatchingSummarizer,
+    SummaryBudget,
+)
+from app.services.summary_cache import summarizer_fingerprint
+from app.services.web_search import BudgetExceededError
+
+_TEXT = "Heat pump sales rose in spring. Installers report long waiting lists. " * 5
+
+
+class _Fetcher:
+    def __init__(self, *, same_text: bool = False) -> None:
+        self.same_text = same_text
+
+    async def fetch(self, url: str) -> FetchedSource:
+        text = _TEXT if self.same_text else f"{url}. {_TEXT}"
+        return FetchedSource(url=url, title="Heat pumps", text=text, status_code=200)
+
+
+class _FailingBackend(StubSummarizer):
+    async def summarize_many(self, documents):
+        raise RuntimeError("backend down")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_backend_batches() -> None:
+    backend = StubSummarizer(latency_seconds=0.01)
+    batching = MicroBatchingSummarizer(backend, max_batch_size=4, max_wait_ms=50)
+
+    results = await asyncio.gather(
+        *(batching.summarize_many([(f"u{i}", None, f"Doc {i} text.")]) for i in range(10))
+    )
+
+    assert [r[0].url for r in results] == [f"u{i}" for i in range(10)]
+    assert [r[0].summary for r in results] == [f"Doc {i} text." for i in range(10)]
+    assert (backend.calls, backend.documents) == (3, 10)
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_sent_after_max_wait() -> None:
+    backend = StubSummarizer()
+    batching = MicroBatchingSummarizer(backend, max_batch_size=100, max_wait_ms=5)
+
+    [summary] = await asyncio.wait_for(batching.summarize_many([("u", None, "One.")]), 1)
+
+    assert summary.summary == "One."
+    assert backend.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_reaches_every_caller_in_the_batch() -> None:
+    batching = MicroBatchingSummarizer(_FailingBackend(), max_batch_size=2, max_wait_ms=50)
+
+    results = await asyncio.gather(
+        batching.summarize_many([("a", None, "A.")]),
+        batching.summarize_many([("b", None, "B.")]),
+        return_exceptions=True,
+    )
+
+    assert [str(r) for r in results] == ["backend down", "backend down"]
+
+
+@pytest.mark.asyncio
+async def test_budget_rejects_batches_that_would_exceed_it() -> None:
+    backend = StubSummarizer()
+    budgeted = BudgetedSummarizer(backend, SummaryBudget(max_chars=100, max_tokens=1_000))
+
+    await budgeted.summarize_many([("a", None, "x" * 60)])
+    with pytest.raises(BudgetExceededError):
+        await budgeted.summarize_many([("b", None, "x" * 60)])
+
+    assert (budgeted.budget.used_chars, budgeted.budget.used_tokens) == (60, 15)
+    assert backend.documents == 1
+    # Wrappers don't change output, so they share the backend's cache entries.
+    assert summarizer_fingerprint(budgeted) == summarizer_fingerprint(backend)
+
+
+@pytest.mark.asyncio
+async def test_ingest_stops_when_the_session_budget_runs_out() -> None:
+    backend = StubSummarizer()
+    pipeline = IngestPipeline(
+        fetcher=_Fetcher(),
+        summarizer=backend,
+        budget=SummaryBudget(max_chars=len(_TEXT) * 2),
+    )
+
+    results = await ingest_many(pipeline, [f"https://h{i}.example/a" for i in range(6)])
+
+    assert len(results) == 1
+    assert backend.documents == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_are_not_charged(test_db_session) -> None:
+    budget = SummaryBudget(max_chars=10_000)
+    pipeline = IngestPipeline(
+        fetcher=_Fetcher(same_text=True),
+        summarizer=StubSummarizer(),
+        documents=DocumentStore(test_db_session),
+        budget=budget,
+    )
+
+    await pipeline.ingest("https://a.example/x")
+    charged = budget.used_chars
+    # Another URL with the same text: fetched again, summary served from cache.
+    await pipeline.ingest("https://mirror.example/x")
+
+    assert charged > 0
+    assert budget.used_chars == charged
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import SummaryCacheEntry
+from app.services.document_store import DocumentStore
+from app.services.ingest import IngestPipeline
+from app.services.source_fetcher import FetchedSource
+from app.services.summarizer import SimpleSummarizer
+from app.services.summary_cache import SummaryCache, summarizer_fingerprint
+
+_TEXT = "Wind output hit a record in October. Offshore farms led the gains. " * 10
+
+
+class _CountingSummarizer(SimpleSummarizer):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def summarize(self, *, url, title, text):
+        self.calls += 1
+        return super().summarize(url=url, title=title, text=text)
+
+
+class _Fetcher:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def fetch(self, url: str) -> FetchedSource:
+        self.calls += 1
+        return FetchedSource(url=url, title="Wind", text=_TEXT, status_code=200)
+
+
+def test_fingerprint_covers_name_version_and_parameters() -> None:
+    base = summarizer_fingerprint(SimpleSummarizer())
+    assert base.startswith("simple:v1:")
+    assert summarizer_fingerprint(SimpleSummarizer(max_chars=400)) != base
+
+    bumped = SimpleSummarizer()
+    bumped.version = 2
+    assert summarizer_fingerprint(bumped) != base
+
+
+@pytest.mark.asyncio
+async def test_same_text_under_another_url_is_summarized_once(test_db_session) -> None:
+    summarizer = _CountingSummarizer()
+    pipeline = IngestPipeline(
+        fetcher=_Fetcher(), summarizer=summarizer, documents=DocumentStore(test_db_session)
+    )
+
+    a = await pipeline.ingest("https://a.example/wind")
+    b = await pipeline.ingest("https://b.example/syndicated/wind")
+
+    assert summarizer.calls == 1
+    assert b.url == "https://b.example/syndicated/wind"
+    assert b.summary.summary == a.summary.summary
+    assert b.summary.url == "https://b.example/syndicated/wind"
+
+
+@pytest.mark.asyncio
+async def test_cache_is_persisted_and_invalidated_by_version(test_db_session) -> None:
+    summarizer = _CountingSummarizer()
+
+    await SummaryCache(test_db_session).summarize(
+        summarizer, url="u", title=None, text=_TEXT
+    )
+    await test_db_session.commit()
+
+    # A fresh cache (new request, new process) still hits the stored row.
+    cache = SummaryCache(test_db_session)
+    await cache.summarize(summarizer, url="u", title=None, text=_TEXT)
+    assert (summarizer.calls, cache.hits, cache.misses) == (1, 1, 0)
+
+    summarizer.version = 2
+    await cache.summarize(summarizer, url="u", title=None, text=_TEXT)
+    assert (summarizer.calls, cache.misses) == (2, 1)
+    assert await test_db_session.scalar(select(func.count(SummaryCacheEntry.id))) == 2
+
+
+@pytest.mark.asyncio
+async def test_texts_differing_only_in_line_breaks_are_cached_separately(test_db_session) -> None:
+    summarizer = _CountingSummarizer()
+    cache = SummaryCache(test_db_session)
+    flat = "Wind output hit a record in October. Offshore farms led the gains"
+    broken = flat.replace(". ", ".\n")
+
+    await cache.summarize(summarizer, url="u", title=None, text=flat)
+    await cache.summarize(summarizer, url="u", title=None, text=broken)
+    await cache.summarize(summarizer, url="u", title=None, text=flat)
+
+    assert (summarizer.calls, cache.hits, cache.misses) == (2, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_stored_document_is_resummarized_offline_after_a_version_bump(test_db_session) -> None:
+    fetcher = _Fetcher()
+    summarizer = _CountingSummarizer(max_chars=60)
+    pipeline = IngestPipeline(
+        fetcher=fetcher, summarizer=summarizer, documents=DocumentStore(test_db_session)
+    )
+
+    first = await pipeline.ingest("https://a.example/wind")
+    await test_db_session.commit()
+    again = await pipeline.ingest("https://a.example/wind")
+    assert (fetcher.calls, summarizer.calls) == (1, 1)
+    assert again.summary.summary == first.summary.summary
+
+    summarizer.version = 2
+    summarizer.max_chars = 120
+    bumped = await pipeline.ingest("https://a.example/wind")
+
+    assert (fetcher.calls, summarizer.calls) == (1, 2)
+    assert bumped.summary.summary != first.summary.summary
+    assert bumped.document_id == first.document_id
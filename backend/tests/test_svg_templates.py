@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from app.services.infographic import InfographicRenderer, choose_layout
+from app.services.key_points import KeyPoint
+from app.services.svg_templates import compile_template, escape_xml
+
+_SVG = "{http://www.w3.org/2000/svg}"
+
+
+def test_escape_xml_matches_entity_rules_and_drops_control_characters() -> None:
+    assert escape_xml('A & B < C > D "q"') == "A &amp; B &lt; C &gt; D &quot;q&quot;"
+    assert escape_xml("it's") == "it&#39;s"
+    assert escape_xml("tab\tline\nbell\x07") == "tab\tline\nbell"
+
+
+def test_compiled_template_escapes_strings_and_formats_numbers() -> None:
+    tpl = compile_template("<text x='{x}'>{label}</text>")
+
+    assert tpl.fields == ("x", "label")
+    assert tpl.render(x=12, label="<b>&") == "<text x='12'>&lt;b&gt;&amp;</text>"
+    assert tpl.render(x="1' onload='x", label="") == "<text x='1&#39; onload=&#39;x'></text>"
+
+    out: list[str] = ["<g>"]
+    tpl.render_into(out, {"x": 1, "label": "a"})
+    tpl.render_into(out, {"x": 2, "label": "b"})
+    assert "".join(out) == "<g><text x='1'>a</text><text x='2'>b</text>"
+
+
+@pytest.mark.parametrize("source", ["<t>{x:>4}</t>", "<t>{x!r}</t>", "<t>{a.b}</t>"])
+def test_compile_template_rejects_field_options(source: str) -> None:
+    with pytest.raises(ValueError):
+        compile_template(source)
+
+
+def test_layout_variant_depends_on_content() -> None:
+    assert choose_layout(source_count=3, has_key_points=False).name == "compact"
+    assert choose_layout(source_count=3, has_key_points=True).name == "evidence"
+    assert choose_layout(source_count=40, has_key_points=False).name == "dense"
+
+
+def _sources(n: int) -> list[dict]:
+    return [
+        {
+            "source_id": i,
+            "title": f"Report <{i}> & notes",
+            "url": f"https://www.site{i % 3}.example/{i}",
+            "confidence": 0.5,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def test_dense_layout_is_well_formed_and_lists_references() -> None:
+    rendered = InfographicRenderer().render_session_infographic(
+        prompt="Grid storage & <costs>",
+        sources=_sources(30),
+        key_points=[KeyPoint(text="Battery prices fell.", source_ids=(1, 2, 3))],
+    )
+
+    assert rendered.layout_meta["layout"] == "dense"
+    root = ET.fromstring(rendered.svg_bytes)
+    texts = [el.text for el in root.iter(f"{_SVG}text")]
+    assert texts[0] == "Grid storage & <costs>"
+    assert "Sources by site" in texts and "References" in texts
+    assert "[1] Report <1> & notes" in texts
+    assert "+6 more sources" in texts
+    assert "site0.example" in texts
+    # Everything fits inside the canvas.
+    height = int(root.get("height"))
+    assert max(int(el.get("y")) for el in root.iter(f"{_SVG}text")) < height
+
+
+def test_evidence_layout_draws_support_bars_scaled_to_citations() -> None:
+    rendered = InfographicRenderer().render_session_infographic(
+        prompt="p",
+        sources=_sources(4),
+        key_points=[
+            KeyPoint(text="Cited by four.", source_ids=(1, 2, 3, 4)),
+            KeyPoint(text="Cited by one.", source_ids=(2,)),
+        ],
+    )
+
+    assert rendered.layout_meta["layout"] == "evidence"
+    root = ET.fromstring(rendered.svg_bytes)
+    bars = [int(el.get("width")) for el in root.iter(f"{_SVG}rect") if el.get("fill") == "#38BDF8"]
+    assert bars == [140, 35]